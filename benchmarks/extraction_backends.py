@@ -0,0 +1,52 @@
+"""Pages per second and text similarity of each PDF extraction backend on a sample corpus.
+
+Similarity is measured against the pdfminer baseline on whitespace-normalised text.
+Run from the repository root:
+
+    python -m benchmarks.extraction_backends path/to/sample_corpus
+"""
+import argparse
+import time
+from pathlib import Path
+from rapidfuzz import fuzz
+from src.textSummarizer.components.pdf_extraction import available_backends, open_pdf_stream
+
+
+def extract(pdf_path: Path, backend: str):
+    with open_pdf_stream(pdf_path, backend) as stream:
+        return [text for _, text in stream]
+
+
+def normalise(pages):
+    return " ".join(" ".join(pages).split())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("corpus", type=Path, help="Folder of sample PDFs")
+    args = parser.parse_args()
+
+    pdf_paths = sorted(args.corpus.glob("*.pdf"))
+    backends = available_backends()
+    texts = {backend: {} for backend in backends}
+
+    print(f"{len(pdf_paths)} documents, backends: {', '.join(backends)}")
+    print(f"{'backend':>10} {'pages':>7} {'seconds':>9} {'pages/s':>9} {'similarity':>11}")
+    for backend in backends:
+        pages = 0
+        start = time.perf_counter()
+        for pdf_path in pdf_paths:
+            texts[backend][pdf_path] = extract(pdf_path, backend)
+            pages += len(texts[backend][pdf_path])
+        elapsed = time.perf_counter() - start
+
+        similarities = [
+            fuzz.ratio(normalise(texts["pdfminer"][pdf_path]), normalise(texts[backend][pdf_path]))
+            for pdf_path in pdf_paths
+        ]
+        similarity = sum(similarities) / len(similarities) if similarities else 0.0
+        print(f"{backend:>10} {pages:>7} {elapsed:>9.2f} {pages / elapsed if elapsed else 0:>9.1f} {similarity:>10.1f}%")
+
+
+if __name__ == "__main__":
+    main()
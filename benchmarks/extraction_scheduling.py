@@ -0,0 +1,74 @@
+"""Batch makespan of PDF extraction: a fresh pool in file order vs the warm pool longest-first.
+
+The corpus is split into batches that run one after the other, as in repeated pipeline runs.
+The page cache is disabled so every batch really extracts. Run from the repository root:
+
+    python -m benchmarks.extraction_scheduling path/to/mixed_corpus --batches 3 --workers 4
+"""
+import argparse
+import dataclasses
+import time
+from pathlib import Path
+from src.textSummarizer.config.configuration import ConfigurationManager
+from src.textSummarizer.components.pdf_extraction import get_page_count
+from src.textSummarizer.components.pdf_processing import (
+    PdfProcessing,
+    get_extraction_pool,
+    init_worker,
+    shutdown_extraction_pool
+)
+from src.textSummarizer.utils.process_pool import SupervisedPool
+
+
+def batch_tasks(pdf_processing: PdfProcessing, pdf_paths):
+    return [
+        task
+        for index, pdf_path in enumerate(pdf_paths)
+        for task in pdf_processing.build_pool_tasks(index, pdf_path, get_page_count(pdf_path))
+    ]
+
+
+def run_cold(config, batches):
+    pdf_processing = PdfProcessing(config)
+    timings = []
+    for pdf_paths in batches:
+        start = time.perf_counter()
+        with SupervisedPool(num_workers=config.num_workers, initializer=init_worker, initargs=(config,)) as pool:
+            list(pool.imap_unordered(batch_tasks(pdf_processing, pdf_paths)))
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run_warm(config, batches):
+    pdf_processing = PdfProcessing(config)
+    timings = []
+    for pdf_paths in batches:
+        start = time.perf_counter()
+        pool = get_extraction_pool(config)
+        list(pool.imap_unordered(pdf_processing.schedule(batch_tasks(pdf_processing, pdf_paths))))
+        timings.append(time.perf_counter() - start)
+    shutdown_extraction_pool()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("corpus", type=Path, help="Folder of PDFs with mixed page counts")
+    parser.add_argument("--batches", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    config = ConfigurationManager().get_data_processing_config()
+    config = dataclasses.replace(config, page_cache_max_mb=0, num_workers=args.workers or config.num_workers)
+    pdf_paths = sorted(args.corpus.glob("*.pdf"))
+    batches = [pdf_paths[i::args.batches] for i in range(args.batches)]
+
+    print(f"{len(pdf_paths)} documents in {args.batches} batches")
+    print(f"{'mode':>22} {'total s':>8}  per batch")
+    for mode, run in (("cold pool, file order", run_cold), ("warm pool, longest 1st", run_warm)):
+        timings = run(config, batches)
+        print(f"{mode:>22} {sum(timings):>8.2f}  {' '.join(f'{t:.2f}' for t in timings)}")
+
+
+if __name__ == "__main__":
+    main()
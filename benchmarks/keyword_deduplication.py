@@ -0,0 +1,84 @@
+"""Candidate phrases per second of the RapidFuzz cdist deduplication against pairwise loops.
+
+YAKE proposes thousands of candidate phrases for a synthetic document (or a text file), with
+its own deduplication off as it is quadratic in pure Python, and both implementations drop
+the near duplicates with the configured scorer and threshold. The kept phrases are checked
+to be identical. Run from the repository root:
+
+    python -m benchmarks.keyword_deduplication [--candidates 5000] [--text path/to/document.txt]
+"""
+import argparse
+import dataclasses
+import random
+import string
+import time
+from pathlib import Path
+from rapidfuzz import fuzz, utils
+from src.textSummarizer.config.configuration import ConfigurationManager
+from src.textSummarizer.components.keyword_extraction import deduplicate, get_keyword_extractor
+
+
+def reference_deduplicate(phrases, scorer, threshold):
+    """Pairwise deduplication: each phrase is compared with every phrase kept so far."""
+    kept = []
+    for phrase in phrases:
+        if all(
+            scorer(phrase, other, processor=utils.default_process, score_cutoff=threshold) == 0 for other in kept
+        ):
+            kept.append(phrase)
+    return kept
+
+
+def synthetic_text(words: int, vocabulary: int, seed: int) -> str:
+    """Sentences of random words drawn from a Zipf-like vocabulary, so phrases repeat and overlap."""
+    rng = random.Random(seed)
+    lexicon = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10))) for _ in range(vocabulary)]
+    weights = [1 / (rank + 1) for rank in range(vocabulary)]
+    sentences = []
+    for _ in range(words // 12):
+        sentence = rng.choices(lexicon, weights, k=rng.randint(6, 18))
+        sentences.append(" ".join(sentence).capitalize() + ".")
+    return " ".join(sentences)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--candidates", type=int, default=5000, help="Phrases YAKE proposes")
+    parser.add_argument("--text", type=Path, help="Document to use instead of a synthetic one")
+    parser.add_argument("--words", type=int, default=60000, help="Length of the synthetic document")
+    parser.add_argument("--threshold", type=float, help="Override the configured RapidFuzz threshold")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    config_manager = ConfigurationManager()
+    keyword_config = dataclasses.replace(
+        config_manager.get_keyword_extraction_config(), candidate_count=args.candidates, deduplication_threshold=1.0
+    )
+    rapidfuzz_config = config_manager.get_rapidfuzz_config()
+    if args.threshold is not None:
+        rapidfuzz_config = dataclasses.replace(rapidfuzz_config, threshold=args.threshold)
+    scorer = getattr(fuzz, rapidfuzz_config.scorer)
+
+    text = args.text.read_text() if args.text else synthetic_text(args.words, 4000, args.seed)
+    start = time.perf_counter()
+    phrases = [phrase for phrase, _ in get_keyword_extractor(keyword_config).extract_keywords(text)]
+    yake_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = reference_deduplicate(phrases, scorer, rapidfuzz_config.threshold)
+    reference_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    kept = deduplicate(phrases, scorer, rapidfuzz_config.threshold)
+    cdist_time = time.perf_counter() - start
+
+    print(f"{len(phrases)} candidate phrases ({yake_time:.2f}s of YAKE), {len(kept)} kept, "
+          f"scorer {rapidfuzz_config.scorer}, threshold {rapidfuzz_config.threshold}")
+    print(f"{'implementation':>15} {'seconds':>9} {'phrases/s':>10}")
+    print(f"{'pairwise':>15} {reference_time:>9.2f} {len(phrases) / reference_time:>10.0f}")
+    print(f"{'cdist':>15} {cdist_time:>9.2f} {len(phrases) / cdist_time:>10.0f}")
+    print(f"speedup {reference_time / cdist_time:.1f}x, identical output: {kept == expected}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Latency, peak RSS and output drift of every model at each inference precision.
+
+Each model is loaded at each precision in a fresh process, so peak RSS is its own, and run
+over chunks of a sample text the way the pipeline uses it: Longformer and the sentence model
+embed, the cross-encoder scores passages against a query, DistilBART summarizes. Drift is
+measured against the fp32 outputs:
+
+    longformer, sentence   mean / max (1 - cosine similarity) of the embeddings
+    rerank                 max |score difference|, and top-5 overlap of the ranking
+    distilbart             mean RapidFuzz ratio of the summaries, and share identical
+
+Run from the repository root:
+
+    python -m benchmarks.model_precision path/to/sample.txt [--models longformer rerank] [--chunks 16]
+"""
+import argparse
+import dataclasses
+import multiprocessing
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import numpy as np
+from rapidfuzz import fuzz
+from src.textSummarizer.config.configuration import ConfigurationManager
+from src.textSummarizer.components.model_loader import ModelLoader, PRECISIONS
+
+MODELS = ("longformer", "sentence", "rerank", "distilbart")
+
+
+def split_chunks(text: str, chunks: int, words: int):
+    tokens = text.split()
+    return [" ".join(tokens[start:start + words]) for start in range(0, len(tokens), words)][:chunks]
+
+
+def run_model(name: str, precision: str, chunks, query: str):
+    """Loads one model at one precision and runs it over the chunks (in a fresh process)."""
+    import torch
+    from src.textSummarizer.components.text_processing import TextProcessor
+
+    config_manager = ConfigurationManager()
+    model_config = dataclasses.replace(config_manager.get_model_config(), precision=precision, model_precisions={})
+    start = time.perf_counter()
+    loaded = ModelLoader(model_config).load_model(name)
+    load_time = time.perf_counter() - start
+
+    if name == "longformer":
+        processor = TextProcessor(dataclasses.replace(config_manager.get_text_processing_config(), use_embedding_store=False))
+        run = lambda: processor.embed_batch(chunks, loaded["model"], loaded["tokenizer"])
+    elif name == "sentence":
+        run = lambda: np.asarray(loaded.encode(chunks), dtype=np.float32)
+    elif name == "rerank":
+        def run():
+            inputs = loaded["tokenizer"]([query] * len(chunks), chunks, return_tensors="pt", padding=True, truncation=True)
+            with torch.inference_mode():
+                return loaded["model"](**inputs).logits.float().squeeze(-1).numpy()
+    else:
+        from src.textSummarizer.components.text_summarisation import TextSummarization
+        summarizer = TextSummarization(config_manager.get_text_summarization_config())
+        run = lambda: [summarizer.generate_summary(chunk, loaded["model"], loaded["tokenizer"]) for chunk in chunks]
+
+    run()  # Warm-up
+    start = time.perf_counter()
+    outputs = run()
+    latency = time.perf_counter() - start
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {"load": load_time, "latency": latency, "peak_rss_mb": peak_rss_mb, "outputs": outputs}
+
+
+def drift(name: str, reference, outputs) -> str:
+    if name in ("longformer", "sentence"):
+        reference = reference / np.linalg.norm(reference, axis=1, keepdims=True)
+        outputs = outputs / np.linalg.norm(outputs, axis=1, keepdims=True)
+        distance = 1 - np.sum(reference * outputs, axis=1)
+        return f"1-cos mean {distance.mean():.2e} max {distance.max():.2e}"
+    if name == "rerank":
+        top = min(5, len(reference))
+        overlap = len(set(np.argsort(-reference)[:top]) & set(np.argsort(-outputs)[:top])) / top
+        return f"max |diff| {np.max(np.abs(reference - outputs)):.3f}, top-{top} overlap {overlap:.0%}"
+    similarity = np.mean([fuzz.ratio(a, b) for a, b in zip(reference, outputs)])
+    identical = np.mean([a == b for a, b in zip(reference, outputs)])
+    return f"ratio {similarity:.1f}, identical {identical:.0%}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("text", type=Path, help="Sample document text")
+    parser.add_argument("--models", nargs="+", choices=MODELS, default=list(MODELS))
+    parser.add_argument("--precisions", nargs="+", choices=PRECISIONS, default=list(PRECISIONS))
+    parser.add_argument("--chunks", type=int, default=16, help="Chunks of the text to run through each model")
+    parser.add_argument("--chunk-words", type=int, default=300)
+    parser.add_argument("--query", default="What are the main findings and conclusions?")
+    args = parser.parse_args()
+
+    chunks = split_chunks(args.text.read_text(), args.chunks, args.chunk_words)
+    precisions = ["fp32"] + [precision for precision in args.precisions if precision != "fp32"]
+    context = multiprocessing.get_context("spawn")
+
+    print(f"{len(chunks)} chunks of up to {args.chunk_words} words")
+    print(f"{'model':>11} {'precision':>13} {'load s':>7} {'latency s':>10} {'peak RSS MB':>12}  drift vs fp32")
+    for name in args.models:
+        reference = None
+        for precision in precisions:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                result = executor.submit(run_model, name, precision, chunks, args.query).result()
+            if reference is None:
+                reference = result["outputs"]
+            print(f"{name:>11} {precision:>13} {result['load']:>7.1f} {result['latency']:>10.2f} "
+                  f"{result['peak_rss_mb']:>12.0f}  {drift(name, reference, result['outputs'])}")
+
+
+if __name__ == "__main__":
+    main()
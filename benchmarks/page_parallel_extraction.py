@@ -0,0 +1,56 @@
+"""Wall-clock time to extract one large PDF as the number of worker processes grows.
+
+Run from the repository root:
+
+    python -m benchmarks.page_parallel_extraction path/to/large.pdf --cores 1 2 4 8
+"""
+import argparse
+import dataclasses
+import os
+import time
+from pathlib import Path
+from src.textSummarizer.config.configuration import ConfigurationManager
+from src.textSummarizer.components.pdf_processing import PdfProcessing, init_worker
+from src.textSummarizer.components.pdf_extraction import get_page_count
+from src.textSummarizer.utils.process_pool import SupervisedPool
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pdf", type=Path)
+    parser.add_argument("--cores", type=int, nargs="+", default=[1, 2, 4, os.cpu_count()])
+    parser.add_argument("--pages-per-task", type=int, default=None)
+    args = parser.parse_args()
+
+    config = ConfigurationManager().get_data_processing_config()
+    # Always split, whatever the configured threshold, so every core count runs the same tasks;
+    # without the page cache, so every run really extracts
+    config = dataclasses.replace(
+        config,
+        page_parallel_threshold=1,
+        page_cache_max_mb=0,
+        pages_per_task=args.pages_per_task or config.pages_per_task
+    )
+    pdf_processing = PdfProcessing(config)
+    page_count = get_page_count(args.pdf)
+
+    start = time.perf_counter()
+    _, _, reference = pdf_processing.extract_pdf_with_retry(args.pdf, page_count)
+    baseline = time.perf_counter() - start
+
+    print(f"{args.pdf.name}: {page_count} pages, {config.pages_per_task} pages per task")
+    print(f"{'workers':>8} {'seconds':>9} {'speedup':>8} {'identical':>10}")
+    print(f"{'single':>8} {baseline:>9.2f} {1.0:>8.2f} {'-':>10}")
+
+    for cores in sorted(set(args.cores)):
+        tasks = pdf_processing.build_pool_tasks(0, args.pdf, page_count)
+        with SupervisedPool(num_workers=cores, initializer=init_worker, initargs=(config,)) as pool:
+            start = time.perf_counter()
+            pieces = {number: result for (_, number), result, _ in pool.imap_unordered(tasks)}
+            elapsed = time.perf_counter() - start
+        result = pdf_processing.assemble_pages([pieces[number] for number in sorted(pieces)], page_count)
+        print(f"{cores:>8} {elapsed:>9.2f} {baseline / elapsed:>8.2f} {str(result[2] == reference):>10}")
+
+
+if __name__ == "__main__":
+    main()
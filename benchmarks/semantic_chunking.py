@@ -0,0 +1,150 @@
+"""Sentences per second of the vectorized TextProcessor.semantic_chunking against the pairwise loop.
+
+A synthetic document of sentences drifting between topics is chunked by both, with a stand-in
+sentence model serving precomputed embeddings so the model does not dominate the timings. The
+report compares the chunks, and counts the similarity-vs-threshold comparisons that differ:
+float32 rounding is not the same in the two cosines, so a similarity within ~1e-7 of the
+threshold can fall on the other side of it. Run from the repository root:
+
+    python -m benchmarks.semantic_chunking [--sentences 100000] [--dim 384]
+"""
+import argparse
+import dataclasses
+import random
+import time
+import numpy as np
+from src.textSummarizer.logging import logger
+from src.textSummarizer.config.configuration import ConfigurationManager
+from src.textSummarizer.components.text_processing import TextProcessor
+
+
+class PrecomputedModel:
+    """Stands in for a SentenceTransformer, returning a fixed embedding per sentence."""
+
+    def __init__(self, embeddings: dict):
+        self.embeddings = embeddings
+
+    def encode(self, sentences):
+        return np.stack([self.embeddings[sentence] for sentence in sentences])
+
+
+def reference_semantic_chunking(processor: TextProcessor, phrases, model):
+    """TextProcessor.semantic_chunking as it was before it was vectorized, minus a debug print."""
+    if isinstance(phrases, str):
+        logger.warning("Input is a single string, splitting into sentences.")
+        phrases = phrases.splitlines()
+    if not phrases:
+        logger.warning("No phrases found!")
+        return [], [], 0.0
+
+    logger.info(f"Processing {len(phrases)} phrases")
+
+    try:
+        batch_size = processor.config.batch_size
+        max_tokens = processor.config.max_tokens
+        batches = [phrases[i:i+batch_size] for i in range(0, len(phrases), batch_size)]
+        encoded_phrases = []
+        for batch in batches:
+            encoded_phrases.append(processor.process_batch(batch, model))
+
+        encoded_phrases = np.vstack([emb for emb in encoded_phrases if len(emb) > 0])
+
+        if len(encoded_phrases) <= 1:
+            logger.warning("Insufficient embeddings generated")
+            return [], [], 0.0
+
+        phrase_pairs = [(encoded_phrases[i-1], encoded_phrases[i])
+                        for i in range(1, len(encoded_phrases))]
+        similarity_scores = []
+        for pair in phrase_pairs:
+            similarity_scores.append(processor.calculate_similarity_score(pair))
+
+        token_counts = []
+        for phrase in phrases:
+            token_counts.append(processor.count_tokens(phrase))
+
+        threshold = processor.find_dynamic_threshold(similarity_scores)
+
+        chunks = []
+        current_chunk = []
+        current_chunk_length = 0
+
+        for i, phrase in enumerate(phrases):
+            phrase_tokens = token_counts[i]
+
+            if current_chunk_length + phrase_tokens > max_tokens:
+                chunks.append(' '.join(current_chunk))
+                current_chunk = [phrase]
+                current_chunk_length = phrase_tokens
+            else:
+                current_chunk.append(phrase)
+                current_chunk_length += phrase_tokens
+
+            if (i > 0 and i - 1 < len(similarity_scores) and
+                similarity_scores[i - 1] < threshold):
+                chunks.append(' '.join(current_chunk))
+                current_chunk = [phrase]
+                current_chunk_length = phrase_tokens
+
+        if current_chunk:
+            chunks.append(' '.join(current_chunk))
+
+        return chunks, similarity_scores, threshold
+
+    except Exception as e:
+        logger.error(f"Error in semantic chunking: {str(e)}")
+        return [], [], 0.0
+
+
+def synthetic_document(sentences: int, dim: int, seed: int):
+    """Sentences of 5-40 words whose embeddings drift around a topic that changes every so often."""
+    rng = random.Random(seed)
+    generator = np.random.default_rng(seed)
+    topic = generator.standard_normal(dim)
+    phrases, embeddings = [], {}
+    for index in range(sentences):
+        if rng.random() < 0.02:
+            topic = generator.standard_normal(dim)
+        words = [f"w{rng.randrange(5000)}" for _ in range(rng.randint(5, 40))]
+        phrase = f"s{index} " + " ".join(words)
+        phrases.append(phrase)
+        embeddings[phrase] = (topic + 0.8 * generator.standard_normal(dim)).astype(np.float32)
+    return phrases, PrecomputedModel(embeddings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sentences", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=384, help="Embedding size")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # Without the embedding store, so both sides encode every sentence
+    config = dataclasses.replace(ConfigurationManager().get_text_processing_config(), use_embedding_store=False)
+    processor = TextProcessor(config)
+    phrases, model = synthetic_document(args.sentences, args.dim, args.seed)
+
+    start = time.perf_counter()
+    expected, expected_scores, expected_threshold = reference_semantic_chunking(processor, phrases, model)
+    reference_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    chunks, scores, threshold = processor.semantic_chunking(phrases, model)
+    vectorized_time = time.perf_counter() - start
+
+    scores, expected_scores = np.array(scores), np.array(expected_scores)
+    score_error = float(np.max(np.abs(scores - expected_scores)))
+    flipped = int(np.count_nonzero((scores < threshold) != (expected_scores < expected_threshold)))
+    common = len(set(expected) & set(chunks))
+    print(f"{len(phrases)} sentences, max_tokens {processor.config.max_tokens}, "
+          f"threshold {threshold:.6f} (reference {expected_threshold:.6f}), max similarity difference {score_error:.2e}, "
+          f"{flipped} threshold comparisons differ")
+    print(f"{'implementation':>15} {'seconds':>9} {'sentences/s':>12} {'chunks':>7}")
+    print(f"{'pairwise loop':>15} {reference_time:>9.2f} {len(phrases) / reference_time:>12.0f} {len(expected):>7}")
+    print(f"{'vectorized':>15} {vectorized_time:>9.2f} {len(phrases) / vectorized_time:>12.0f} {len(chunks):>7}")
+    print(f"speedup {reference_time / vectorized_time:.1f}x, identical chunks: {chunks == expected} "
+          f"({common}/{len(expected)} reference chunks reproduced)")
+
+
+if __name__ == "__main__":
+    main()
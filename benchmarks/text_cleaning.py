@@ -0,0 +1,135 @@
+"""Sentences per second of TextCleaner against the original per-sentence cleaning steps.
+
+Both run the configured text_preprocessing steps over the sentences of a sample corpus, and
+the outputs are checked to be identical. Spelling correction is left out unless --spelling
+is given, as it dominates the run time and is the same code in both. Run from the
+repository root:
+
+    python -m benchmarks.text_cleaning path/to/sample_corpus [--spelling]
+"""
+import argparse
+import dataclasses
+import re
+import string
+import time
+import warnings
+from pathlib import Path
+from bs4 import BeautifulSoup
+import contractions
+from unidecode import unidecode
+from symspellpy import Verbosity
+from nltk import pos_tag
+from nltk.tokenize import word_tokenize, sent_tokenize
+from src.textSummarizer.config.configuration import ConfigurationManager
+from src.textSummarizer.components.pdf_extraction import PdfPageStream
+from src.textSummarizer.components.text_preprocessing import TextPreProcessing
+
+
+def reference_clean_sentence(config, sym_spell, sentence):
+    """The cleaning steps as TextPreProcessing ran them before TextCleaner."""
+
+    def remove_html(text):
+        soup = BeautifulSoup(text, 'html.parser')
+        return soup.get_text()
+
+    def remove_urls(text):
+        pattern = re.compile(r'https?://(www\.)?(\w+)(\.\w+)(/\w*)?')
+        return re.sub(pattern, "", text)
+
+    def remove_emails(text):
+        pattern = re.compile(r"[\w\.-]+@[\w\.-]+\.\w+")
+        return re.sub(pattern, "", text)
+
+    def handle_accents(text):
+        return unidecode(text)
+
+    def remove_unicode_chars(text):
+        return text.encode("ascii", "ignore").decode()
+
+    def expand_contractions(text):
+        return contractions.fix(text)
+
+    def remove_punctuations(text):
+        return re.sub('[%s]' % re.escape(string.punctuation), " ", text)
+
+    def remove_digits(text):
+        pattern = re.compile(r'\w*\d+\w*')
+        return re.sub(pattern, "", text)
+
+    def remove_extra_spaces(text):
+        return re.sub(' +', ' ', text).strip()
+
+    def correct_spelling_symspell(text):
+        corrected_words = []
+        for word, tag in pos_tag(word_tokenize(text)):
+            if tag in ('NNP', 'NNPS'):
+                corrected_words.append(word)
+            else:
+                corrected_word = sym_spell.lookup(word, Verbosity.CLOSEST, max_edit_distance=2, include_unknown=True)
+                corrected_words.append(corrected_word[0].term if corrected_word else word)
+        return " ".join(corrected_words)
+
+    if config.remove_html:
+        sentence = remove_html(sentence)
+    if config.remove_urls:
+        sentence = remove_urls(sentence)
+    if config.remove_emails:
+        sentence = remove_emails(sentence)
+    if config.handle_accents:
+        sentence = handle_accents(sentence)
+    if config.remove_unicode_chars:
+        sentence = remove_unicode_chars(sentence)
+    if config.expand_contractions:
+        sentence = expand_contractions(sentence)
+    if config.remove_punctuations:
+        sentence = remove_punctuations(sentence)
+    if config.remove_digits:
+        sentence = remove_digits(sentence)
+    if config.remove_extra_spaces:
+        sentence = remove_extra_spaces(sentence)
+    if config.correct_spelling:
+        sentence = correct_spelling_symspell(sentence)
+    return sentence
+
+
+def load_documents(corpus: Path):
+    documents = []
+    for pdf_path in sorted(corpus.glob("*.pdf")):
+        with PdfPageStream(pdf_path) as stream:
+            documents.append(sent_tokenize("\n".join(text for _, text in stream)))
+    return documents
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("corpus", type=Path, help="Folder of sample PDFs")
+    parser.add_argument("--spelling", action="store_true", help="Include spelling correction")
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore", module="bs4")
+
+    config = ConfigurationManager().get_text_preprocessing_config()
+    config = dataclasses.replace(config, correct_spelling=config.correct_spelling and args.spelling)
+    text_preprocessing = TextPreProcessing(config)
+    documents = load_documents(args.corpus)
+    sentences = sum(len(document) for document in documents)
+
+    start = time.perf_counter()
+    expected = [[reference_clean_sentence(config, text_preprocessing.sym_spell, s) for s in document] for document in documents]
+    reference_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cleaned = [text_preprocessing.clean_sentences(document) for document in documents]
+    engine_time = time.perf_counter() - start
+
+    identical = all(
+        "\n".join(a).encode() == "\n".join(b).encode() for a, b in zip(cleaned, expected)
+    )
+    print(f"{len(documents)} documents, {sentences} sentences, spelling correction {'on' if config.correct_spelling else 'off'}")
+    print(f"{'implementation':>15} {'seconds':>9} {'sentences/s':>12}")
+    print(f"{'reference':>15} {reference_time:>9.2f} {sentences / reference_time:>12.0f}")
+    print(f"{'TextCleaner':>15} {engine_time:>9.2f} {sentences / engine_time:>12.0f}")
+    print(f"speedup {reference_time / engine_time:.1f}x, byte-identical output: {identical}")
+
+
+if __name__ == "__main__":
+    main()
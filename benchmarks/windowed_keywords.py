@@ -0,0 +1,86 @@
+"""Overlap and speed of windowed keyword extraction against a single YAKE pass per document.
+
+For every document of a reference set, the top-k keywords are extracted once over the whole
+text and once per window size, and the report gives, per window size, the share of the
+single-pass keywords the windowed run also returned: exactly (case-insensitive) and fuzzily
+(scoring at least the RapidFuzz threshold against one of them). Both runs go through the
+same deduplication and run in this process, one window after the other. The reference set is
+a folder of processed texts (one sentence per line), or the preprocessed documents in the
+manifest. Run from the repository root:
+
+    python -m benchmarks.windowed_keywords [--corpus path/to/texts] [--window-sentences 250 500 1000]
+"""
+import argparse
+import dataclasses
+import time
+from pathlib import Path
+from rapidfuzz import fuzz, process, utils
+from src.textSummarizer.config.configuration import ConfigurationManager
+from src.textSummarizer.components.keyword_extraction import (
+    window_tasks,
+    extract_candidates,
+    merge_candidates,
+    select_keywords
+)
+from src.textSummarizer.utils.manifest import Manifest
+
+
+def load_texts(corpus: Path, manifest_file: Path):
+    if corpus is not None:
+        return [path.read_text() for path in sorted(corpus.glob("*.txt"))]
+    with Manifest(manifest_file) as manifest:
+        return [document["processed_text"] or "" for document in manifest.documents("text_preprocessing", "done")]
+
+
+def extract(keyword_config, rapidfuzz_config, text):
+    candidates = [extract_candidates(config, window) for config, window in window_tasks(keyword_config, text)]
+    return select_keywords(merge_candidates(candidates), rapidfuzz_config, keyword_config.top_k)
+
+
+def overlap(reference, keywords, rapidfuzz_config):
+    """Shares of `reference` found in `keywords`, exactly and fuzzily."""
+    if not reference:
+        return 1.0, 1.0
+    exact = len({k.lower() for k in reference} & {k.lower() for k in keywords}) / len(reference)
+    if not keywords:
+        return exact, 0.0
+    scores = process.cdist(reference, keywords, scorer=getattr(fuzz, rapidfuzz_config.scorer),
+                           processor=utils.default_process, score_cutoff=rapidfuzz_config.threshold)
+    return exact, float(scores.any(axis=1).mean())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", type=Path, help="Folder of processed .txt documents, instead of the manifest")
+    parser.add_argument("--window-sentences", type=int, nargs="+", default=[250, 500, 1000])
+    args = parser.parse_args()
+
+    config_manager = ConfigurationManager()
+    keyword_config = config_manager.get_keyword_extraction_config()
+    rapidfuzz_config = config_manager.get_rapidfuzz_config()
+    texts = load_texts(args.corpus, keyword_config.manifest_file)
+    if not texts:
+        raise SystemExit("No reference documents found.")
+    sentences = sum(text.count("\n") + 1 for text in texts)
+
+    single_config = dataclasses.replace(keyword_config, window_sentences=0)
+    start = time.perf_counter()
+    reference = [extract(single_config, rapidfuzz_config, text) for text in texts]
+    single_time = time.perf_counter() - start
+
+    print(f"{len(texts)} documents, {sentences} sentences, top {keyword_config.top_k} keywords")
+    print(f"{'window':>8} {'seconds':>9} {'speedup':>8} {'exact overlap':>14} {'fuzzy overlap':>14}")
+    print(f"{'single':>8} {single_time:>9.2f} {1:>7.1f}x {1:>14.1%} {1:>14.1%}")
+    for window_sentences in args.window_sentences:
+        windowed_config = dataclasses.replace(keyword_config, window_sentences=window_sentences)
+        start = time.perf_counter()
+        windowed = [extract(windowed_config, rapidfuzz_config, text) for text in texts]
+        windowed_time = time.perf_counter() - start
+        overlaps = [overlap(r, w, rapidfuzz_config) for r, w in zip(reference, windowed)]
+        exact = sum(e for e, _ in overlaps) / len(overlaps)
+        fuzzy = sum(f for _, f in overlaps) / len(overlaps)
+        print(f"{window_sentences:>8} {windowed_time:>9.2f} {single_time / windowed_time:>7.1f}x {exact:>14.1%} {fuzzy:>14.1%}")
+
+
+if __name__ == "__main__":
+    main()
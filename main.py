@@ -1,6 +1,7 @@
 from src.textSummarizer.pipeline.stage_01_data_ingestion import DataIngestionTrainingPipeline
 from src.textSummarizer.pipeline.stage_02_pdf_processing import PdfProcessingPipeline
 from src.textSummarizer.pipeline.stage_03_text_preprocessing import TextPreProcessingPipeline
+from src.textSummarizer.pipeline.stage_02_03_text_streaming import TextStreamingPipeline
 from src.textSummarizer.pipeline.stage_04_keyword_extraction import KeywordExtractionPipeline
 from src.textSummarizer.pipeline.stage_05_text_processing import TextProcessingPipeline
 from src.textSummarizer.pipeline.stage_06_summarization import TextSummarizationPipeline
@@ -55,6 +56,20 @@ def run_text_preprocessing_stage(processed_data: List):
         logger.error(e)
         raise e
 
+# Stages 2 and 3 as one stream: pages go straight from extraction into preprocessing
+
+def run_text_streaming_stage():
+    STAGE_NAME = "Text Streaming Stage"
+    try:
+        logger.info(f">>>>>>> stage {STAGE_NAME} started <<<<<<<<<")
+        text_streaming = TextStreamingPipeline()
+        text_streaming.main()
+        logger.info(f">>>>>>> stage {STAGE_NAME} completed <<<<<<<<<")
+
+    except Exception as e:
+        logger.error(e)
+        raise e
+
 # Stage 4: Keyword Extraction
 
 def run_keyword_extraction_stage():
@@ -102,14 +117,18 @@ def run_text_summarization_stage(chunks, chunked_embeddings, models):
 if __name__ == "__main__":
     config_manager = ConfigurationManager()
     model_config = config_manager.get_model_config()
+    text_streaming_config = config_manager.get_text_streaming_config()
     model_loader = ModelLoader(model_config)
     models = model_loader.load_models()
     
     
     # Uncomment the stages to run them in sequence or as needed
     run_data_ingestion_stage()
-    processed_data = run_data_processing_stage() #category, page_count, text 
-    run_text_preprocessing_stage(processed_data)
+    if text_streaming_config.enabled:
+        run_text_streaming_stage()  # Stages 2 and 3 as one stream, with flat memory
+    else:
+        processed_data = run_data_processing_stage() #category, page_count, text 
+        run_text_preprocessing_stage(processed_data)
     run_keyword_extraction_stage()
     chunks, chunked_embeddings= run_text_processing_stage(models)
     run_text_summarization_stage(chunks=chunks,chunked_embeddings=chunked_embeddings,models=models)
\ No newline at end of file
@@ -1,12 +1,16 @@
 from src.textSummarizer.utils.common import (
     download_file, 
-    download_files_in_parallel, 
     move_to_failed, 
+    deduplicate_downloads,
     get_size
 )
+from src.textSummarizer.utils.async_download import download_files_concurrently
+from src.textSummarizer.utils.retry import RetryPolicy, RetryBudget
+from src.textSummarizer.utils.manifest import Manifest
 from src.textSummarizer.entity import DataIngestionConfig
 from pathlib import Path
 import os
+import json
 
 class DataIngestion:
     def __init__(self, config: DataIngestionConfig) -> None:
@@ -31,15 +35,46 @@ class DataIngestion:
     def download_multiple_files(self) -> None:
         """
         Downloads multiple files concurrently from a list of URLs.
-        Utilizes the download_files_in_parallel function for parallel downloading.
+        Utilizes the async, connection-pooled downloader bounded by the configured limits.
+        Files recorded in the download cache are revalidated and skipped when unchanged.
+        Documents are stored by content hash and duplicates are recorded as aliases.
         """
         print("Starting parallel download of files...")
         
         # Download multiple files concurrently
-        results = download_files_in_parallel(urls=self.config.urls, local_dir=self.config.local_data_file, failed_dir=self.config.failed_data_file)
+        results = download_files_concurrently(
+            urls=self.config.urls,
+            local_dir=self.config.local_data_file,
+            failed_dir=self.config.failed_data_file,
+            max_concurrency=self.config.max_concurrency,
+            per_host_limit=self.config.per_host_limit,
+            timeout=self.config.timeout,
+            chunk_size=self.config.chunk_size,
+            cache_file=self.config.download_cache_file,
+            retry_policy=RetryPolicy(
+                max_retries=self.config.max_retries,
+                wait_time=self.config.wait_time,
+                max_wait_time=self.config.max_wait_time,
+                budget=RetryBudget(self.config.retry_budget)
+            )
+        )
         
-        import pandas as pd
-        pd.DataFrame(results).to_csv('metadata.csv',index=False)
+        documents, report = deduplicate_downloads(results=results, local_dir=self.config.local_data_file)
+        with open(self.config.dedup_report_file, 'w') as file:
+            json.dump(report, file, indent=2)
+        print(f"Deduplication saved {report['duplicate_files']} files and {report['duplicate_pages']} pages of processing.")
+
+        # Register every unique document in the manifest, keyed by its content hash
+        with Manifest(self.config.manifest_file) as manifest:
+            for document in documents:
+                doc_id = document.get("sha256") or Path(document["file_name"]).stem
+                manifest.upsert_document(
+                    doc_id=doc_id,
+                    file_name=document["file_name"],
+                    page_count=document.get("page_count"),
+                    metadata=document
+                )
+                manifest.set_stage_status(doc_id, "data_ingestion", "done")
 
 
     def check_file_size(self, file_path: Path) -> str:
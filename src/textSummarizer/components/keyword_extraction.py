@@ -0,0 +1,162 @@
+import dataclasses
+from functools import lru_cache
+from typing import Callable, Dict, List, Tuple
+import numpy as np
+import pandas as pd
+import yake
+from rapidfuzz import fuzz, process, utils
+from dask import delayed, compute
+from dask.diagnostics import ProgressBar
+from src.textSummarizer.entity import KeywordExtractionConfig, RapidfuzzConfig
+from src.textSummarizer.logging import logger
+from src.textSummarizer.utils.manifest import Manifest
+
+
+@lru_cache(maxsize=8)
+def get_keyword_extractor(config: KeywordExtractionConfig) -> yake.KeywordExtractor:
+    """The YAKE extractor of this process for a config, built once per worker."""
+    # Positional, as the keyword names differ between YAKE releases
+    return yake.KeywordExtractor(
+        config.language,
+        config.max_ngram_size,
+        config.deduplication_threshold,
+        config.deduplication_algo,
+        config.window_size,
+        config.candidate_count,
+        None,
+        None if config.stop_words else set()
+    )
+
+
+def deduplicate(phrases: List[str], scorer: Callable, threshold: float, block_size: int = 256) -> List[str]:
+    """Drops near-duplicate phrases, keeping the earliest (best ranked) of each group.
+
+    A phrase is kept unless it scores at least `threshold` against an earlier kept phrase.
+    Phrases are taken a block at a time: one `process.cdist` call scores the block against
+    every phrase kept so far, and a second scores what survives against itself, so only the
+    greedy pass within a block is left to Python.
+    """
+    kept = []
+    for start in range(0, len(phrases), block_size):
+        block = phrases[start:start + block_size]
+        # Scores under score_cutoff come back as 0, so any non-zero score is a match
+        if kept:
+            scores = process.cdist(block, kept, scorer=scorer, processor=utils.default_process,
+                                   score_cutoff=threshold, workers=1)
+            block = [phrase for phrase, row in zip(block, scores.any(axis=1)) if not row]
+        if not block:
+            continue
+        scores = process.cdist(block, block, scorer=scorer, processor=utils.default_process,
+                               score_cutoff=threshold, workers=1)
+        keep = np.ones(len(block), dtype=bool)
+        for index in range(1, len(block)):
+            keep[index] = not np.any(keep[:index] & (scores[index, :index] > 0))
+        kept.extend(phrase for phrase, kept_phrase in zip(block, keep) if kept_phrase)
+    return kept
+
+
+def split_windows(text: str, window_sentences: int) -> List[str]:
+    """Splits a processed text (one sentence per line) into windows of `window_sentences` sentences."""
+    sentences = text.split("\n")
+    if window_sentences <= 0 or len(sentences) <= window_sentences:
+        return [text]
+    return ["\n".join(sentences[start:start + window_sentences]) for start in range(0, len(sentences), window_sentences)]
+
+
+def window_tasks(keyword_config: KeywordExtractionConfig, text: str) -> List[Tuple[KeywordExtractionConfig, str]]:
+    """The (config, window) YAKE runs over for one document."""
+    windows = split_windows(text, keyword_config.window_sentences)
+    if len(windows) > 1:
+        # The merged candidates are deduplicated with RapidFuzz, so YAKE's own deduplication,
+        # which is quadratic in pure Python and most of its run time, is skipped per window
+        keyword_config = dataclasses.replace(keyword_config, deduplication_threshold=1.0)
+    return [(keyword_config, window) for window in windows]
+
+
+def extract_candidates(keyword_config: KeywordExtractionConfig, text: str) -> List[Tuple[str, float]]:
+    """Worker task: YAKE's (phrase, score) candidates for one text or window, best (lowest score) first."""
+    if keyword_config.remove_newline:
+        text = text.replace("\n", " ")
+    if not text.strip():
+        return []
+    return [(phrase, float(score)) for phrase, score in get_keyword_extractor(keyword_config).extract_keywords(text)]
+
+
+def merge_candidates(windows: List[List[Tuple[str, float]]]) -> List[str]:
+    """Ranks the candidates of a document's windows into one list, best first.
+
+    The scores a phrase gets in each window are combined as 1 / sum(1 / score): a phrase
+    found in a single window keeps its score, and one found in several ranks higher. With a
+    single window this is YAKE's own ranking.
+    """
+    inverse_scores: Dict[str, float] = {}
+    best: Dict[str, Tuple[float, str]] = {}
+    for candidates in windows:
+        for phrase, score in candidates:
+            key = phrase.lower()
+            inverse_scores[key] = inverse_scores.get(key, 0.0) + 1 / max(score, 1e-12)
+            if key not in best or score < best[key][0]:
+                best[key] = (score, phrase)  # Keep the casing of its best scoring occurrence
+    ranked = sorted(inverse_scores, key=lambda key: (-inverse_scores[key], best[key][0]))
+    return [best[key][1] for key in ranked]
+
+
+def select_keywords(candidates: List[str], rapidfuzz_config: RapidfuzzConfig, top_k: int) -> List[str]:
+    """Deduplicates ranked candidates and keeps the first `top_k`."""
+    scorer = getattr(fuzz, rapidfuzz_config.scorer)
+    return deduplicate(candidates, scorer, rapidfuzz_config.threshold)[:top_k]
+
+
+class KeywordExtraction:
+    """Extracts the keywords of every preprocessed document.
+
+    Documents longer than `window_sentences` sentences are split into windows, so YAKE's
+    cost stays bounded however long a document is. YAKE runs over every window of every
+    document in a pool of processes; the candidates of a document's windows are merged into
+    one ranking and deduplicated with RapidFuzz, best ranked first. The keywords of each
+    document are written, with its processed text, to `keywords_file` for the later stages.
+    """
+
+    def __init__(self, keyword_config: KeywordExtractionConfig, rapidfuzz_config: RapidfuzzConfig):
+        self.config = keyword_config
+        self.rapidfuzz_config = rapidfuzz_config
+
+    def extract_keywords(self, texts: List[str]) -> List[List[str]]:
+        """Keywords of each text, in order."""
+        tasks = [
+            [delayed(extract_candidates)(config, window) for config, window in window_tasks(self.config, text)]
+            for text in texts
+        ]
+        with ProgressBar():
+            results = compute(*tasks, scheduler='processes', num_workers=self.config.num_workers or None)
+        return [
+            select_keywords(merge_candidates(windows), self.rapidfuzz_config, self.config.top_k)
+            for windows in results
+        ]
+
+    def extract_keywords_from_file(self) -> List[List[str]]:
+        """Extracts the keywords of every document whose text preprocessing is done.
+
+        Returns:
+            List[List[str]]: The keywords of each document, in the order of `keywords_file`.
+        """
+        with Manifest(self.config.manifest_file) as manifest:
+            documents = manifest.documents(stage="text_preprocessing", status="done")
+            if not documents:
+                logger.warning("No preprocessed documents to extract keywords from.")
+                return []
+            logger.info(f"Extracting keywords from {len(documents)} documents")
+
+            keywords = self.extract_keywords([document["processed_text"] or "" for document in documents])
+            for document, document_keywords in zip(documents, keywords):
+                logger.info(f"Keywords of {document['file_name']}: {document_keywords}")
+                manifest.set_stage_status(document["doc_id"], "keyword_extraction", "done")
+
+        pd.DataFrame({
+            "doc_id": [document["doc_id"] for document in documents],
+            "file_name": [document["file_name"] for document in documents],
+            "keywords": [", ".join(document_keywords) for document_keywords in keywords],
+            "processed_text": [document["processed_text"] for document in documents],
+        }).to_csv(self.config.keywords_file, index=False)
+        logger.info(f"Keywords saved to {self.config.keywords_file}")
+        return keywords
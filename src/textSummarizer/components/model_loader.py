@@ -6,6 +6,9 @@ from transformers import (
 from sentence_transformers import SentenceTransformer
 import torch
 from src.textSummarizer.entity import ModelConfig
+from src.textSummarizer.logging import logger
+
+PRECISIONS = ("fp32", "bf16", "int8-dynamic")
 
 class ModelLoader:
     def __init__(self, config: ModelConfig):
@@ -28,25 +31,61 @@ class ModelLoader:
             "rerank_tokenizer": cross_encoder["tokenizer"]
         }
         
+    def load_model(self, name: str):
+        """Loads one model: 'longformer', 'distilbart', 'sentence' or 'rerank'."""
+        loaders = {
+            "longformer": self._load_longformer,
+            "distilbart": self._load_distilbart,
+            "sentence": self._load_sentence_transformer,
+            "rerank": self._load_cross_encoder
+        }
+        return loaders[name]()
+
+    def precision_for(self, name: str) -> str:
+        """The precision of a model: its entry in `model_precisions`, otherwise `precision`."""
+        precision = self.config.model_precisions.get(name, self.config.precision)
+        if precision not in PRECISIONS:
+            raise ValueError(f"Unknown precision '{precision}' for {name}, expected one of {', '.join(PRECISIONS)}.")
+        return precision
+
+    def apply_precision(self, model, name: str):
+        """Casts a loaded model to bf16, or quantizes its Linear layers to int8, as configured.
+
+        Dynamic int8 quantization only has CPU kernels, so on a GPU the model stays in fp32.
+        The precision is recorded on the model as `inference_precision`, which keys its
+        stored embeddings.
+        """
+        precision = self.precision_for(name)
+        if precision == "int8-dynamic" and self.device.type != "cpu":
+            logger.warning(f"int8-dynamic only runs on CPU, keeping {name} in fp32 on {self.device}.")
+            precision = "fp32"
+        if precision == "bf16":
+            model = model.to(torch.bfloat16)
+        elif precision == "int8-dynamic":
+            model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+        model.eval()
+        model.inference_precision = precision
+        logger.info(f"Loaded {name} in {precision}")
+        return model
+
     def _load_longformer(self):
         model_name = self.config.longformer_model_name
         tokenizer = LongformerTokenizer.from_pretrained(model_name)
         model = LongformerModel.from_pretrained(model_name).to(self.device)
-        return {"model": model, "tokenizer": tokenizer}
+        return {"model": self.apply_precision(model, "longformer"), "tokenizer": tokenizer}
     
     def _load_distilbart(self):
         model_name = self.config.distilbart_model_name
         tokenizer = BartTokenizer.from_pretrained(model_name)
         model = BartForConditionalGeneration.from_pretrained(model_name).to(self.device)
-        return {"model": model, "tokenizer": tokenizer}
+        return {"model": self.apply_precision(model, "distilbart"), "tokenizer": tokenizer}
     
     def _load_sentence_transformer(self):
         model_name = self.config.sentence_model_name
-        return SentenceTransformer(model_name).to(self.device)
+        return self.apply_precision(SentenceTransformer(model_name).to(self.device), "sentence")
     
     def _load_cross_encoder(self):
         model_name = self.config.rerank_model_name
         tokenizer = AutoTokenizer.from_pretrained(model_name)
         model = AutoModelForSequenceClassification.from_pretrained(model_name).to(self.device)
-        model.eval()
-        return {"model": model, "tokenizer": tokenizer}
\ No newline at end of file
+        return {"model": self.apply_precision(model, "rerank"), "tokenizer": tokenizer}
\ No newline at end of file
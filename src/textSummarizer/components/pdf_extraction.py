@@ -1,56 +1,295 @@
-import os
 from src.textSummarizer.logging import logger
+from src.textSummarizer.utils.common import count_pdf_pages
 from pathlib import Path
 from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdfdocument import PDFDocument
 from pdfminer.pdfinterp import PDFResourceManager, PDFPageInterpreter
 from pdfminer.converter import TextConverter
-from pdfminer.layout import LAParams
+from pdfminer.layout import LAParams, LTChar, LTContainer
 import io
+import time
 
-# Text extraction logic
-def iter_text_per_page(pdf_file : Path, password='', page_numbers: list=None, maxpages=0, caching=True, codec='utf-8', laparams=None):
-    """Extract text from PDF file per page."""
-    if laparams is None:
-        laparams = LAParams()
-
-    with open(pdf_file, "rb") as fp:
-        rsrcmgr = PDFResourceManager(caching=caching)
-        idx = 1
-        for page in PDFPage.get_pages(fp, page_numbers, maxpages=maxpages, password=password, caching=caching):
-            with io.StringIO() as output_string:
-                device = TextConverter(rsrcmgr, output_string, codec=codec, laparams=laparams)
-                interpreter = PDFPageInterpreter(rsrcmgr, device)
+try:
+    import pypdfium2
+except ImportError:  # Optional, faster extraction backend
+    pypdfium2 = None
+
+# Extraction quality tiers, as pdfminer layout settings:
+#   fast      no layout analysis, characters are emitted in content-stream order
+#   balanced  groups lines and text boxes, but skips the hierarchical grouping of boxes that
+#             orders them for reading (boxes are ordered by position instead)
+#   full      pdfminer's default layout analysis
+EXTRACTION_TIERS = {
+    "fast": None,
+    "balanced": {"boxes_flow": None},
+    "full": {},
+}
+
+def get_laparams(tier: str = "full"):
+    """Returns the pdfminer layout parameters for an extraction tier (None disables layout analysis)."""
+    if tier not in EXTRACTION_TIERS:
+        raise ValueError(f"Unknown extraction tier '{tier}', expected one of {list(EXTRACTION_TIERS)}.")
+    settings = EXTRACTION_TIERS[tier]
+    return None if settings is None else LAParams(**settings)
+
+class FastTextConverter(TextConverter):
+    """Text converter for the 'fast' tier: no layout analysis, only line breaks and gaps.
+
+    Characters are written in content-stream order. A newline is inserted when the baseline
+    moves and a space when the horizontal gap to the previous character is wide, which keeps
+    words and lines apart without grouping the page into text boxes.
+    """
+
+    def receive_layout(self, ltpage):
+        previous = None
+
+        def render(item):
+            nonlocal previous
+            if isinstance(item, LTContainer):
+                for child in item:
+                    render(child)
+            elif isinstance(item, LTChar):
+                if previous is not None:
+                    if abs(item.y0 - previous.y0) > min(item.height, previous.height) / 2:
+                        self.write_text("\n")
+                    elif item.x0 - previous.x1 > item.size / 4:
+                        self.write_text(" ")
+                self.write_text(item.get_text())
+                previous = item
+
+        render(ltpage)
+        self.write_text("\n\f")
+
+class PdfPageStream:
+    """Opens a PDF once and streams the text of its pages.
+
+    The page count is read from the root of the page tree when the stream is opened, and
+    pages are then walked a single time, so memory stays constant in the document length.
+
+    Usage:
+        with PdfPageStream(pdf_path) as stream:
+            for page_number, text in stream:
+                ...
+    """
+
+    def __init__(self, pdf_file: Path, password='', caching=True, codec='utf-8', laparams=None, tier="full"):
+        self.pdf_file = pdf_file
+        self.password = password
+        self.caching = caching
+        self.codec = codec
+        self.laparams = get_laparams(tier) if laparams is None else laparams
+        self._fp = None
+        self.document = None
+        self.page_count = 0
+
+    def __enter__(self):
+        self._fp = open(self.pdf_file, "rb")
+        parser = PDFParser(self._fp)
+        self.document = PDFDocument(parser, password=self.password, caching=self.caching)
+        self.page_count = count_pdf_pages(self.document)
+        return self
+
+    def __exit__(self, *exc):
+        self._fp.close()
+        self._fp = None
+
+    def use_tier(self, tier: str):
+        """Switches the extraction tier, e.g. once the page count has categorized the document."""
+        self.laparams = get_laparams(tier)
+
+    def __iter__(self):
+        return self.pages()
+
+    def pages(self, start: int = 0, end: int = None):
+        """Yields (page number, text) for the 0-based page range [start, end).
+
+        Pages before `start` are only walked in the page tree, never interpreted.
+        """
+        rsrcmgr = PDFResourceManager(caching=self.caching)
+        # One device and interpreter per document; the buffer is reset after every page
+        with io.StringIO() as output_string:
+            converter = TextConverter if self.laparams is not None else FastTextConverter
+            device = converter(rsrcmgr, output_string, codec=self.codec, laparams=self.laparams)
+            interpreter = PDFPageInterpreter(rsrcmgr, device)
+            for idx, page in enumerate(PDFPage.create_pages(self.document), start=1):
+                if idx - 1 < start:
+                    continue
+                if end is not None and idx - 1 >= end:
+                    break
                 interpreter.process_page(page)
                 yield idx, output_string.getvalue()
-                idx += 1
+                output_string.seek(0)
+                output_string.truncate(0)
+            device.close()
 
-# PDF categorization based on page count
-def categorize_pdf(pdf_path: Path):
-    """Categorizes a PDF as 'Short', 'Medium', or 'Long' based on page count."""
-    try:
-        with open(pdf_path, "rb") as fh:
-            page_count = sum(1 for _ in PDFPage.get_pages(fh))
-    except Exception as e:
-        logger.error(f"Error reading page count for {pdf_path}: {e}")
-        return 'Error', 0
+class PdfiumPageStream:
+    """Same interface as `PdfPageStream`, backed by PDFium through pypdfium2.
+
+    Much faster than pdfminer, at the cost of pdfminer's layout analysis.
+    """
+
+    def __init__(self, pdf_file: Path, password='', **kwargs):
+        if pypdfium2 is None:
+            raise ImportError("The 'pypdfium2' extraction backend requires the pypdfium2 package.")
+        self.pdf_file = pdf_file
+        self.password = password or None
+        self.document = None
+        self.page_count = 0
+
+    def __enter__(self):
+        self.document = pypdfium2.PdfDocument(str(self.pdf_file), password=self.password)
+        self.page_count = len(self.document)
+        return self
+
+    def __exit__(self, *exc):
+        self.document.close()
+        self.document = None
 
+    def use_tier(self, tier: str):
+        """PDFium has no layout analysis to tune; every tier extracts the same way."""
+
+    def __iter__(self):
+        return self.pages()
+
+    def pages(self, start: int = 0, end: int = None):
+        """Yields (page number, text) for the 0-based page range [start, end)."""
+        end = self.page_count if end is None else min(end, self.page_count)
+        for index in range(start, end):
+            page = self.document[index]
+            textpage = page.get_textpage()
+            try:
+                yield index + 1, textpage.get_text_range().replace("\r\n", "\n") + "\n\f"
+            finally:
+                textpage.close()
+                page.close()
+
+EXTRACTION_BACKENDS = {
+    "pdfminer": PdfPageStream,
+    "pypdfium2": PdfiumPageStream,
+}
+
+def available_backends():
+    """Names of the extraction backends usable in this environment."""
+    return [name for name in EXTRACTION_BACKENDS if name != "pypdfium2" or pypdfium2 is not None]
+
+def resolve_backend(backend: str) -> str:
+    """Returns the backend that will actually run, falling back to pdfminer if `backend` is unavailable."""
+    if backend not in available_backends():
+        logger.warning(f"Extraction backend '{backend}' is not available, falling back to 'pdfminer'.")
+        return "pdfminer"
+    return backend
+
+def open_pdf_stream(pdf_file: Path, backend: str = "pdfminer", **kwargs):
+    """Opens a page stream with the named extraction backend, falling back to pdfminer if it is unavailable."""
+    return EXTRACTION_BACKENDS[resolve_backend(backend)](pdf_file, **kwargs)
+
+def extraction_settings(backend: str, tier: str):
+    """The settings that determine a backend's output, used to key cached page text."""
+    if backend == "pdfminer":
+        return {"tier": tier, "laparams": EXTRACTION_TIERS[tier]}
+    return None  # PDFium extracts every tier the same way
+
+def get_page_count(pdf_path: Path) -> int:
+    """Reads the page count from the page tree without walking every page."""
+    with open(pdf_path, "rb") as fh:
+        return count_pdf_pages(PDFDocument(PDFParser(fh)))
+
+def categorize_page_count(page_count: int) -> str:
+    """Maps a page count to 'Short', 'Medium', or 'Long'."""
     if page_count <= 2:
-        return 'Short', page_count
+        return 'Short'
     elif 3 <= page_count <= 12:
-        return 'Medium', page_count
+        return 'Medium'
     else:
-        return 'Long', page_count
+        return 'Long'
+
+# PDF categorization based on page count
+def categorize_pdf(pdf_path: Path, page_count: int = None):
+    """Categorizes a PDF as 'Short', 'Medium', or 'Long' based on page count.
+
+    A page count already known from ingestion is reused instead of re-parsing the file.
+    """
+    if page_count is None:
+        try:
+            page_count = get_page_count(pdf_path)
+        except Exception as e:
+            logger.error(f"Error reading page count for {pdf_path}: {e}")
+            return 'Error', 0
+
+    return categorize_page_count(page_count), page_count
+
+# Single-pass extraction shared by every category
+def extract_pdf_text(pdf_path: Path, page_count: int = None, batch_size=10, backend: str = "pdfminer",
+                     tier: str = "full", category_tiers: dict = None, page_cache=None, content_hash: str = None):
+    """Opens a PDF once, categorizes it from its page tree and extracts the text of every page.
+
+    The extraction tier is `category_tiers[category]` when set, `tier` otherwise. When a
+    `page_cache` and the file's `content_hash` are given, pages extracted before with the same
+    backend and settings are read from the cache instead of the PDF.
+
+    Returns:
+        Tuple[str, int, str]: Category, page count and the page texts joined by newlines.
+    """
+    backend = resolve_backend(backend)
+    cache_key = None
+    if page_cache is not None and content_hash:
+        if page_count is None:
+            page_count = get_page_count(pdf_path)
+        category = categorize_page_count(page_count)
+        tier = (category_tiers or {}).get(category) or tier
+        cache_key = page_cache.make_key(content_hash, backend, extraction_settings(backend, tier))
+        cached = page_cache.get_pages(cache_key, 0, page_count)
+        if cached is not None:
+            logger.info(f"Read {page_count} pages of {pdf_path} from the page cache")
+            return category, page_count, "\n".join(cached)
 
-# Process large PDFs in batches
-def process_large_pdf(pdf_path: Path , page_count: int, batch_size=10):
-    """Processes large PDFs in batches."""
-    total_pages = page_count
     text_data = []
+    with open_pdf_stream(pdf_path, backend) as stream:
+        if page_count is None:
+            page_count = stream.page_count
+        category = categorize_page_count(page_count)
+        tier = (category_tiers or {}).get(category) or tier
+        stream.use_tier(tier)
 
-    for batch_start in range(0, total_pages, batch_size):
-        batch_end = min(batch_start + batch_size, total_pages)
-        page_numbers = list(range(batch_start, batch_end))
-        for _, page_text in iter_text_per_page(pdf_path, page_numbers=page_numbers):
+        start = time.perf_counter()
+        for idx, page_text in stream:
             text_data.append(page_text)
-    
-    return "\n".join(text_data)
+            if category == 'Long' and batch_size and idx % batch_size == 0:
+                logger.info(f"Extracted {idx}/{page_count} pages from {pdf_path}")
+        log_tier_timing(pdf_path, tier, len(text_data), time.perf_counter() - start)
+
+    if cache_key is not None:
+        page_cache.put_pages(cache_key, 0, text_data)
+    return category, page_count, "\n".join(text_data)
+
+def log_tier_timing(pdf_path: Path, tier: str, pages: int, elapsed: float):
+    """Logs how long a tier took, so the throughput of the tiers can be compared across runs."""
+    rate = pages / elapsed if elapsed > 0 else float("inf")
+    logger.info(f"Extracted {pages} pages from {pdf_path} with the '{tier}' tier in {elapsed:.2f}s ({rate:.1f} pages/s)")
+
+# Page-range extraction, used to spread one Long document over several workers
+def extract_page_range(pdf_path: Path, start: int, end: int, backend: str = "pdfminer", tier: str = "full",
+                       page_cache=None, content_hash: str = None):
+    """Extracts the text of the 0-based page range [start, end) of a PDF, through `page_cache` if given."""
+    backend = resolve_backend(backend)
+    cache_key = None
+    if page_cache is not None and content_hash:
+        cache_key = page_cache.make_key(content_hash, backend, extraction_settings(backend, tier))
+        cached = page_cache.get_pages(cache_key, start, end)
+        if cached is not None:
+            return cached
+
+    with open_pdf_stream(pdf_path, backend) as stream:
+        stream.use_tier(tier)
+        started = time.perf_counter()
+        pages = [page_text for _, page_text in stream.pages(start, end)]
+        log_tier_timing(pdf_path, tier, len(pages), time.perf_counter() - started)
+
+    if cache_key is not None:
+        page_cache.put_pages(cache_key, start, pages)
+    return pages
+
+def split_page_ranges(page_count: int, pages_per_task: int):
+    """Splits a document into consecutive (start, end) page ranges of at most `pages_per_task` pages."""
+    return [(start, min(start + pages_per_task, page_count)) for start in range(0, page_count, pages_per_task)]
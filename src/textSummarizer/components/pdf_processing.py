@@ -1,75 +1,256 @@
 from src.textSummarizer.logging import logger
-from src.textSummarizer.components.pdf_extraction import iter_text_per_page, categorize_pdf, process_large_pdf
-from src.textSummarizer.utils.retry import retry
+from src.textSummarizer.components.pdf_extraction import (
+    extract_pdf_text,
+    extract_page_range,
+    split_page_ranges,
+    categorize_page_count,
+    get_page_count
+)
+from src.textSummarizer.utils.retry import RetryPolicy, RetryBudget
+from src.textSummarizer.utils.manifest import Manifest
+from src.textSummarizer.utils.page_cache import PageCache
+from src.textSummarizer.utils.process_pool import SupervisedPool
+from src.textSummarizer.utils.common import compute_sha256, move_to_failed
 from src.textSummarizer.entity import PdfProcessingConfig
 from pathlib import Path
-from dask.diagnostics import ProgressBar
-from dask import delayed, compute
+from typing import List, Tuple
+import atexit
 
 class PdfProcessing:
     def __init__(self, config: PdfProcessingConfig):
         self.config = config
+        self.retry_policy = RetryPolicy(
+            max_retries=config.max_retries,
+            wait_time=config.wait_time,
+            max_wait_time=config.max_wait_time,
+            budget=RetryBudget(config.retry_budget)
+        )
+        # Page text already extracted with the same settings is reused across runs
+        self.page_cache = PageCache(config.page_cache_file, config.page_cache_max_mb) if config.page_cache_max_mb > 0 else None
 
-    def process_pdf(self, pdf_path: Path):
-        @retry(max_retries=self.config.max_retries, wait_time=self.config.wait_time)
-        def _process():
-            """Processes a single PDF, extracting its text."""
-            try:
-                category, page_count = categorize_pdf(pdf_path=pdf_path)
-                if category == 'Error':
-                    logger.error(f"Failed to process {pdf_path}: PDF could not be categorized.")
-                    return None  # Skip corrupted PDFs
-
-                # Extract text based on category
-                if category == 'Long':
-                    text = process_large_pdf(pdf_path=pdf_path, page_count=page_count, batch_size=self.config.batch_size)
-                else:
-                    text = "\n".join([page_text for _, page_text in iter_text_per_page(pdf_path)])
+    def extract_pdf(self, pdf_path: Path, page_count: int = None, content_hash: str = None):
+        """Extracts the text of a single PDF. Errors propagate so the retry policy can classify them."""
+        # Short, Medium and Long documents all go through one pass over the page tree
+        return extract_pdf_text(
+            pdf_path=pdf_path,
+            page_count=page_count,
+            batch_size=self.config.batch_size,
+            backend=self.config.extraction_backend,
+            tier=self.config.extraction_tier,
+            category_tiers=self.config.category_tiers,
+            page_cache=self.page_cache,
+            content_hash=content_hash
+        )
 
-                return category, page_count, text  # Return the extracted text
+    def extract_pdf_with_retry(self, pdf_path: Path, page_count: int = None, content_hash: str = None):
+        """Extracts a single PDF under the retry policy, raising once it gives up."""
+        return self.retry_policy.call(self.extract_pdf, pdf_path, page_count, content_hash)
 
-            except Exception as e:
-                logger.error(f"Error processing {pdf_path}: {e}")
-                return None  # Return None to handle failed PDF processing gracefully
-        return _process()
+    def tier_for(self, category: str) -> str:
+        """Extraction tier for a document category, falling back to the run-wide tier."""
+        return self.config.category_tiers.get(category) or self.config.extraction_tier
 
-    def process_multiple_pdfs(self):
-        """Process multiple PDFs concurrently using Dask with a progress bar and delayed tasks."""
-        
-        pdf_folder_path = self.config.pdf_folder_path
-        pdf_paths = list(Path(pdf_folder_path).glob("*.pdf"))
-        
-        # Create delayed tasks for each PDF processing
-        tasks = [delayed(self.process_pdf)(pdf_path) for pdf_path in pdf_paths]
-
-        # Progress bar using dask's diagnostics
-        with ProgressBar():
-            results = compute(*tasks, scheduler='processes')  # Using the 'threads' scheduler for concurrency
-
-        # Iterate through the results and handle errors
-        for result in results:
-            if "error" in result:
-                logger.error(f"Error processing PDF: {result['error']}")
-            else:
-                logger.info(f"PDF processed successfully. Path: {len(result[2])}")
-        import pandas as pd
-        pd.DataFrame(results,columns=['category','page_count','text']).to_csv('temptext.csv',index=False)
-        df = pd.read_csv('metadata.csv')
-        ordered_results_idx = [(idx, df.index[df['file_name']==path.name][0]) for idx, path in enumerate(pdf_paths)]
-        ordered_results = [0]*len(df)
-        for i in ordered_results_idx:
-            ordered_results[i[1]] = results[i[0]]
-        ordered_results_upload = []
-        ordered_results_return = []
-        for tuple in ordered_results:
-            ordered_results_upload.append(tuple[:2])
-            ordered_results_return.append(tuple[-1])
-        df = pd.concat([df,pd.DataFrame(ordered_results_upload,columns=['category','page_count'])],axis=1)
-        df.to_csv('text.csv', index=False)
-        return ordered_results_return
-    
-    
+    def extract_page_range_with_retry(self, pdf_path: Path, start: int, end: int, tier: str = None, content_hash: str = None):
+        """Extracts one page range under the retry policy, raising once it gives up."""
+        return self.retry_policy.call(
+            extract_page_range, pdf_path, start, end, self.config.extraction_backend, tier or self.config.extraction_tier,
+            self.page_cache, content_hash
+        )
+
+    def assemble_pages(self, page_ranges: List[List[str]], page_count: int):
+        """Joins the page ranges of a split document back together in page order."""
+        if any(page_range is None for page_range in page_ranges):
+            return None
+        text = "\n".join(page_text for page_range in page_ranges for page_text in page_range)
+        return categorize_page_count(page_count), page_count, text
+
+    def build_pool_tasks(self, index: int, pdf_path: Path, page_count: int = None, content_hash: str = None):
+        """Splits the extraction of one document into `(key, fn, args)` tasks for the supervised pool.
+
+        Documents with at least `page_parallel_threshold` pages are split into ranges of
+        `pages_per_task` pages that run on separate workers and are reassembled in order.
+        Keys are `(index, range number)`, with range number None for a document extracted whole.
+        Tasks only carry their arguments; the worker's `PdfProcessing` is built by `init_worker`.
+        """
+        if page_count is not None and page_count >= self.config.page_parallel_threshold:
+            tier = self.tier_for(categorize_page_count(page_count))
+            return [
+                ((index, number), run_page_range, (pdf_path, start, end, tier, content_hash))
+                for number, (start, end) in enumerate(split_page_ranges(page_count, self.config.pages_per_task))
+            ]
+        return [((index, None), run_document, (pdf_path, page_count, content_hash))]
+
+    @staticmethod
+    def task_cost(task) -> tuple:
+        """Estimated size of a pool task: its page count, then the size of its file."""
+        fn, args = task[1], task[2]
+        pdf_path = args[0]
+        pages = args[2] - args[1] if fn is run_page_range else args[1]
+        return pages or 0, pdf_path.stat().st_size if pdf_path.exists() else 0
+
+    def schedule(self, tasks: list) -> list:
+        """Orders tasks longest first, so the largest documents never start last and straggle."""
+        return sorted(tasks, key=self.task_cost, reverse=True)
+
+    def record_failure(self, manifest: Manifest, document: dict, pdf_path: Path, error: str) -> None:
+        """Marks a document as failed in the manifest and moves its PDF to the failed directory."""
+        logger.error(f"Error processing PDF {document['file_name']}: {error}")
+        manifest.set_stage_status(document["doc_id"], "pdf_processing", "failed", error)
+        if pdf_path.exists():
+            move_to_failed(filename=pdf_path, failed_dir=Path(self.config.failed_folder_path))
+
+    def load_documents(self, manifest: Manifest, pdf_paths: List[Path]) -> List[dict]:
+        """Looks up the manifest entry of every PDF, registering new files and filling in missing page counts.
+
+        A file whose content hash no longer matches its entry replaces it, with fresh stage
+        statuses. Each document is then claimed for the 'pdf_processing' stage, and
+        `document["claimed"]` tells whether this run holds it: documents already done, or in
+        flight in another run for less than `claim_timeout` seconds, are left as they are.
+        """
+        documents = []
+        for pdf_path in pdf_paths:
+            doc_id = compute_sha256(pdf_path)
+            document = manifest.get_by_file_name(pdf_path.name)
+            if document is None or document["doc_id"] != doc_id:
+                # PDFs placed in the folder by hand are registered on first sight, and edited ones again
+                manifest.upsert_document(doc_id=doc_id, file_name=pdf_path.name)
+                document = manifest.get_document(doc_id)
+            if document["page_count"] is None:
+                try:
+                    document["page_count"] = get_page_count(pdf_path)
+                except Exception as e:
+                    logger.error(f"Error reading page count for {pdf_path}: {e}")
+            document["claimed"] = manifest.claim_stage(document["doc_id"], "pdf_processing", self.config.claim_timeout)
+            documents.append(document)
+        return documents
+
+    def claim_documents(self, manifest: Manifest, pdf_paths: List[Path]) -> Tuple[List[Path], List[dict]]:
+        """Loads the documents of `pdf_paths` and keeps those this run claimed, as matching lists of paths and documents."""
+        documents = self.load_documents(manifest, pdf_paths)
+        claimed = [(pdf_path, document) for pdf_path, document in zip(pdf_paths, documents) if document["claimed"]]
+        if len(claimed) < len(documents):
+            logger.info(f"Skipping {len(documents) - len(claimed)} documents already extracted or in flight in another run")
+        return [pdf_path for pdf_path, _ in claimed], [document for _, document in claimed]
+
+    def process_multiple_pdfs(self, pdf_paths: List[Path] = None):
+        """Process multiple PDFs in a supervised process pool.
+
+        Every document (or page range of a split document) runs under `document_timeout` and
+        `worker_memory_limit_mb`; a worker that breaks either limit is killed and replaced.
+        Tasks run longest first on a warm pool that is kept alive across calls, so each batch
+        after the first skips process start-up and imports.
+        Documents are looked up in the manifest by file name, and only those this run claims
+        are queued, so documents already extracted, or in flight in another run, are skipped.
+        Their text, category and stage status are written back to the manifest by document
+        id. Failed documents are moved to the failed directory and left out of the result.
+
+        Args:
+            pdf_paths (List[Path], optional): Batch of PDFs to process. Defaults to every PDF in `pdf_folder_path`.
+        """
         
-    
+        if pdf_paths is None:
+            pdf_paths = sorted(Path(self.config.pdf_folder_path).glob("*.pdf"))
+
+        with Manifest(self.config.manifest_file) as manifest:
+            pdf_paths, documents = self.claim_documents(manifest, pdf_paths)
+
+            # One task per document, or per page range for documents long enough to split
+            tasks = self.schedule([
+                task
+                for index, (pdf_path, document) in enumerate(zip(pdf_paths, documents))
+                for task in self.build_pool_tasks(index, pdf_path, document["page_count"], document["doc_id"])
+            ])
+
+            cache_before = self.page_cache.stats() if self.page_cache is not None else {}
+
+            results = [{} for _ in documents]
+            errors = {}
+            pool = get_extraction_pool(self.config)
+            for done, ((index, number), result, error) in enumerate(pool.imap_unordered(tasks), start=1):
+                if error is not None:
+                    errors.setdefault(index, error)
+                results[index][number] = result
+                logger.info(f"Completed {done}/{len(tasks)} extraction tasks")
+
+            processed_documents = []
+            for index, (pdf_path, document) in enumerate(zip(pdf_paths, documents)):
+                doc_id = document["doc_id"]
+                if index in errors:
+                    self.record_failure(manifest, document, pdf_path, errors[index])
+                    continue
+                pieces = results[index]
+                if None in pieces:
+                    category, page_count, text = pieces[None]
+                else:
+                    category, page_count, text = self.assemble_pages(
+                        [pieces[number] for number in sorted(pieces)], document["page_count"]
+                    )
+                logger.info(f"PDF processed successfully. Path: {len(text)}")
+                manifest.update_document(doc_id, category=category, page_count=page_count, text=text)
+                manifest.set_stage_status(doc_id, "pdf_processing", "done")
+                processed_documents.append((doc_id, text))
+
+        if self.page_cache is not None:
+            # Counters are shared by every worker through the cache database; report this run's share
+            stats = self.page_cache.stats()
+            hits, misses, evictions = (stats.get(name, 0) - cache_before.get(name, 0) for name in ("hits", "misses", "evictions"))
+            logger.info(
+                f"Page cache: {hits} page hits, {misses} misses, {evictions} evictions, "
+                f"{stats['size_bytes'] / 1024 / 1024:.1f} MB on disk"
+            )
+        return processed_documents
+
+# State of the persistent extraction pool. Workers build their PdfProcessing once, in
+# `init_worker`, so the config is pickled once per worker instead of once per task.
+_worker_processing = None
+_extraction_pool = None
+_extraction_pool_config = None
+
+def init_worker(config: PdfProcessingConfig) -> None:
+    """Pool initializer: imports the extraction stack and builds the worker's PdfProcessing."""
+    global _worker_processing
+    _worker_processing = PdfProcessing(config)
+
+def run_document(pdf_path: Path, page_count: int = None, content_hash: str = None):
+    """Pool task: extracts a whole document with the worker's PdfProcessing."""
+    try:
+        return _worker_processing.extract_pdf_with_retry(pdf_path, page_count, content_hash)
+    finally:
+        flush_page_cache()
+
+def run_page_range(pdf_path: Path, start: int, end: int, tier: str = None, content_hash: str = None):
+    """Pool task: extracts one page range of a split document with the worker's PdfProcessing."""
+    try:
+        return _worker_processing.extract_page_range_with_retry(pdf_path, start, end, tier, content_hash)
+    finally:
+        flush_page_cache()
+
+def flush_page_cache() -> None:
+    """Writes out the page cache reads of the worker's task, so the run's report counts them."""
+    if _worker_processing.page_cache is not None:
+        _worker_processing.page_cache.flush()
 
+def get_extraction_pool(config: PdfProcessingConfig) -> SupervisedPool:
+    """Returns the warm extraction pool, starting it on first use or when the config changes."""
+    global _extraction_pool, _extraction_pool_config
+    if _extraction_pool is not None and _extraction_pool_config != config:
+        shutdown_extraction_pool()
+    if _extraction_pool is None:
+        _extraction_pool = SupervisedPool(
+            num_workers=config.num_workers,
+            timeout=config.document_timeout,
+            memory_limit_mb=config.worker_memory_limit_mb,
+            initializer=init_worker,
+            initargs=(config,)
+        ).start()
+        _extraction_pool_config = config
+    return _extraction_pool
 
+@atexit.register
+def shutdown_extraction_pool() -> None:
+    """Stops the warm extraction pool's workers."""
+    global _extraction_pool, _extraction_pool_config
+    if _extraction_pool is not None:
+        _extraction_pool.close()
+    _extraction_pool = None
+    _extraction_pool_config = None
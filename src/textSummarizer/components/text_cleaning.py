@@ -0,0 +1,159 @@
+import re
+import string
+from collections import OrderedDict
+from typing import Dict, List
+from bs4 import BeautifulSoup  # For removing HTML
+import contractions  # For expanding contractions
+from unidecode import unidecode  # For handling accented words
+from symspellpy import Verbosity
+from nltk import pos_tag_sents
+from nltk.tokenize import word_tokenize
+from src.textSummarizer.entity import TextPreProcessingConfig
+from src.textSummarizer.logging import logger
+
+# Joins the sentences of a batch so the character-level steps run once per batch. None of
+# those steps matches or rewrites it, so it splits the batch back into the same sentences.
+SEPARATOR = "\x00"
+
+URL_PATTERN = re.compile(r'https?://(www\.)?(\w+)(\.\w+)(/\w*)?')
+EMAIL_PATTERN = re.compile(r"[\w\.-]+@[\w\.-]+\.\w+")
+DIGITS_PATTERN = re.compile(r'\w*\d+\w*')
+SPACES_PATTERN = re.compile(' +')
+PUNCTUATION_TABLE = str.maketrans({char: " " for char in string.punctuation})
+HTML_SPACES = " \n\t\x0c\r"  # What BeautifulSoup collapses in whitespace-only strings
+
+
+class SpellingCorrector:
+    """SymSpell correction of whole batches of sentences, with the result of each lookup memoized.
+
+    Words already in the dictionary are kept as they are without a lookup (SymSpell would
+    return them unchanged), other words go through a bounded LRU memo of word -> correction,
+    and every sentence of a batch is POS-tagged in a single call. Output is the same as
+    tagging and looking up every sentence on its own.
+    """
+
+    def __init__(self, sym_spell, memo_size: int = 100000):
+        self.sym_spell = sym_spell
+        self.memo_size = memo_size
+        self.memo = OrderedDict()
+        self.stats = {"words": 0, "proper_nouns": 0, "in_dictionary": 0, "memo_hits": 0, "lookups": 0, "corrected": 0}
+
+    def correct(self, sentences: List[str]) -> List[str]:
+        """Corrects the spelling of a batch of sentences, skipping proper nouns."""
+        tagged_sentences = pos_tag_sents([word_tokenize(sentence) for sentence in sentences])
+        return [" ".join(self.correct_word(word, tag) for word, tag in tagged) for tagged in tagged_sentences]
+
+    def correct_word(self, word: str, tag: str) -> str:
+        stats = self.stats
+        stats["words"] += 1
+        if tag in ('NNP', 'NNPS'):  # Skip proper nouns
+            stats["proper_nouns"] += 1
+            return word
+        if word in self.sym_spell.words:
+            stats["in_dictionary"] += 1
+            return word
+
+        if word in self.memo:
+            stats["memo_hits"] += 1
+            self.memo.move_to_end(word)
+            corrected = self.memo[word]
+        else:
+            stats["lookups"] += 1
+            suggestions = self.sym_spell.lookup(word, Verbosity.CLOSEST, max_edit_distance=2, include_unknown=True)
+            corrected = suggestions[0].term if suggestions else word
+            self.memo[word] = corrected
+            if len(self.memo) > self.memo_size:
+                self.memo.popitem(last=False)
+        if corrected != word:
+            stats["corrected"] += 1
+        return corrected
+
+    def report(self) -> Dict[str, float]:
+        """Counts so far, with the share of words corrected and of memo lookups that hit."""
+        return spelling_report(self.stats)
+
+    def log_report(self) -> None:
+        log_spelling_report(self.stats)
+
+
+def spelling_report(stats: Dict[str, int]) -> Dict[str, float]:
+    """Adds the correction rate and memo hit rate to a set of `SpellingCorrector` counts."""
+    stats = dict(stats)
+    checked = stats["words"] - stats["proper_nouns"]
+    memoized = stats["memo_hits"] + stats["lookups"]
+    stats["correction_rate"] = stats["corrected"] / checked if checked else 0.0
+    stats["memo_hit_rate"] = stats["memo_hits"] / memoized if memoized else 0.0
+    return stats
+
+
+def log_spelling_report(stats: Dict[str, int]) -> None:
+    stats = spelling_report(stats)
+    logger.info(
+        f"Spelling: {stats['words']} words, {stats['correction_rate']:.1%} corrected, "
+        f"{stats['in_dictionary']} in the dictionary, memo hit rate {stats['memo_hit_rate']:.1%} "
+        f"({stats['lookups']} SymSpell lookups)"
+    )
+
+
+class TextCleaner:
+    """Cleaning steps of `TextPreProcessingConfig`, compiled once and applied to batches of sentences.
+
+    Output is identical to running the enabled steps one by one on every sentence, but:
+      - patterns are compiled once, and punctuation is replaced with one `str.translate`
+      - HTML parsing only runs on sentences containing '<' or '&'; URL, e-mail and
+        accent handling are skipped when the text cannot contain a match
+      - accent handling and non-ASCII removal are fused, as unidecode output is ASCII
+      - all steps but HTML removal and spelling run once over the joined batch
+    """
+
+    def __init__(self, config: TextPreProcessingConfig, sym_spell=None):
+        self.config = config
+        self.sym_spell = sym_spell
+        self.spelling = SpellingCorrector(sym_spell, config.spelling_memo_size) if sym_spell is not None else None
+
+    def clean(self, sentences: List[str]) -> List[str]:
+        """Cleans a batch of sentences, returning one cleaned sentence per input sentence."""
+        if not sentences:
+            return []
+        if self.config.remove_html:
+            sentences = [self.remove_html(sentence) for sentence in sentences]
+
+        if any(SEPARATOR in sentence for sentence in sentences):
+            cleaned = [self.clean_block(sentence) for sentence in sentences]
+        else:
+            cleaned = self.clean_block(SEPARATOR.join(sentences)).split(SEPARATOR)
+
+        if self.config.remove_extra_spaces:
+            cleaned = [sentence.strip() for sentence in cleaned]
+        if self.config.correct_spelling:
+            cleaned = self.spelling.correct(cleaned)
+        return cleaned
+
+    def clean_block(self, text: str) -> str:
+        """Runs the character-level steps, in their configured order, over one string."""
+        config = self.config
+        if config.remove_urls and "http" in text:
+            text = URL_PATTERN.sub("", text)
+        if config.remove_emails and "@" in text:
+            text = EMAIL_PATTERN.sub("", text)
+        if (config.handle_accents or config.remove_unicode_chars) and not text.isascii():
+            # unidecode only emits ASCII, so the ASCII filter has nothing left to drop after it
+            text = unidecode(text) if config.handle_accents else text.encode("ascii", "ignore").decode()
+        if config.expand_contractions:
+            text = contractions.fix(text)
+        if config.remove_punctuations:
+            text = text.translate(PUNCTUATION_TABLE)
+        if config.remove_digits:
+            text = DIGITS_PATTERN.sub("", text)
+        if config.remove_extra_spaces:
+            text = SPACES_PATTERN.sub(" ", text)
+        return text
+
+    @staticmethod
+    def remove_html(text: str) -> str:
+        if "<" not in text and "&" not in text:
+            # Nothing for the parser to strip or unescape; it only collapses whitespace-only text
+            if text and not text.strip(HTML_SPACES):
+                return "\n" if "\n" in text else " "
+            return text
+        return BeautifulSoup(text, 'html.parser').get_text()
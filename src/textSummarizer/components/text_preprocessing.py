@@ -1,129 +1,211 @@
-import string
-from bs4 import BeautifulSoup  # For removing HTML
-import contractions  # For expanding contractions
-from unidecode import unidecode  # For handling accented words
-import re
+import os
+import json
+import math
+import hashlib
 import pkg_resources
-from symspellpy import SymSpell, Verbosity  # For spelling correction
-from nltk import pos_tag
-from nltk.tokenize import word_tokenize, sent_tokenize
+from functools import lru_cache
+from importlib.metadata import version
+from pathlib import Path
+from symspellpy import SymSpell  # For spelling correction
+from nltk.tokenize import sent_tokenize
+from src.textSummarizer.components.text_cleaning import TextCleaner, log_spelling_report
 from src.textSummarizer.config.configuration import TextPreProcessingConfig
-from typing import List
+from typing import Dict, List, Tuple
 from dask import delayed, compute
 from dask.diagnostics import ProgressBar
 from src.textSummarizer.logging import logger
+from src.textSummarizer.utils.manifest import Manifest
+from src.textSummarizer.utils.preprocessing_cache import PreprocessingCache
+
+SYMSPELL_SETTINGS = {"max_dictionary_edit_distance": 2, "prefix_length": 7}
+
+def symspell_snapshot_path(snapshot_file: Path, dictionary_path: Path) -> Path:
+    """`snapshot_file` with a key of everything its snapshot depends on added to the name.
+
+    The key covers the frequency dictionary's content, `SYMSPELL_SETTINGS` and the symspellpy
+    version, so changing any of them builds a new snapshot instead of loading a stale one.
+    """
+    key = hashlib.sha256(Path(dictionary_path).read_bytes())
+    key.update(json.dumps({**SYMSPELL_SETTINGS, "symspellpy": version("symspellpy")}, sort_keys=True).encode())
+    snapshot_file = Path(snapshot_file)
+    return snapshot_file.with_name(f"{snapshot_file.stem}-{key.hexdigest()[:16]}{snapshot_file.suffix}")
+
+@lru_cache(maxsize=None)
+def load_sym_spell(snapshot_file: Path = None) -> SymSpell:
+    """Builds the SymSpell dictionary once per process.
+
+    The first process to build it from the 82k-word frequency list saves a pickled snapshot
+    next to `snapshot_file`, under the name given by `symspell_snapshot_path`, which later
+    processes load instead, in about half the time.
+    """
+    sym_spell = SymSpell(**SYMSPELL_SETTINGS)
+    dictionary_path = pkg_resources.resource_filename(
+        "symspellpy", "frequency_dictionary_en_82_765.txt"
+    )
+    if snapshot_file is not None:
+        snapshot_file = symspell_snapshot_path(snapshot_file, dictionary_path)
+        # load_pickle returns False for a snapshot written in another pickle data format
+        if snapshot_file.exists() and sym_spell.load_pickle(snapshot_file, compressed=False):
+            return sym_spell
+        sym_spell = SymSpell(**SYMSPELL_SETTINGS)
+
+    sym_spell.load_dictionary(dictionary_path, term_index=0, count_index=1)
+    if snapshot_file is not None:
+        snapshot_file.parent.mkdir(parents=True, exist_ok=True)
+        # Written under a temporary name so concurrent workers never load a partial snapshot
+        partial_file = snapshot_file.with_name(f"{snapshot_file.name}.{os.getpid()}.tmp")
+        sym_spell.save_pickle(partial_file, compressed=False)
+        os.replace(partial_file, snapshot_file)
+        logger.info(f"Saved the SymSpell dictionary snapshot to {snapshot_file}")
+    return sym_spell
+
+@lru_cache(maxsize=8)
+def get_text_preprocessing(config: TextPreProcessingConfig) -> "TextPreProcessing":
+    """The TextPreProcessing of this process for a config, so its dictionary and memo are built once per worker."""
+    return TextPreProcessing(config)
+
+def clean_sentence_block(config: TextPreProcessingConfig, sentences: List[str]) -> Tuple[List[str], Dict[str, int]]:
+    """Worker task: cleans one block of a document's sentences with the worker's TextPreProcessing.
+
+    Returns:
+        Tuple[List[str], Dict[str, int]]: The non-empty cleaned sentences and the spelling counts of the block.
+    """
+    text_preprocessing = get_text_preprocessing(config)
+    spelling = text_preprocessing.cleaner.spelling
+    before = dict(spelling.stats) if spelling is not None else {}
+    cleaned = [sentence for sentence in text_preprocessing.clean_sentences(sentences) if sentence.strip()]
+    counts = {name: spelling.stats[name] - before[name] for name in before}
+    return cleaned, counts
 
 # Define the TextProcessing class
 class TextPreProcessing:
     def __init__(self, config: TextPreProcessingConfig):
         self.config = config
-        self.sym_spell = SymSpell(max_dictionary_edit_distance=2, prefix_length=7)
-        dictionary_path = pkg_resources.resource_filename(
-            "symspellpy", "frequency_dictionary_en_82_765.txt"
+        self._cleaner = None
+        self.cache = (
+            PreprocessingCache(config.preprocessing_cache_file, config.preprocessing_cache_max_mb)
+            if config.preprocessing_cache_max_mb > 0 else None
         )
-        self.sym_spell.load_dictionary(dictionary_path, term_index=0, count_index=1)
+        self.config_hash = PreprocessingCache.config_hash(config)
 
-    def preprocess_text(self, text):
-
-        def remove_html(text):
-            soup = BeautifulSoup(text, 'html.parser')
-            return soup.get_text()
-
-        def remove_urls(text):
-            pattern = re.compile(r'https?://(www\.)?(\w+)(\.\w+)(/\w*)?')
-            return re.sub(pattern, "", text)
-
-        def remove_emails(text):
-            pattern = re.compile(r"[\w\.-]+@[\w\.-]+\.\w+")
-            return re.sub(pattern, "", text)
-
-        def handle_accents(text):
-            return unidecode(text)
-
-        def remove_unicode_chars(text):
-            return text.encode("ascii", "ignore").decode()
-
-        def expand_contractions(text):
-            """Expands contractions in the text (e.g., don't -> do not)."""
-            return contractions.fix(text)
-        
-        def remove_punctuations(text):
-            return re.sub('[%s]' % re.escape(string.punctuation), " ", text)
+    def __getstate__(self):
+        # The dictionary and the cleaner are rebuilt once in each process, never pickled
+        state = self.__dict__.copy()
+        state["_cleaner"] = None
+        return state
 
-        def remove_digits(text):
-            pattern = re.compile(r'\w*\d+\w*')
-            return re.sub(pattern, "", text)
+    @property
+    def sym_spell(self) -> SymSpell:
+        return load_sym_spell(self.config.symspell_snapshot_file)
 
-        def remove_extra_spaces(text):
-            return re.sub(' +', ' ', text).strip()
-
-        def correct_spelling_symspell(text):
-            words = word_tokenize(text)  # Tokenize the text into words
-            tagged_words = pos_tag(words)  # Perform POS tagging
-
-            corrected_words = []
-            for word, tag in tagged_words:
-                if tag in ('NNP', 'NNPS'):  # Skip proper nouns
-                    corrected_words.append(word)
-                else:
-                    corrected_word = self.sym_spell.lookup(word, Verbosity.CLOSEST, max_edit_distance=2, include_unknown=True)
-                    corrected_words.append(corrected_word[0].term if corrected_word else word)
-
-            return " ".join(corrected_words)
+    @property
+    def cleaner(self) -> TextCleaner:
+        # Compiled once from the config and reused for every document
+        if self._cleaner is None:
+            self._cleaner = TextCleaner(self.config, self.sym_spell if self.config.correct_spelling else None)
+        return self._cleaner
 
+    def preprocess_text(self, text):
+        """Splits a document into sentences and cleans each one, dropping sentences left empty."""
         # Step 1: Split the text into sentences for better structure
         sentences = sent_tokenize(text)
 
-        processed_lines = []
-
-        for sentence in sentences:
-            if self.config.remove_html:
-                sentence = remove_html(sentence)
-            if self.config.remove_urls:
-                sentence = remove_urls(sentence)
-            if self.config.remove_emails:
-                sentence = remove_emails(sentence)
-            if self.config.handle_accents:
-                sentence = handle_accents(sentence)
-            if self.config.remove_unicode_chars:
-                sentence = remove_unicode_chars(sentence)
-            if self.config.expand_contractions:
-                sentence = expand_contractions(sentence)
-            if self.config.remove_punctuations:
-                sentence = remove_punctuations(sentence)
-            if self.config.remove_digits:
-                sentence = remove_digits(sentence)
-            if self.config.remove_extra_spaces:
-                sentence = remove_extra_spaces(sentence)
-            if self.config.correct_spelling:
-                sentence = correct_spelling_symspell(sentence)
-
-            if sentence.strip():  # Skip empty lines
-                processed_lines.append(sentence)
-
-        # Step 2: Return cleaned sentences
+        # Step 2: Clean the whole document as one batch, skipping empty lines
+        processed_lines = [sentence for sentence in self.clean_sentences(sentences) if sentence.strip()]
+        if self.config.correct_spelling:
+            self.cleaner.spelling.log_report()
         return processed_lines
 
-    def process_text_file(self, processed_data: List):
-        """ Process a text file using the preprocessing pipeline. """
-        # Create delayed tasks for each preprocessing
-        tasks = [delayed(self.preprocess_text)(text=text) for text in processed_data]
+    def clean_sentences(self, sentences: List[str]) -> List[str]:
+        """Applies the cleaning steps enabled in the config to a batch of sentences."""
+        return self.cleaner.clean(sentences)
+
+    def clean_sentences_cached(self, sentences: List[str]) -> List[str]:
+        """Cleans a batch of sentences, dropping empty ones, through the preprocessing cache."""
+        if self.cache is None:
+            return [sentence for sentence in self.clean_sentences(sentences) if sentence.strip()]
+        key = self.cache.sentences_hash(sentences)
+        cleaned = self.cache.get(key, self.config_hash)
+        if cleaned is None:
+            cleaned = [sentence for sentence in self.clean_sentences(sentences) if sentence.strip()]
+            self.cache.put(key, self.config_hash, cleaned)
+        return cleaned
+
+    def clean_sentence(self, sentence):
+        """Applies the cleaning steps enabled in the config to a single sentence."""
+        return self.cleaner.clean([sentence])[0]
+
+    def worker_count(self) -> int:
+        """Processes the blocks are cleaned on: `num_workers`, or one per CPU when it is 0."""
+        return self.config.num_workers or os.cpu_count() or 1
+
+    def block_size(self, total_sentences: int, workers: int) -> int:
+        """Sentences per parallel block.
+
+        `sentence_block_size` when set, otherwise small enough to give each of `workers`
+        workers `blocks_per_worker` blocks, and never below `min_block_size`.
+        """
+        if self.config.sentence_block_size > 0:
+            return self.config.sentence_block_size
+        return max(self.config.min_block_size, math.ceil(total_sentences / (workers * self.config.blocks_per_worker)))
+
+    def process_text_file(self, processed_data: List[Tuple[str, str]]):
+        """ Process the extracted (doc_id, text) pairs and store the cleaned text in the manifest.
+
+        Documents whose text was already cleaned under the same settings are taken from the
+        preprocessing cache. The rest are split into sentences up front and cleaned in blocks
+        of sentences, so a single long document is spread over every worker; blocks are
+        merged back in order.
+        """
+        text_hashes = [PreprocessingCache.text_hash(text) for _, text in processed_data]
+        cleaned = {}
+        if self.cache is not None:
+            before = self.cache.stats()
+            for index, text_hash in enumerate(text_hashes):
+                sentences = self.cache.get(text_hash, self.config_hash)
+                if sentences is not None:
+                    cleaned[index] = sentences
+        pending = [index for index in range(len(processed_data)) if index not in cleaned]
+        logger.info(f"{len(cleaned)}/{len(processed_data)} documents found in the preprocessing cache")
+
+        documents = [sent_tokenize(processed_data[index][1]) for index in pending]
+        workers = self.worker_count()
+        block_size = self.block_size(sum(len(sentences) for sentences in documents), workers)
+        logger.info(f"Cleaning {len(documents)} documents in blocks of {block_size} sentences on {workers} workers")
+
+        # Create delayed tasks for each block of each document
+        tasks = [
+            [
+                delayed(clean_sentence_block)(self.config, sentences[start:start + block_size])
+                for start in range(0, len(sentences), block_size)
+            ]
+            for sentences in documents
+        ]
 
         # Progress bar using dask's diagnostics
         with ProgressBar():
-            results = compute(*tasks, scheduler='processes')
+            results = compute(*tasks, scheduler='processes', num_workers=workers)
+        # results holds, for each document, its (cleaned sentences, spelling counts) blocks in order
+        for index, blocks in zip(pending, results):
+            cleaned[index] = [sentence for sentences, _ in blocks for sentence in sentences]
+            if self.config.correct_spelling and blocks:
+                log_spelling_report({name: sum(counts[name] for _, counts in blocks) for name in blocks[0][1]})
+            if self.cache is not None:
+                self.cache.put(text_hashes[index], self.config_hash, cleaned[index])
+        if self.cache is not None:
+            stats = self.cache.stats()
+            logger.info(
+                f"Preprocessing cache: {stats.get('hits', 0) - before.get('hits', 0)} hits, "
+                f"{stats.get('misses', 0) - before.get('misses', 0)} misses, {stats['size_bytes']} bytes"
+            )
+
         processed_text = []
-        # results is a list of list
-        for result in results:
-            if "error" in result:
-                logger.error(f"Error processing text: {result['error']}")
-            else:
+        with Manifest(self.config.manifest_file) as manifest:
+            for index, (doc_id, _) in enumerate(processed_data):
+                result = cleaned[index]
                 logger.info(f"Text processed successfully. Text: {result[:10]}")
                 processed_text.append("\n".join(result))
+                manifest.update_document(doc_id, processed_text=processed_text[-1])
+                manifest.set_stage_status(doc_id, "text_preprocessing", "done")
         print("len len\n", len(processed_text))
-        import pandas as pd
-        df = pd.read_csv('text.csv')
-        df = pd.concat([df,pd.DataFrame(processed_text,columns=['processed_text'])],axis=1)
-        df.to_csv('text2.csv', index=False)
         return processed_text
-
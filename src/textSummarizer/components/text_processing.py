@@ -1,12 +1,23 @@
+import math
 import numpy as np
 import torch
 from typing import List, Tuple, Dict, Any
 import logging
 from src.textSummarizer.logging import logger
 from src.textSummarizer.config.configuration import TextProcessingConfig
+from src.textSummarizer.utils.embedding_store import EmbeddingStore
+
+def model_name(model) -> str:
+    """Name a model was loaded under, for keying its embeddings."""
+    name = getattr(model, "name_or_path", None)  # transformers models
+    if not name and hasattr(model, "tokenizer"):  # SentenceTransformer
+        name = model.tokenizer.name_or_path
+    return name or type(model).__name__
+
 class TextProcessor:
     def __init__(self, config:TextProcessingConfig):
         self.config = config
+        self.embedding_store = EmbeddingStore(config.embedding_store_dir) if config.use_embedding_store else None
 
     def count_tokens(self, text: str) -> int:
         """Count the number of tokens in a text."""
@@ -19,7 +30,7 @@ class TextProcessor:
 
     def find_dynamic_threshold(self, similarity_scores: List[float]) -> float:
         """Find dynamic threshold based on similarity score distribution."""
-        if not similarity_scores:
+        if len(similarity_scores) == 0:
             return 0.0
         percentile = self.config.dynamic_percentile
         return float(np.percentile(similarity_scores, percentile))
@@ -54,90 +65,183 @@ class TextProcessor:
         logger.info(f"Processing {len(phrases)} phrases")
 
         try:
-            batch_size = self.config.batch_size
-            max_tokens = self.config.max_tokens
-            # Process batches
-            print("phrases-",len(phrases),type(phrases))
-            #here batches are created. batch contains lines it is a list not str
-            batches = [phrases[i:i+batch_size] for i in range(0, len(phrases), batch_size)]
-            encoded_phrases = []
-            for batch in batches:
-                encoded_phrases.append(self.process_batch(batch, model))
-            
-            # Flatten the list of encoded phrases (assuming process_batch returns a 2D array)
-            encoded_phrases = np.vstack([emb for emb in encoded_phrases if len(emb) > 0])
-
-            if len(encoded_phrases) <= 1:
+            # One row-normalized matrix of phrase embeddings
+            embeddings = self.embed_phrases(phrases, model)
+            if len(embeddings) <= 1:
                 logger.warning("Insufficient embeddings generated")
                 return [], [], 0.0
 
-            # Calculate similarity scores
-            phrase_pairs = [(encoded_phrases[i-1], encoded_phrases[i]) 
-                            for i in range(1, len(encoded_phrases))]
-            similarity_scores = []
-            for pair in phrase_pairs:
-                similarity_scores.append(self.calculate_similarity_score(pair))
-
-            # Count tokens
-            token_counts = []
-            for phrase in phrases:
-                token_counts.append(self.count_tokens(phrase))
-
-            # Find threshold
+            # Cosine similarity of every pair of adjacent phrases at once
+            similarity_scores = self.adjacent_similarities(embeddings)
             threshold = self.find_dynamic_threshold(similarity_scores)
 
-            # Create chunks
-            chunks = []
-            current_chunk = []
-            current_chunk_length = 0
-
-            for i, phrase in enumerate(phrases):
-                phrase_tokens = token_counts[i]
-
-                if current_chunk_length + phrase_tokens > max_tokens:
-                    chunks.append(' '.join(current_chunk))
-                    current_chunk = [phrase]
-                    current_chunk_length = phrase_tokens
-                else:
-                    current_chunk.append(phrase)
-                    current_chunk_length += phrase_tokens
-
-                if (i > 0 and i - 1 < len(similarity_scores) and 
-                    similarity_scores[i - 1] < threshold):
-                    chunks.append(' '.join(current_chunk))
-                    current_chunk = [phrase]
-                    current_chunk_length = phrase_tokens
-
-            if current_chunk:
-                chunks.append(' '.join(current_chunk))
+            # Running token counts (as count_tokens counts them): phrases [a, b) hold
+            # cumulative[b] - cumulative[a] tokens
+            token_counts = np.fromiter(map(len, map(str.split, phrases)), dtype=np.int64, count=len(phrases))
+            cumulative = np.concatenate(([0], np.cumsum(token_counts)))
 
-            return chunks, similarity_scores, threshold
+            boundaries = self.chunk_boundaries(cumulative, similarity_scores, threshold)
+            chunks = [' '.join(phrases[start:end]) for start, end in boundaries]
+            return chunks, similarity_scores.tolist(), threshold
 
         except Exception as e:
             logger.error(f"Error in semantic chunking: {str(e)}")
             return [], [], 0.0
 
-    def get_embedding(self, text: str, model, tokenizer) -> np.ndarray:
-        """Get embeddings for a text using the specified model."""
-        try:
-            device = self.config.device
-            max_length = self.config.tokenizer_max_length
-            padding_strategy = self.config.padding
-            truncation = self.config.truncation
-
-            # Use the tokenizer with the configuration parameters
-            inputs = tokenizer(text, 
-                            return_tensors="pt", 
-                            padding=padding_strategy,  # Padding strategy from config
-                            truncation=truncation,      # Truncation flag from config
-                            max_length=max_length)
-            inputs = {key: value.to(device) for key, value in inputs.items()}
-
-            with torch.no_grad():
+    def embed_phrases(self, phrases: List[str], model) -> np.ndarray:
+        """Embeds the phrases batch by batch into one pre-allocated matrix, with unit-norm rows.
+
+        Phrases already in the embedding store are not encoded again. Batches that fail to
+        embed are left out, as they were when stacking the batches.
+        """
+        embeddings, found = self.stored_embeddings(phrases, model, {"encoder": "sentence_transformers"},
+                                                   self.encode_phrases)
+        embeddings = embeddings if found.all() else embeddings[found]
+        # Zero vectors give NaN similarities, as the pairwise cosine did
+        with np.errstate(divide='ignore', invalid='ignore'):
+            embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings
+
+    def encode_phrases(self, phrases: List[str], model) -> Tuple[np.ndarray, np.ndarray]:
+        """Runs the sentence model over the phrases in batches of `batch_size`.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The float32 embeddings, and a mask of the rows whose batch succeeded.
+        """
+        batch_size = self.config.batch_size
+        embeddings = np.empty((len(phrases), 0), dtype=np.float32)
+        encoded = np.zeros(len(phrases), dtype=bool)
+        for start in range(0, len(phrases), batch_size):
+            batch = self.process_batch(phrases[start:start + batch_size], model)
+            if len(batch) == 0:
+                continue
+            if embeddings.shape[1] == 0:
+                embeddings = np.empty((len(phrases), batch.shape[1]), dtype=np.float32)
+            embeddings[start:start + len(batch)] = batch
+            encoded[start:start + len(batch)] = True
+        return embeddings, encoded
+
+    def stored_embeddings(self, texts: List[str], model, settings: Dict[str, Any], encode) -> Tuple[np.ndarray, np.ndarray]:
+        """Embeddings of the texts, taken from the embedding store where it has them.
+
+        Only the texts missing from the store go through `encode(texts, model)`, and what it
+        returns is added to the store under the model's name and `settings`.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The float32 embeddings, and a mask of the rows that have one.
+        """
+        if self.embedding_store is None:
+            return encode(texts, model)
+        # Reduced precision changes the vectors, so it is part of the key
+        settings = {**settings, "precision": getattr(model, "inference_precision", "fp32")}
+        namespace = EmbeddingStore.make_namespace(model_name(model), settings)
+        text_hashes = [EmbeddingStore.text_hash(text) for text in texts]
+        embeddings, found = self.embedding_store.lookup(namespace, text_hashes)
+        missing = np.flatnonzero(~found)
+        logger.info(f"{len(texts) - len(missing)}/{len(texts)} embeddings found in the embedding store")
+        if len(missing) == 0:
+            return embeddings, found
+
+        encoded, encoded_found = encode([texts[index] for index in missing], model)
+        rows = missing[encoded_found]
+        if len(rows) == 0:
+            # The rows found in the store still stand; the others stay masked out
+            logger.error(f"None of the {len(missing)} embeddings missing from the store could be encoded")
+            return embeddings, found
+        if not found.any():
+            embeddings = np.zeros((len(texts), encoded.shape[1]), dtype=np.float32)
+        embeddings[rows] = encoded[encoded_found]
+        found[rows] = True
+        self.embedding_store.insert(namespace, [text_hashes[index] for index in rows], encoded[encoded_found], settings)
+        return embeddings, found
+
+    @staticmethod
+    def adjacent_similarities(embeddings: np.ndarray) -> np.ndarray:
+        """Cosine similarities of rows i-1 and i of a row-normalized matrix, for every i > 0."""
+        return np.einsum('ij,ij->i', embeddings[:-1], embeddings[1:]).astype(np.float64)
+
+    def chunk_boundaries(self, cumulative: np.ndarray, similarity_scores: np.ndarray,
+                         threshold: float) -> List[Tuple[int, int]]:
+        """The [start, end) phrase ranges of the chunks.
+
+        A chunk ends before the phrase that would take it over `max_tokens`, and at a phrase
+        whose similarity to the previous one falls under `threshold`, which then also opens
+        the next chunk. Rather than walking every phrase, each step jumps from a chunk's
+        start to the first of those two events, both looked up for every start at once with
+        binary searches over the cumulative token counts and the positions of the drops.
+        """
+        max_tokens = self.config.max_tokens
+        count = len(cumulative) - 1
+        starts = np.arange(count)
+        # For a chunk starting at phrase s: the phrase that takes it over max_tokens ...
+        next_overflow = np.maximum(np.searchsorted(cumulative, cumulative[:-1] + max_tokens, side='right') - 1, starts + 1)
+        # ... and the first phrase after s that follows a drop in similarity (count for none)
+        drops = np.flatnonzero(similarity_scores < threshold) + 1
+        drops = np.append(drops[drops < count], count)
+        next_drop = drops[np.searchsorted(drops, starts + 1)]
+        next_overflow, next_drop = next_overflow.tolist(), next_drop.tolist()
+
+        boundaries = []
+        if cumulative[1] > max_tokens:
+            boundaries.append((0, 0))  # A first phrase over the limit closes an empty chunk
+        start = 0
+        while True:
+            overflow, drop = next_overflow[start], next_drop[start]
+            if overflow >= count and drop >= count:
+                boundaries.append((start, count))
+                return boundaries
+            if overflow < drop:
+                boundaries.append((start, overflow))
+                start = overflow
+            elif drop < overflow:
+                boundaries.append((start, drop + 1))
+                start = drop
+            else:
+                boundaries.append((start, overflow))
+                boundaries.append((overflow, overflow + 1))
+                start = overflow
+
+    def embed_batch(self, texts: List[str], model, tokenizer, store: bool = True) -> np.ndarray:
+        """CLS embeddings of many texts, as a contiguous float32 matrix with one row per text.
+
+        Texts already in the embedding store are not encoded again. The others are tokenized
+        once, grouped by token length and run through the model `embedding_batch_size` at a
+        time, each batch padded only to its own longest text rather than to
+        `tokenizer_max_length`. Rows come back in the order of `texts`.
+        With `store=False` the store is bypassed, for one-off texts such as queries.
+        """
+        if len(texts) == 0:
+            return np.empty((0, model.config.hidden_size), dtype=np.float32)
+        if not store or self.embedding_store is None:
+            return self.encode_batch(list(texts), model, tokenizer)[0]
+        settings = {
+            "pooling": "cls",
+            "tokenizer": getattr(tokenizer, "name_or_path", type(tokenizer).__name__),
+            "max_length": self.config.tokenizer_max_length,
+            "truncation": self.config.truncation
+        }
+        embeddings, _ = self.stored_embeddings(
+            list(texts), model, settings, lambda missing, model: self.encode_batch(missing, model, tokenizer)
+        )
+        return embeddings
+
+    def encode_batch(self, texts: List[str], model, tokenizer) -> Tuple[np.ndarray, np.ndarray]:
+        """Runs `embed_batch`'s length-bucketed forward passes over the texts."""
+        embeddings = np.empty((len(texts), model.config.hidden_size), dtype=np.float32)
+        encoded = tokenizer(list(texts), truncation=self.config.truncation, max_length=self.config.tokenizer_max_length)
+        lengths = np.array([len(input_ids) for input_ids in encoded["input_ids"]])
+        # Longest first, so a batch that does not fit in memory fails before any work is done
+        order = np.argsort(-lengths, kind="stable")
+        device = next(model.parameters()).device
+        batch_size = self.config.embedding_batch_size
+
+        with torch.inference_mode():
+            for start in range(0, len(order), batch_size):
+                indices = order[start:start + batch_size]
+                features = {key: [encoded[key][index] for index in indices] for key in encoded.keys()}
+                inputs = tokenizer.pad(features, padding="longest", return_tensors="pt")
+                inputs = {key: value.to(device) for key, value in inputs.items()}
                 outputs = model(**inputs)
-            
-            cls_embedding = outputs.last_hidden_state[:, 0, :].squeeze(0).cpu().numpy()  # Use CLS token embedding
-            return cls_embedding
-        except Exception as e:
-            logger.error(f"Error in getting embeddings: {str(e)}")
-            return np.array([])
\ No newline at end of file
+                embeddings[indices] = outputs.last_hidden_state[:, 0, :].float().cpu().numpy()  # CLS token
+        logger.info(f"Embedded {len(texts)} texts in {math.ceil(len(texts) / batch_size)} batches")
+        return embeddings, np.ones(len(texts), dtype=bool)
@@ -0,0 +1,283 @@
+import queue
+import threading
+import multiprocessing
+from pathlib import Path
+from typing import Iterable, Iterator, List, Tuple
+from nltk.tokenize import sent_tokenize
+from src.textSummarizer.logging import logger
+from src.textSummarizer.components.pdf_extraction import (
+    open_pdf_stream,
+    resolve_backend,
+    extraction_settings,
+    categorize_page_count,
+    get_page_count
+)
+from src.textSummarizer.components.pdf_processing import PdfProcessing
+from src.textSummarizer.components.text_preprocessing import get_text_preprocessing
+from src.textSummarizer.utils.manifest import Manifest
+from src.textSummarizer.utils.page_cache import PageCache
+from src.textSummarizer.utils.process_pool import SupervisedPool, keep_alive
+from src.textSummarizer.entity import PdfProcessingConfig, TextPreProcessingConfig, TextStreamingConfig
+
+
+def iter_sentences(pages: Iterable[str]) -> Iterator[str]:
+    """Splits a stream of page texts into sentences, one page at a time.
+
+    The last sentence of a page is held back and joined to the next page, so sentences that
+    cross a page break come out whole, as if the pages had been joined by newlines.
+    """
+    carry = None
+    for page_text in pages:
+        text = page_text if carry is None else carry + "\n" + page_text
+        sentences = sent_tokenize(text)
+        if not sentences:
+            carry = text if text.strip() else None
+            continue
+        yield from sentences[:-1]
+        # Keep the whitespace after the last sentence, as joining the pages would
+        carry = text[text.rfind(sentences[-1]):]
+    if carry is not None:
+        yield from sent_tokenize(carry)
+
+
+def iter_batches(items: Iterable, batch_size: int) -> Iterator[list]:
+    """Groups a stream into lists of at most `batch_size` items."""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_document_pages(pdf_path: Path, page_count: int, content_hash: str, config: PdfProcessingConfig,
+                        page_cache: PageCache = None, flush_every: int = 25) -> Iterator[str]:
+    """Yields the page texts of a document, from the page cache if it holds them all.
+
+    Freshly extracted pages are written to the cache every `flush_every` pages, so a document
+    is never held in memory whole.
+    """
+    backend = resolve_backend(config.extraction_backend)
+    tier = config.category_tiers.get(categorize_page_count(page_count)) or config.extraction_tier
+    cache_key = None
+    if page_cache is not None and content_hash:
+        cache_key = page_cache.make_key(content_hash, backend, extraction_settings(backend, tier))
+        cached = page_cache.get_pages(cache_key, 0, page_count)
+        if cached is not None:
+            yield from cached
+            return
+
+    with open_pdf_stream(pdf_path, backend) as stream:
+        stream.use_tier(tier)
+        pending, start = [], 0
+        for idx, page_text in stream:
+            yield page_text
+            if cache_key is not None:
+                pending.append(page_text)
+                if len(pending) >= flush_every:
+                    page_cache.put_pages(cache_key, start, pending)
+                    pending, start = [], idx
+        if cache_key is not None and pending:
+            page_cache.put_pages(cache_key, start, pending)
+
+
+# State of an extraction worker, set up once by `init_extraction_worker`
+_worker_state = None
+
+
+def init_extraction_worker(config: PdfProcessingConfig, streaming_config: TextStreamingConfig,
+                           sentences: multiprocessing.Queue) -> None:
+    """Pool initializer: keeps the configs, the page cache and the queue of sentence batches."""
+    global _worker_state
+    page_cache = PageCache(config.page_cache_file, config.page_cache_max_mb) if config.page_cache_max_mb > 0 else None
+    _worker_state = (config, streaming_config, sentences, page_cache)
+
+
+def stream_document(index: int, pdf_path: Path, page_count: int, content_hash: str):
+    """Pool task: streams a document's pages into sentence batches on the sentences queue.
+
+    Returns:
+        Tuple[int, int]: Number of batches sent and the page count.
+    """
+    config, streaming_config, sentences, page_cache = _worker_state
+    batches = 0
+    try:
+        if page_count is None:
+            page_count = get_page_count(pdf_path)
+        pages = iter_document_pages(pdf_path, page_count, content_hash, config, page_cache, config.pages_per_task)
+        for batches, batch in enumerate(iter_batches(iter_sentences(pages), streaming_config.sentences_per_batch), start=1):
+            sentences.put((index, batches - 1, batch))
+            # Waiting on a full queue is not the document's fault; the timeout counts from here
+            keep_alive()
+    finally:
+        if page_cache is not None:
+            page_cache.flush()
+    return batches, page_count
+
+
+def _cleaning_worker(config: TextPreProcessingConfig, sentences: multiprocessing.Queue,
+                     results: multiprocessing.Queue) -> None:
+    """Cleans sentence batches, through the preprocessing cache, until it receives None."""
+    text_preprocessing = get_text_preprocessing(config)
+    while True:
+        job = sentences.get()
+        if job is None:
+            if config.correct_spelling:
+                text_preprocessing.cleaner.spelling.log_report()
+            if text_preprocessing.cache is not None:
+                text_preprocessing.cache.flush()
+            break
+        index, number, batch = job
+        cleaned = text_preprocessing.clean_sentences_cached(batch)
+        results.put(("batch", index, number, cleaned))
+
+
+class TextStreaming:
+    """Streams pages from the PDF extractor straight into sentence splitting and cleaning.
+
+    Extraction and cleaning run in their own worker processes, connected by bounded queues:
+
+        documents -> extraction workers -> sentence batches -> cleaning workers -> results
+
+    Only the documents in flight and the queued batches are ever in memory, so memory stays
+    flat however large the corpus is. Each document's cleaned text is written to the
+    manifest as soon as its last batch arrives.
+
+    Extraction runs in a `SupervisedPool` under the same `worker_memory_limit_mb` as stage 2,
+    and under `document_timeout`, counted between sentence batches since a worker may wait
+    on the queue. The CPUs are split between the extraction and cleaning workers.
+    """
+
+    def __init__(self, pdf_config: PdfProcessingConfig, preprocessing_config: TextPreProcessingConfig,
+                 config: TextStreamingConfig):
+        self.pdf_config = pdf_config
+        self.preprocessing_config = preprocessing_config
+        self.config = config
+        self.pdf_processing = PdfProcessing(pdf_config)
+
+    def stream_documents(self, pdf_paths: List[Path] = None) -> List[str]:
+        """Extracts and preprocesses every PDF, returning the ids of the documents processed.
+
+        Args:
+            pdf_paths (List[Path], optional): PDFs to process. Defaults to every PDF in `pdf_folder_path`.
+        """
+        if pdf_paths is None:
+            pdf_paths = sorted(Path(self.pdf_config.pdf_folder_path).glob("*.pdf"))
+
+        context = multiprocessing.get_context("spawn")
+        sentences_queue = context.Queue(maxsize=self.config.queue_size)
+        results_queue = context.Queue(maxsize=self.config.queue_size)
+        extraction_workers, cleaning_workers = self.worker_counts()
+        logger.info(f"Streaming with {extraction_workers} extraction and {cleaning_workers} cleaning workers")
+
+        processed = []
+        with Manifest(self.pdf_config.manifest_file) as manifest:
+            pdf_paths, documents = self.pdf_processing.claim_documents(manifest, pdf_paths)
+            # Longest documents first, so they do not straggle at the end of the run
+            order = sorted(range(len(documents)), key=lambda i: documents[i]["page_count"] or 0, reverse=True)
+
+            workers = [
+                context.Process(
+                    target=_cleaning_worker, args=(self.preprocessing_config, sentences_queue, results_queue), daemon=True
+                )
+                for _ in range(cleaning_workers)
+            ]
+            for worker in workers:
+                worker.start()
+
+            # The pool is driven from a thread: blocking on it here would stop the cleaned
+            # batches from being drained and stall every stage
+            tasks = [
+                (index, stream_document, (index, pdf_paths[index], documents[index]["page_count"], documents[index]["doc_id"]))
+                for index in order
+            ]
+
+            def extract():
+                try:
+                    with SupervisedPool(
+                        num_workers=extraction_workers,
+                        timeout=self.pdf_config.document_timeout,
+                        memory_limit_mb=self.pdf_config.worker_memory_limit_mb,
+                        initializer=init_extraction_worker,
+                        initargs=(self.pdf_config, self.config, sentences_queue)
+                    ) as pool:
+                        for index, result, error in pool.imap_unordered(tasks):
+                            results_queue.put(("error", index, error) if error is not None else ("end", index, *result))
+                except Exception as e:
+                    results_queue.put(("fatal", None, f"{type(e).__name__}: {e}"))
+
+            extractor = threading.Thread(target=extract, daemon=True)
+            extractor.start()
+
+            batches = {index: {} for index in order}
+            expected, finished = {}, set()
+            try:
+                while len(finished) < len(documents):
+                    try:
+                        message = results_queue.get(timeout=1)
+                    except queue.Empty:
+                        if any(worker.exitcode not in (None, 0) for worker in workers):
+                            raise RuntimeError("A text streaming worker died unexpectedly.")
+                        continue
+
+                    kind, index = message[0], message[1]
+                    if kind == "fatal":
+                        raise RuntimeError(f"The text streaming extraction pool failed: {message[2]}")
+                    if index in finished:
+                        continue  # Late batches of a document that already failed
+                    if kind == "error":
+                        self.pdf_processing.record_failure(manifest, documents[index], pdf_paths[index], message[2])
+                        finished.add(index)
+                        del batches[index]
+                        continue
+                    if kind == "batch":
+                        batches[index][message[2]] = message[3]
+                    else:
+                        expected[index] = message[2]
+                        documents[index]["page_count"] = message[3]
+
+                    if expected.get(index) == len(batches[index]):
+                        self.store_document(manifest, documents[index], batches.pop(index))
+                        finished.add(index)
+                        processed.append(documents[index]["doc_id"])
+
+                for _ in range(cleaning_workers):
+                    sentences_queue.put(None)
+                extractor.join()
+                for worker in workers:
+                    worker.join()
+            finally:
+                for worker in workers:
+                    if worker.is_alive():
+                        worker.kill()
+
+        logger.info(f"Streamed {len(processed)}/{len(documents)} documents through extraction and preprocessing.")
+        return processed
+
+    def worker_counts(self) -> Tuple[int, int]:
+        """Extraction and cleaning workers; a count left at 0 takes its share of the CPUs.
+
+        With both at 0 the CPUs are split evenly, so the two stages never start more
+        processes than there are cores.
+        """
+        cpus = multiprocessing.cpu_count()
+        extraction = self.config.extraction_workers
+        cleaning = self.config.cleaning_workers
+        if not extraction:
+            extraction = max(1, cpus - cleaning if cleaning else cpus // 2)
+        if not cleaning:
+            cleaning = max(1, cpus - extraction)
+        return extraction, cleaning
+
+    def store_document(self, manifest: Manifest, document: dict, batches: dict) -> None:
+        """Writes a finished document's cleaned sentences, in order, to the manifest."""
+        doc_id = document["doc_id"]
+        processed_text = "\n".join(sentence for number in sorted(batches) for sentence in batches[number])
+        page_count = document["page_count"]
+        manifest.update_document(doc_id, category=categorize_page_count(page_count), page_count=page_count,
+                                 processed_text=processed_text)
+        manifest.set_stage_status(doc_id, "pdf_processing", "done")
+        manifest.set_stage_status(doc_id, "text_preprocessing", "done")
+        logger.info(f"Text processed successfully. Document: {document['file_name']}")
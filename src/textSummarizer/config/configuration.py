@@ -4,6 +4,7 @@ from src.textSummarizer.entity import (
     DataIngestionConfig,
     PdfProcessingConfig,
     TextPreProcessingConfig,
+    TextStreamingConfig,
     KeywordExtractionConfig,
     RapidfuzzConfig,
     ModelConfig,
@@ -31,13 +32,25 @@ class ConfigurationManager:
     
     def get_data_ingestion_config(self) -> DataIngestionConfig:
         config = self.config.data_ingestion
+        params = self.params.data_ingestion
         create_directories([Path(config.root_dir), Path(config.local_data_file), Path(config.failed_data_file)])
         
         data_ingestion_config = DataIngestionConfig(
             root_dir=Path(config.root_dir),
             local_data_file=Path(config.local_data_file),
             failed_data_file=Path(config.failed_data_file),
-            urls=self.urls
+            download_cache_file=Path(config.download_cache_file),
+            dedup_report_file=Path(config.dedup_report_file),
+            manifest_file=Path(self.config.manifest.manifest_file),
+            urls=self.urls,
+            max_concurrency=params.max_concurrency,
+            per_host_limit=params.per_host_limit,
+            timeout=params.timeout,
+            chunk_size=params.chunk_size,
+            max_retries=params.max_retries,
+            wait_time=params.wait_time,
+            max_wait_time=params.max_wait_time,
+            retry_budget=params.retry_budget
         )
         
         return data_ingestion_config
@@ -48,9 +61,24 @@ class ConfigurationManager:
         params = self.params.data_processing
         data_processing_config = PdfProcessingConfig(
             pdf_folder_path = config.pdf_folder_path,
+            manifest_file = Path(self.config.manifest.manifest_file),
+            extraction_backend = config.extraction_backend,
             batch_size = params.batch_size,
             max_retries = params.max_retries,
-            wait_time = params.wait_time
+            wait_time = params.wait_time,
+            max_wait_time = params.max_wait_time,
+            retry_budget = params.retry_budget,
+            page_parallel_threshold = params.page_parallel_threshold,
+            pages_per_task = params.pages_per_task,
+            extraction_tier = params.extraction_tier,
+            category_tiers = dict(params.category_tiers or {}),
+            page_cache_file = Path(config.page_cache_file),
+            page_cache_max_mb = params.page_cache_max_mb,
+            failed_folder_path = Path(config.failed_folder_path),
+            num_workers = params.num_workers,
+            document_timeout = params.document_timeout,
+            worker_memory_limit_mb = params.worker_memory_limit_mb,
+            claim_timeout = params.claim_timeout
         )
         return data_processing_config
         
@@ -66,10 +94,29 @@ class ConfigurationManager:
             remove_digits=params.remove_digits,
             remove_extra_spaces=params.remove_extra_spaces,
             correct_spelling=params.correct_spelling,
-            expand_contractions=params.expand_contractions
+            expand_contractions=params.expand_contractions,
+            spelling_memo_size=params.spelling_memo_size,
+            sentence_block_size=params.sentence_block_size,
+            min_block_size=params.min_block_size,
+            blocks_per_worker=params.blocks_per_worker,
+            num_workers=params.num_workers,
+            symspell_snapshot_file=Path(self.config.text_preprocessing.symspell_snapshot_file),
+            preprocessing_cache_file=Path(self.config.text_preprocessing.preprocessing_cache_file),
+            preprocessing_cache_max_mb=params.preprocessing_cache_max_mb,
+            manifest_file=Path(self.config.manifest.manifest_file)
         )
         return text_processing_config
 
+    def get_text_streaming_config(self) -> TextStreamingConfig:
+        params = self.params.text_streaming
+        return TextStreamingConfig(
+            enabled=params.enabled,
+            queue_size=params.queue_size,
+            sentences_per_batch=params.sentences_per_batch,
+            extraction_workers=params.extraction_workers,
+            cleaning_workers=params.cleaning_workers
+        )
+
     def get_keyword_extraction_config(self) -> KeywordExtractionConfig:
         params = self.params.keyword_extraction
         return KeywordExtractionConfig(
@@ -79,13 +126,24 @@ class ConfigurationManager:
             max_ngram_size=params.max_ngram_size,
             deduplication_threshold=params.deduplication_threshold,
             deduplication_algo=params.deduplication_algo,
-            window_size=params.window_size
+            window_size=params.window_size,
+            candidate_count=params.candidate_count,
+            window_sentences=params.window_sentences,
+            top_k=params.top_k,
+            num_workers=params.num_workers,
+            keywords_file=self.get_keywords_file(),
+            manifest_file=Path(self.config.manifest.manifest_file)
         )
 
+    def get_keywords_file(self) -> Path:
+        """The keywords CSV that stage 4 writes and stages 5 and 6 read, under the artifacts root."""
+        return Path(self.config.artifacts_root) / self.config.keyword_extraction.keywords_file
+
     def get_rapidfuzz_config(self) -> RapidfuzzConfig:
         params = self.params.rapidfuzz
         return RapidfuzzConfig(
-            threshold=params.threshold
+            threshold=params.threshold,
+            scorer=params.scorer
         )
     
     def get_model_config(self) -> ModelConfig:
@@ -94,7 +152,9 @@ class ConfigurationManager:
             longformer_model_name=config.longformer_model_name,
             distilbart_model_name=config.distilbart_model_name,
             sentence_model_name=config.sentence_model_name,
-            rerank_model_name=config.rerank_model_name
+            rerank_model_name=config.rerank_model_name,
+            precision=config.precision,
+            model_precisions=dict(config.model_precisions or {})
         )
     def get_text_processing_config(self) -> TextProcessingConfig:
         params = self.params.text_processing
@@ -107,8 +167,11 @@ class ConfigurationManager:
             sentence_model=params.sentence_model,     
             tokenizer_max_length=params.tokenizer_max_length,   # Tokenizer max length as per config
             device=params.device,                               # Device for model processing
-            padding=params.padding,                             # Padding strategy from config
-            truncation=params.truncation                        # Truncation flag from config
+            truncation=params.truncation,                       # Truncation flag from config
+            embedding_batch_size=params.embedding_batch_size,   # Chunks per embedding forward pass
+            use_embedding_store=params.use_embedding_store,     # Reuse stored embeddings across runs
+            embedding_store_dir=Path(self.config.text_processing.embedding_store_dir),
+            keywords_file=self.get_keywords_file()
         )
     def get_query_generation_config(self) -> QueryGenerationConfig:
         params = self.params.query_generation  # Assuming params.query_generation exists
@@ -7,14 +7,40 @@ class DataIngestionConfig:
     root_dir: Path
     local_data_file: Path
     failed_data_file: Path
+    download_cache_file: Path
+    dedup_report_file: Path
+    manifest_file: Path
     urls: Dict[str,str]
+    max_concurrency: int
+    per_host_limit: int
+    timeout: int
+    chunk_size: int
+    max_retries: int
+    wait_time: int
+    max_wait_time: int
+    retry_budget: int
 
 @dataclass(frozen=True)
 class PdfProcessingConfig:
     pdf_folder_path: Path
+    manifest_file: Path
+    extraction_backend: str
     batch_size: int
     max_retries: int
     wait_time: int
+    max_wait_time: int
+    retry_budget: int
+    page_parallel_threshold: int
+    pages_per_task: int
+    extraction_tier: str
+    category_tiers: Dict[str,str]
+    page_cache_file: Path
+    page_cache_max_mb: int
+    failed_folder_path: Path
+    num_workers: int
+    document_timeout: int
+    worker_memory_limit_mb: int
+    claim_timeout: int
     
 
 @dataclass(frozen=True)
@@ -26,10 +52,17 @@ class KeywordExtractionConfig:
     deduplication_threshold: float
     deduplication_algo: str
     window_size: int
+    candidate_count: int
+    window_sentences: int
+    top_k: int
+    num_workers: int
+    keywords_file: Path
+    manifest_file: Path
 
 @dataclass(frozen=True)
 class RapidfuzzConfig:
     threshold: int
+    scorer: str
 
 @dataclass(frozen=True)
 class TextPreProcessingConfig:
@@ -43,13 +76,32 @@ class TextPreProcessingConfig:
     remove_extra_spaces: bool
     correct_spelling: bool
     expand_contractions: bool
+    spelling_memo_size: int
+    sentence_block_size: int
+    min_block_size: int
+    blocks_per_worker: int
+    num_workers: int
+    symspell_snapshot_file: Path
+    preprocessing_cache_file: Path
+    preprocessing_cache_max_mb: int
+    manifest_file: Path
     
+@dataclass(frozen=True)
+class TextStreamingConfig:
+    enabled: bool
+    queue_size: int
+    sentences_per_batch: int
+    extraction_workers: int
+    cleaning_workers: int
+
 @dataclass
 class ModelConfig:
     longformer_model_name: str
     distilbart_model_name: str
     sentence_model_name: str
     rerank_model_name: str
+    precision: str
+    model_precisions: Dict[str,str]
 
 @dataclass
 class TextProcessingConfig:
@@ -61,8 +113,11 @@ class TextProcessingConfig:
     sentence_model: str
     tokenizer_max_length: int
     device: str
-    padding: str
     truncation: bool
+    embedding_batch_size: int
+    use_embedding_store: bool
+    embedding_store_dir: Path
+    keywords_file: Path
 
 @dataclass
 class QueryGenerationConfig:
@@ -0,0 +1,32 @@
+from src.textSummarizer.config.configuration import ConfigurationManager
+from src.textSummarizer.components.text_streaming import TextStreaming
+from src.textSummarizer.logging import logger
+class TextStreamingPipeline:
+    def __init__(self) -> None:
+        """
+        Initializes the Text Streaming Pipeline.
+        Sets up the configuration manager to retrieve the PDF processing, text preprocessing and streaming configurations.
+        """
+        self.config_manager = ConfigurationManager()
+
+    def main(self):
+        """
+        Main method to run PDF processing and text preprocessing as one streaming stage.
+        Pages flow from the extractor into sentence cleaning, and the results are stored in the manifest.
+        """
+        try:
+            text_streaming = TextStreaming(
+                pdf_config=self.config_manager.get_data_processing_config(),
+                preprocessing_config=self.config_manager.get_text_preprocessing_config(),
+                config=self.config_manager.get_text_streaming_config()
+            )
+
+            logger.info("Starting the streaming of PDF text into preprocessing.")
+
+            processed = text_streaming.stream_documents()
+
+            logger.info("Text streaming completed successfully.")
+            return processed
+
+        except Exception as e:
+            logger.error(f"An error occurred in the Text Streaming pipeline: {str(e)}")
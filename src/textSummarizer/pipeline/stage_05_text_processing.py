@@ -30,7 +30,7 @@ class TextProcessingPipeline:
             logger.info("Starting the text summarization process.")
 
             # Load data
-            df = pd.read_csv('keywords.csv')
+            df = pd.read_csv(text_processing_config.keywords_file)
             processed_text = df['processed_text'].values.tolist()[0]
             
             print("\n\n\n")
@@ -48,13 +48,11 @@ class TextProcessingPipeline:
             print("\n\n\n")
             # Generate embeddings for chunks
             logger.info("Generating embeddings for document chunks.")
-            chunked_embeddings = np.array([
-                text_processor.get_embedding(
-                    chunk,
-                    models[text_processing_config.embedding_model_name],
-                    models[text_processing_config.embedding_tokenizer]
-                ) for chunk in chunks
-            ])
+            chunked_embeddings = text_processor.embed_batch(
+                chunks,
+                models[text_processing_config.embedding_model_name],
+                models[text_processing_config.embedding_tokenizer]
+            )
 
             return chunks, chunked_embeddings            
         except Exception as e:
@@ -20,18 +20,19 @@ class TextSummarizationPipeline:
             ) -> List[str]:
         
         try:
-            df = pd.read_csv('keywords.csv')
+            text_processing_config = self.config_manager.get_text_processing_config()
+            df = pd.read_csv(text_processing_config.keywords_file)
             keywords = df['keywords'].values.tolist()[0].split(", ")
             query_generation_config= self.config_manager.get_query_generation_config()
             query_generator = QueryGeneration(query_generation_config)
             query = query_generator.generate_domain_specific_query(chunks=chunks,keywords=keywords, models=models)
-            text_processing_config = self.config_manager.get_text_processing_config()
 
-            query_embedding = TextProcessor(text_processing_config).get_embedding(
-                query, 
+            query_embedding = TextProcessor(text_processing_config).embed_batch(
+                [query],
                 models[text_processing_config.embedding_model_name],
-                models[text_processing_config.embedding_tokenizer]
-            )
+                models[text_processing_config.embedding_tokenizer],
+                store=False  # A one-off query, not worth keeping
+            )[0]
             
             # Initialize components
             text_summarization_config= self.config_manager.get_text_summarization_config()
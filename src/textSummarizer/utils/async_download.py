@@ -0,0 +1,246 @@
+import os
+import asyncio
+import hashlib
+import aiohttp
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from src.textSummarizer.logging import logger
+from src.textSummarizer.utils.download_cache import DownloadCache
+from src.textSummarizer.utils.retry import RetryPolicy
+from src.textSummarizer.utils.common import (
+    build_file_metadata,
+    compute_sha256,
+    validate_pdf,
+    store_by_content_hash,
+    move_to_failed
+)
+
+# --- Async, connection-pooled downloading ---
+
+async def fetch_to_partial(session: aiohttp.ClientSession, url: str, local_dir: Path, partial_file: Path,
+                           chunk_size: int = 65536, cache: Optional[DownloadCache] = None) -> Optional[Tuple[Dict[str, str], str]]:
+    """Streams a URL into its partial file, revalidating or resuming it from the download cache.
+
+    Errors are raised so the caller's retry policy can decide whether to try again; a retry
+    after a dropped connection resumes from the bytes already on disk.
+
+    Args:
+        session (aiohttp.ClientSession): Shared session whose connector pools connections per host.
+        url (str): URL to download.
+        local_dir (Path): Path the downloaded files are stored in.
+        partial_file (Path): File the content is streamed into.
+        chunk_size (int, optional): Size of the chunks streamed to disk. Defaults to 65536.
+        cache (Optional[DownloadCache], optional): Cache of previous downloads. Defaults to None.
+
+    Returns:
+        Optional[Tuple[Dict[str, str], str]]: Response headers and SHA-256 of the complete file, or None
+        when the server reports the cached copy as unchanged.
+    """
+    request_headers = {}
+    if cache is not None:
+        request_headers = cache.conditional_headers(url, Path(local_dir)) or cache.range_headers(url, partial_file)
+
+    async with session.get(url, headers=request_headers) as response:
+        if response.status == 304:
+            return None
+        if response.status != 416:
+            return await stream_to_partial(response, url, partial_file, chunk_size, cache, "Range" in request_headers)
+
+    # The partial file no longer lines up with the remote one, start over without a Range
+    logger.info(f"Server rejected resuming '{url}', downloading it again from the start.")
+    partial_file.unlink(missing_ok=True)
+    if cache is not None:
+        cache.discard(url)
+    async with session.get(url) as response:
+        return await stream_to_partial(response, url, partial_file, chunk_size, cache, False)
+
+
+async def stream_to_partial(response: aiohttp.ClientResponse, url: str, partial_file: Path, chunk_size: int,
+                            cache: Optional[DownloadCache], ranged: bool) -> Tuple[Dict[str, str], str]:
+    """Writes a response body to the partial file, appending to it when a ranged request got a 206.
+
+    Returns:
+        Tuple[Dict[str, str], str]: Response headers and SHA-256 of the complete file.
+    """
+    response.raise_for_status()
+
+    resume = ranged and response.status == 206
+    if resume:
+        logger.info(f"Resuming download of '{url}' from byte {partial_file.stat().st_size}.")
+
+    if cache is not None:
+        cache.update(
+            url,
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified'),
+            complete=False
+        )
+
+    sha256 = hashlib.sha256()
+    with open(partial_file, 'ab' if resume else 'wb') as file:
+        async for data in response.content.iter_chunked(chunk_size):
+            file.write(data)
+            sha256.update(data)
+    if resume:
+        # The digest has to cover the bytes of earlier attempts as well
+        return dict(response.headers), await asyncio.to_thread(compute_sha256, partial_file, chunk_size)
+    return dict(response.headers), sha256.hexdigest()
+
+
+async def download_file_async(session: aiohttp.ClientSession, url: Tuple[str, str], local_dir: Path,
+                              failed_dir: Path, chunk_size: int = 65536,
+                              cache: Optional[DownloadCache] = None,
+                              retry_policy: Optional[RetryPolicy] = None) -> Dict[str, Any]:
+    """Downloads a single file over a shared, pooled session and streams it to disk.
+
+    With a download cache, unchanged files are revalidated with a conditional request and
+    skipped on 304, and interrupted downloads are resumed with a Range request. Transient
+    network failures are retried by the retry policy without blocking the event loop.
+
+    Args:
+        session (aiohttp.ClientSession): Shared session whose connector pools connections per host.
+        url (Tuple[str, str]): Tuple with filename and URL.
+        local_dir (Path): Path to store the downloaded files.
+        failed_dir (Path): Directory for storing failed files.
+        chunk_size (int, optional): Size of the chunks streamed to disk. Defaults to 65536.
+        cache (Optional[DownloadCache], optional): Cache of previous downloads. Defaults to None.
+        retry_policy (Optional[RetryPolicy], optional): Policy for retrying transient failures. Defaults to None.
+
+    Returns:
+        Dict[str, Any]: Dictionary containing metadata of the downloaded file, or error details if download fails.
+    """
+    filename = Path(local_dir) / (Path(url[0]).with_suffix(".pdf"))
+    partial_file = filename.with_suffix(".pdf.part")
+    try:
+        if retry_policy is not None:
+            fetched = await retry_policy.acall(fetch_to_partial, session, url[1], local_dir, partial_file, chunk_size, cache)
+        else:
+            fetched = await fetch_to_partial(session, url[1], local_dir, partial_file, chunk_size, cache)
+
+        if fetched is None:
+            logger.info(f"File '{filename}' has not changed since the last download, skipping.")
+            return cache.get(url[1])["metadata"]
+        headers, sha256 = fetched
+
+        os.replace(partial_file, filename)
+
+        # PDF parsing is CPU bound, keep it off the event loop
+        validation = await asyncio.to_thread(validate_pdf, filename, sha256)
+        if not validation["is_valid"]:
+            if cache is not None:
+                cache.discard(url[1])
+            await asyncio.to_thread(move_to_failed, filename, Path(failed_dir))
+            logger.error(f"File '{filename}' is corrupted and moved to '{failed_dir}'.")
+            return {"error": f"File '{filename}' is corrupted and moved to '{failed_dir}'."}
+
+        # Store the document under its content hash, so duplicates collapse to one file
+        stored_file = store_by_content_hash(filename, validation["sha256"])
+
+        metadata = build_file_metadata(headers, stored_file, validation)
+        metadata.update(source_name=url[0], url=url[1])
+        if cache is not None:
+            cache.update(url[1], file_name=stored_file.name, sha256=sha256, complete=True, metadata=metadata)
+        logger.info(f"Successfully downloaded and saved file '{filename}' with metadata: {metadata}")
+        return metadata
+
+    except asyncio.TimeoutError:
+        error_message = f"Timeout error for URL: {url[1]}"
+        logger.error(error_message)
+        return {"error": error_message}
+
+    except aiohttp.ClientError as e:
+        error_message = f"Failed to download {url[1]}: {str(e)}"
+        logger.error(error_message)
+        return {"error": error_message}
+
+    except Exception as e:
+        error_message = f"Unexpected error downloading {url[0]}: {str(e)}"
+        logger.error(error_message)
+        return {"error": error_message}
+
+
+async def download_files_async(urls: Dict[str, str], local_dir: Path, failed_dir: Path,
+                               max_concurrency: int = 16, per_host_limit: int = 4,
+                               timeout: int = 15, chunk_size: int = 65536,
+                               cache_file: Optional[Path] = None,
+                               retry_policy: Optional[RetryPolicy] = None) -> List[Dict[str, Any]]:
+    """Downloads multiple files concurrently over a single pooled client.
+
+    The connector caps the number of open connections globally and per host, and keeps
+    connections alive so files from the same host reuse the TLS session.
+
+    Args:
+        urls (Dict[str, str]): Dictionary of filenames and URLs.
+        local_dir (Path): Directory where the downloaded files should be saved.
+        failed_dir (Path): Directory for storing failed files.
+        max_concurrency (int, optional): Global limit on concurrent connections. Defaults to 16.
+        per_host_limit (int, optional): Limit on concurrent connections to a single host. Defaults to 4.
+        timeout (int, optional): Per-request timeout in seconds. Defaults to 15.
+        chunk_size (int, optional): Size of the chunks streamed to disk. Defaults to 65536.
+        cache_file (Optional[Path], optional): Persistent download cache used for conditional and
+            resumed requests. Defaults to None.
+        retry_policy (Optional[RetryPolicy], optional): Policy for retrying transient failures,
+            shared by every download so its budget applies to the whole run. Defaults to None.
+
+    Returns:
+        List[Dict[str, Any]]: List of file metadata or error details, in the order of `urls`.
+    """
+    cache = DownloadCache(cache_file) if cache_file is not None else None
+    connector = aiohttp.TCPConnector(limit=max_concurrency, limit_per_host=per_host_limit)
+    client_timeout = aiohttp.ClientTimeout(total=None, sock_connect=timeout, sock_read=timeout)
+    async with aiohttp.ClientSession(connector=connector, timeout=client_timeout) as session:
+        tasks = [
+            download_file_async(session, (name, url), local_dir, failed_dir, chunk_size, cache, retry_policy)
+            for name, url in urls.items()
+        ]
+        try:
+            return await asyncio.gather(*tasks)
+        finally:
+            # Persist whatever was learnt, so an interrupted run can still resume
+            if cache is not None:
+                cache.save()
+
+
+def download_files_concurrently(urls: Dict[str, str], local_dir: Path, failed_dir: Path,
+                                max_concurrency: int = 16, per_host_limit: int = 4,
+                                timeout: int = 15, chunk_size: int = 65536,
+                                cache_file: Optional[Path] = None,
+                               retry_policy: Optional[RetryPolicy] = None) -> List[Dict[str, Any]]:
+    """Synchronous entry point around `download_files_async`, returning only successful downloads.
+
+    Args:
+        urls (Dict[str, str]): Dictionary of filenames and URLs.
+        local_dir (Path): Directory where the downloaded files should be saved.
+        failed_dir (Path): Directory for storing failed files.
+        max_concurrency (int, optional): Global limit on concurrent connections. Defaults to 16.
+        per_host_limit (int, optional): Limit on concurrent connections to a single host. Defaults to 4.
+        timeout (int, optional): Per-request timeout in seconds. Defaults to 15.
+        chunk_size (int, optional): Size of the chunks streamed to disk. Defaults to 65536.
+        cache_file (Optional[Path], optional): Persistent download cache. Defaults to None.
+        retry_policy (Optional[RetryPolicy], optional): Policy for retrying transient failures. Defaults to None.
+
+    Returns:
+        List[Dict[str, Any]]: List of file metadata for the files that downloaded successfully.
+    """
+    results = asyncio.run(download_files_async(
+        urls=urls,
+        local_dir=local_dir,
+        failed_dir=failed_dir,
+        max_concurrency=max_concurrency,
+        per_host_limit=per_host_limit,
+        timeout=timeout,
+        chunk_size=chunk_size,
+        cache_file=cache_file,
+        retry_policy=retry_policy
+    ))
+
+    downloaded_files = []
+    for result in results:
+        if "error" in result:
+            logger.error(f"Error downloading file: {result['error']}")
+        else:
+            downloaded_files.append(result)
+    logger.info(f"Downloaded {len(downloaded_files)} of {len(results)} files.")
+    if retry_policy is not None:
+        logger.info(f"Download retry metrics: {retry_policy.metrics.report()}")
+    return downloaded_files
@@ -6,12 +6,16 @@ from src.textSummarizer.logging import logger
 from pydantic import validate_arguments
 from box import ConfigBox
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from tqdm import tqdm
 from datetime import datetime
 import shutil
+import hashlib
+import io
 from pdfminer.pdfparser import PDFParser
 from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdftypes import resolve1
 from dask import delayed, compute
 from dask.diagnostics import ProgressBar
 # --- YAML and Directory Management Functions ---
@@ -71,6 +75,87 @@ def get_size(path: Path) -> str:
     return f"~ {size_in_kb} KB"
 
 # --- File Downloading Functions ---
+def format_pdf_info(info: Dict[str, Any]) -> Dict[str, Any]:
+    """Picks the fields of interest out of a PDF info dictionary.
+
+    Args:
+        info (Dict[str, Any]): The document's info dictionary, as parsed by pdfminer.
+
+    Returns:
+        Dict[str, Any]: Dictionary containing title, author, creation date and modification date.
+    """
+    title = info.get('Title', 'Unknown')
+    author = info.get('Author', 'Unknown')
+    creation_date = info.get('CreationDate', 'Unknown')
+    modification_date = info.get('ModDate', 'Unknown')
+
+    # Convert dates to readable format
+    creation_date = creation_date[2:10] if isinstance(creation_date, str) else creation_date
+    modification_date = modification_date[2:10] if isinstance(modification_date, str) else modification_date
+
+    return {
+        "title": title,
+        "author": author,
+        "creation_date": creation_date,
+        "modification_date": modification_date,
+    }
+
+def count_pdf_pages(document: PDFDocument) -> int:
+    """Reads the page count from the root of the page tree, walking the pages only as a fallback.
+
+    Args:
+        document (PDFDocument): An already parsed PDF document.
+
+    Returns:
+        int: Number of pages in the document.
+    """
+    try:
+        count = resolve1(resolve1(document.catalog['Pages'])['Count'])
+        if isinstance(count, int) and count >= 0:
+            return count
+    except Exception:
+        pass
+    return sum(1 for _ in PDFPage.create_pages(document))
+
+@validate_arguments(config=dict(arbitrary_types_allowed=True))
+def validate_pdf(filename: Path, sha256: Optional[str] = None) -> Dict[str, Any]:
+    """Validates a downloaded PDF with a single parse of its trailer.
+
+    The corruption verdict, the info dictionary and the page count all come from the same
+    `PDFDocument`, so the file is opened and parsed exactly once.
+
+    Args:
+        filename (Path): The path to the downloaded file.
+        sha256 (Optional[str], optional): Digest computed while the file was streamed in. When not
+            given, it is computed from the same read the parser uses. Defaults to None.
+
+    Returns:
+        Dict[str, Any]: Dictionary with `is_valid`, `reason`, `sha256`, `page_count` and `info`.
+    """
+    result = {"is_valid": False, "reason": None, "sha256": sha256, "page_count": 0, "info": {}}
+    try:
+        with open(filename, 'rb') as file:
+            content = file.read()
+        if not content:
+            raise Exception("File size is zero, likely corrupted.")
+        if result["sha256"] is None:
+            result["sha256"] = hashlib.sha256(content).hexdigest()
+
+        parser = PDFParser(io.BytesIO(content))
+        document = PDFDocument(parser)
+        if not document.is_extractable:
+            raise Exception("PDF text extraction is not allowed or the document is unreadable.")
+
+        result["info"] = format_pdf_info(document.info[0] if document.info else {})
+        result["page_count"] = count_pdf_pages(document)
+        result["is_valid"] = True
+
+    except Exception as e:
+        logger.error(f"File '{filename}' is corrupted: {e}")
+        result["reason"] = str(e)
+
+    return result
+
 @validate_arguments(config=dict(arbitrary_types_allowed=True))
 def get_pdf_metadata(filename: Path) -> Dict[str, Any]:
     """Extracts metadata from a PDF file.
@@ -81,61 +166,63 @@ def get_pdf_metadata(filename: Path) -> Dict[str, Any]:
     Returns:
         Dict[str, Any]: Dictionary containing PDF metadata such as title, author, creation date, etc.
     """
-    metadata = {}
     try:
         with open(filename, 'rb') as file:
             parser = PDFParser(file)
             document = PDFDocument(parser)
-            metadata = document.info[0] if document.info else {}
-            # Extract specific metadata fields
-            title = metadata.get('Title', 'Unknown')
-            author = metadata.get('Author', 'Unknown')
-            creation_date = metadata.get('CreationDate', 'Unknown')
-            modification_date = metadata.get('ModDate', 'Unknown')
-
-            # Convert dates to readable format
-            creation_date = creation_date[2:10] if isinstance(creation_date, str) else creation_date
-            modification_date = modification_date[2:10] if isinstance(modification_date, str) else modification_date
-
-            return {
-                "title": title,
-                "author": author,
-                "creation_date": creation_date,
-                "modification_date": modification_date,
-            }
+            return format_pdf_info(document.info[0] if document.info else {})
     except Exception as e:
         logger.error(f"Error reading metadata from PDF '{filename}': {e}")
         return {}
 
 @validate_arguments(config=dict(arbitrary_types_allowed=True))
-def get_file_metadata(response: requests.Response, filename: Path) -> Dict[str, Any]:
-    """Extracts metadata from the HTTP response and the local file system, including PDF metadata.
+def build_file_metadata(headers: Dict[str, str], filename: Path, validation: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Builds file metadata from HTTP response headers and the local file system, including PDF metadata.
 
     Args:
-        response (requests.Response): The response object after downloading the file.
-        filename (str): The path to the downloaded file.
+        headers (Dict[str, str]): Headers of the HTTP response the file was downloaded with.
+        filename (Path): The path to the downloaded file.
+        validation (Optional[Dict[str, Any]], optional): Result of `validate_pdf` for the file. When not
+            given, the file is validated here. Defaults to None.
 
     Returns:
         Dict[str, Any]: Dictionary containing file metadata such as size, last modified date, and PDF-specific metadata.
     """
     file_size = os.path.getsize(filename)
-    last_modified = response.headers.get('Last-Modified', None)
+    # Header names are case-insensitive, but the dict copy is not
+    last_modified = next((value for key, value in headers.items() if key.lower() == 'last-modified'), None)
 
     if last_modified:
         last_modified = datetime.strptime(last_modified, '%a, %d %b %Y %H:%M:%S %Z')
 
-    pdf_metadata = get_pdf_metadata(filename)
+    if validation is None:
+        validation = validate_pdf(filename)
 
     metadata = {
         "file_name": filename.name,
         "file_size": f"{round(file_size / 1024, 2)} KB",
         "last_modified": last_modified,
         "download_date": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        "page_count": validation["page_count"],
+        "sha256": validation["sha256"],
     }
 
-    metadata.update(pdf_metadata)
+    metadata.update(validation["info"])
     return metadata
 
+@validate_arguments(config=dict(arbitrary_types_allowed=True))
+def get_file_metadata(response: requests.Response, filename: Path) -> Dict[str, Any]:
+    """Extracts metadata from the HTTP response and the local file system, including PDF metadata.
+
+    Args:
+        response (requests.Response): The response object after downloading the file.
+        filename (str): The path to the downloaded file.
+
+    Returns:
+        Dict[str, Any]: Dictionary containing file metadata such as size, last modified date, and PDF-specific metadata.
+    """
+    return build_file_metadata(dict(response.headers), filename)
+
 @validate_arguments(config=dict(arbitrary_types_allowed=True))
 def is_file_corrupted(filename: Path) -> bool:
     """Checks if the downloaded file is corrupted, with PDF-specific validation.
@@ -146,22 +233,7 @@ def is_file_corrupted(filename: Path) -> bool:
     Returns:
         bool: True if file is corrupted, False otherwise.
     """
-    try:
-        if os.path.getsize(filename) == 0:
-            raise Exception("File size is zero, likely corrupted.")
-
-        with open(filename, 'rb') as file:
-            parser = PDFParser(file)
-            document = PDFDocument(parser)
-
-            if not document.is_extractable:
-                raise Exception("PDF text extraction is not allowed or the document is unreadable.")
-
-        return False
-
-    except Exception as e:
-        logger.error(f"File '{filename}' is corrupted: {e}")
-        return True
+    return not validate_pdf(filename)["is_valid"]
 
 @validate_arguments(config=dict(arbitrary_types_allowed=True))
 def move_to_failed(filename: Path, failed_dir: Path) -> None:
@@ -178,6 +250,84 @@ def move_to_failed(filename: Path, failed_dir: Path) -> None:
     shutil.move(str(filename), destination)
     logger.info(f"Moved corrupted file '{filename}' to '{failed_dir}'.")
 
+@validate_arguments(config=dict(arbitrary_types_allowed=True))
+def compute_sha256(filename: Path, chunk_size: int = 65536) -> str:
+    """Computes the SHA-256 digest of a file, reading it in chunks.
+
+    Args:
+        filename (Path): The path to the file.
+        chunk_size (int, optional): Size of the chunks read from disk. Defaults to 65536.
+
+    Returns:
+        str: Hex digest of the file content.
+    """
+    sha256 = hashlib.sha256()
+    with open(filename, 'rb') as file:
+        for data in iter(lambda: file.read(chunk_size), b''):
+            sha256.update(data)
+    return sha256.hexdigest()
+
+@validate_arguments(config=dict(arbitrary_types_allowed=True))
+def store_by_content_hash(filename: Path, sha256: str) -> Path:
+    """Moves a validated file to its content-addressed name, dropping it if that content is already stored.
+
+    Args:
+        filename (Path): The path to the downloaded file.
+        sha256 (str): SHA-256 digest of the file content.
+
+    Returns:
+        Path: The content-addressed path the document is stored under.
+    """
+    destination = filename.parent / f"{sha256}.pdf"
+    if destination.exists():
+        filename.unlink()
+        logger.info(f"File '{filename}' duplicates '{destination.name}', keeping a single copy.")
+    else:
+        os.replace(filename, destination)
+    return destination
+
+@validate_arguments(config=dict(arbitrary_types_allowed=True))
+def deduplicate_downloads(results: List[Dict[str, Any]], local_dir: Path) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Collapses downloads that share the same content into one metadata row per document.
+
+    Args:
+        results (List[Dict[str, Any]]): Metadata of the successful downloads.
+        local_dir (Path): Directory the content-addressed files are stored in.
+
+    Returns:
+        Tuple[List[Dict[str, Any]], Dict[str, Any]]: One metadata row per unique document, with the names
+        and URLs it was found under as aliases, and a report of the work the deduplication saved.
+    """
+    documents: Dict[str, Dict[str, Any]] = {}
+    duplicate_bytes = 0
+    duplicate_pages = 0
+    for result in results:
+        file_name = result["file_name"]
+        if file_name not in documents:
+            documents[file_name] = dict(result, aliases=[result.get("source_name")], urls=[result.get("url")])
+            continue
+        documents[file_name]["aliases"].append(result.get("source_name"))
+        documents[file_name]["urls"].append(result.get("url"))
+        stored_file = local_dir / file_name
+        duplicate_bytes += os.path.getsize(stored_file) if stored_file.exists() else 0
+        duplicate_pages += int(result.get("page_count") or 0)
+
+    unique_documents = []
+    for document in documents.values():
+        document["aliases"] = ", ".join(str(alias) for alias in document["aliases"])
+        document["urls"] = ", ".join(str(url) for url in document["urls"])
+        unique_documents.append(document)
+
+    report = {
+        "downloaded_files": len(results),
+        "unique_documents": len(unique_documents),
+        "duplicate_files": len(results) - len(unique_documents),
+        "duplicate_bytes": duplicate_bytes,
+        "duplicate_pages": duplicate_pages,
+    }
+    logger.info(f"Deduplication report: {report}")
+    return unique_documents, report
+
 @validate_arguments(config=dict(arbitrary_types_allowed=True))
 def download_file(url: Tuple[str, str], local_dir: Path, failed_dir: Path) -> Dict[str, Any]:
     """Downloads a single file from a given URL, handles corrupted files, and extracts its metadata.
@@ -199,22 +349,29 @@ def download_file(url: Tuple[str, str], local_dir: Path, failed_dir: Path) -> Di
         # Define the file path
         filename = local_dir / (Path(url[0]).with_suffix(".pdf"))
         
-        # Write the content to a file in chunks
+        # Write the content to a file in chunks, hashing it as it streams in
+        sha256 = hashlib.sha256()
         with open(filename, 'wb') as file:
             total_size = int(response.headers.get('content-length', 0))
             with tqdm(total=total_size, unit='B', unit_scale=True, desc=str(filename), leave=False) as bar:
                 for data in response.iter_content(chunk_size=4096):
                     file.write(data)
+                    sha256.update(data)
                     bar.update(len(data))
 
         # Check if the file is corrupted
-        if is_file_corrupted(filename):
+        validation = validate_pdf(filename, sha256=sha256.hexdigest())
+        if not validation["is_valid"]:
             move_to_failed(filename, failed_dir)
             logger.error(f"File '{filename}' is corrupted and moved to '{failed_dir}'.")
             return {"error": f"File '{filename}' is corrupted and moved to '{failed_dir}'."}
 
+        # Store the document under its content hash, so duplicates collapse to one file
+        stored_file = store_by_content_hash(filename, validation["sha256"])
+
         # Get and return file metadata
-        metadata = get_file_metadata(response, str(filename))
+        metadata = build_file_metadata(dict(response.headers), stored_file, validation)
+        metadata.update(source_name=url[0], url=url[1])
         logger.info(f"Successfully downloaded and saved file '{filename}' with metadata: {metadata}")
         return metadata
 
@@ -0,0 +1,75 @@
+import os
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional
+from src.textSummarizer.logging import logger
+
+class DownloadCache:
+    """Persistent, URL-keyed record of previous downloads.
+
+    Each entry keeps the validators the server sent (ETag, Last-Modified), the SHA-256 of the
+    content, whether the download completed, and the metadata that was produced for it, so that
+    re-runs can issue conditional and ranged requests instead of re-fetching everything.
+    """
+
+    def __init__(self, cache_file: Path) -> None:
+        self.cache_file = Path(cache_file)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if self.cache_file.exists():
+            try:
+                with open(self.cache_file) as file:
+                    self.entries = json.load(file)
+                logger.info(f"Loaded download cache '{self.cache_file}' with {len(self.entries)} entries.")
+            except (OSError, ValueError) as e:
+                logger.error(f"Ignoring unreadable download cache '{self.cache_file}': {e}")
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Returns the cache entry for a URL, if any."""
+        return self.entries.get(url)
+
+    def update(self, url: str, **fields: Any) -> Dict[str, Any]:
+        """Creates or updates the cache entry for a URL."""
+        entry = self.entries.setdefault(url, {})
+        entry.update(fields)
+        return entry
+
+    def discard(self, url: str) -> None:
+        """Drops the cache entry for a URL, e.g. after the download turned out corrupted."""
+        self.entries.pop(url, None)
+
+    def conditional_headers(self, url: str, local_dir: Path) -> Dict[str, str]:
+        """Builds If-None-Match / If-Modified-Since headers for a completed download still on disk."""
+        entry = self.get(url)
+        if not entry or not entry.get("complete") or not entry.get("file_name"):
+            return {}
+        if not (Path(local_dir) / entry["file_name"]).exists():
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def range_headers(self, url: str, partial_file: Path) -> Dict[str, str]:
+        """Builds Range / If-Range headers to resume an interrupted download.
+
+        A download is only resumed when the server gave a validator for it, so that a changed
+        file is sent in full rather than stitched onto stale bytes.
+        """
+        entry = self.get(url)
+        if not entry or entry.get("complete") or not Path(partial_file).exists():
+            return {}
+        validator = entry.get("etag") or entry.get("last_modified")
+        offset = os.path.getsize(partial_file)
+        if not validator or offset == 0:
+            return {}
+        return {"Range": f"bytes={offset}-", "If-Range": validator}
+
+    def save(self) -> None:
+        """Writes the cache to disk atomically."""
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = self.cache_file.with_suffix(self.cache_file.suffix + ".tmp")
+        with open(temp_file, "w") as file:
+            json.dump(self.entries, file, indent=2, default=str)
+        os.replace(temp_file, self.cache_file)
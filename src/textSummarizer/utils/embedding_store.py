@@ -0,0 +1,231 @@
+import os
+import json
+import sqlite3
+import hashlib
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+import numpy as np
+from src.textSummarizer.logging import logger
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS namespaces (
+    namespace TEXT PRIMARY KEY,
+    settings TEXT NOT NULL,
+    dim INTEGER NOT NULL,
+    rows INTEGER NOT NULL,
+    generation INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    text_hash TEXT NOT NULL,
+    row INTEGER NOT NULL,
+    PRIMARY KEY (namespace, text_hash)
+);
+"""
+
+# Hashes per query, under SQLite's limit on bound parameters
+QUERY_SIZE = 500
+
+
+class EmbeddingStore:
+    """On-disk store of text embeddings, memory-mapped for reading.
+
+    Vectors are grouped in namespaces, one per model and tokenizer settings, and keyed
+    within one by the hash of the embedded text. Each namespace keeps its vectors as rows
+    of an append-only float32 file, and an SQLite index (in WAL mode) maps text hashes to
+    rows. Readers look rows up in a snapshot of the index and read them from a memory map
+    of the file, so any number of processes can read while one writes. Rows that are
+    deleted stay in the file until `compact` rewrites it.
+    """
+
+    def __init__(self, store_dir: Path) -> None:
+        self.store_dir = Path(store_dir)
+        self._connection = None
+
+    def __getstate__(self):
+        # Each process that gets the store opens the index itself
+        state = self.__dict__.copy()
+        state["_connection"] = None
+        return state
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.store_dir.mkdir(parents=True, exist_ok=True)
+            # Transactions are opened explicitly, so writers can take the lock up front
+            self._connection = sqlite3.connect(self.store_dir / "index.db", timeout=30, isolation_level=None)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.executescript(SCHEMA)
+        return self._connection
+
+    @contextmanager
+    def _transaction(self, write: bool = False):
+        self.connection.execute("BEGIN IMMEDIATE" if write else "BEGIN")
+        try:
+            yield self.connection
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+        self.connection.execute("COMMIT")
+
+    @staticmethod
+    def make_namespace(model_name: str, settings: Dict[str, Any]) -> str:
+        """Combines a model name with the settings that change its embeddings."""
+        return hashlib.sha256(json.dumps({"model": model_name, "settings": settings}, sort_keys=True).encode()).hexdigest()
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _vectors_file(self, namespace: str, generation: int) -> Path:
+        return self.store_dir / f"{namespace}.{generation}.f32"
+
+    def _rows(self, namespace: str, text_hashes: List[str]) -> Dict[str, int]:
+        rows = {}
+        for start in range(0, len(text_hashes), QUERY_SIZE):
+            batch = text_hashes[start:start + QUERY_SIZE]
+            rows.update(self.connection.execute(
+                f"SELECT text_hash, row FROM entries WHERE namespace=? AND text_hash IN ({', '.join('?' * len(batch))})",
+                (namespace, *batch)
+            ).fetchall())
+        return rows
+
+    def lookup(self, namespace: str, text_hashes: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Looks up many texts at once.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: A float32 matrix with a row per hash, and a boolean
+            mask of the rows that were found (the others are left as zeros).
+        """
+        for attempt in range(2):
+            with self._transaction():
+                namespace_row = self.connection.execute(
+                    "SELECT dim, rows, generation FROM namespaces WHERE namespace=?", (namespace,)
+                ).fetchone()
+                rows = self._rows(namespace, text_hashes) if namespace_row else {}
+            if not rows:
+                dim = namespace_row[0] if namespace_row else 0
+                return np.zeros((len(text_hashes), dim), dtype=np.float32), np.zeros(len(text_hashes), dtype=bool)
+
+            dim, count, generation = namespace_row
+            found = np.array([text_hash in rows for text_hash in text_hashes])
+            embeddings = np.zeros((len(text_hashes), dim), dtype=np.float32)
+            try:
+                vectors = np.memmap(self._vectors_file(namespace, generation), dtype=np.float32, mode="r", shape=(count, dim))
+            except FileNotFoundError:
+                if attempt:
+                    raise
+                continue  # Compacted after the index was read; read it again
+            embeddings[found] = vectors[[rows[text_hash] for text_hash in text_hashes if text_hash in rows]]
+            del vectors
+            return embeddings, found
+
+    def insert(self, namespace: str, text_hashes: List[str], embeddings: np.ndarray, settings: Dict[str, Any] = None) -> int:
+        """Appends the embeddings of texts not in the store yet, returning how many were added."""
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if len(text_hashes) == 0:
+            return 0
+        with self._transaction(write=True):
+            namespace_row = self.connection.execute(
+                "SELECT dim, rows, generation FROM namespaces WHERE namespace=?", (namespace,)
+            ).fetchone()
+            if namespace_row is None:
+                namespace_row = (embeddings.shape[1], 0, 0)
+                self.connection.execute(
+                    "INSERT INTO namespaces (namespace, settings, dim, rows, generation) VALUES (?, ?, ?, 0, 0)",
+                    (namespace, json.dumps(settings or {}, sort_keys=True), embeddings.shape[1])
+                )
+            dim, count, generation = namespace_row
+            if embeddings.shape[1] != dim:
+                raise ValueError(f"Embeddings of size {embeddings.shape[1]} do not fit a namespace of size {dim}.")
+
+            existing = self._rows(namespace, list(text_hashes))
+            new = {}
+            for index, text_hash in enumerate(text_hashes):
+                if text_hash not in existing and text_hash not in new:
+                    new[text_hash] = index
+            if not new:
+                return 0
+
+            vectors_file = self._vectors_file(namespace, generation)
+            with open(vectors_file, "ab") as handle:
+                # Drop what a writer that died before committing may have left past the last row
+                handle.truncate(count * dim * 4)
+                handle.write(embeddings[list(new.values())].tobytes())
+            self.connection.executemany(
+                "INSERT INTO entries (namespace, text_hash, row) VALUES (?, ?, ?)",
+                [(namespace, text_hash, count + offset) for offset, text_hash in enumerate(new)]
+            )
+            self.connection.execute("UPDATE namespaces SET rows=? WHERE namespace=?", (count + len(new), namespace))
+        return len(new)
+
+    def delete(self, namespace: str, text_hashes: List[str]) -> None:
+        """Removes texts from the index; their rows are reclaimed by `compact`."""
+        with self._transaction(write=True):
+            for start in range(0, len(text_hashes), QUERY_SIZE):
+                batch = text_hashes[start:start + QUERY_SIZE]
+                self.connection.execute(
+                    f"DELETE FROM entries WHERE namespace=? AND text_hash IN ({', '.join('?' * len(batch))})",
+                    (namespace, *batch)
+                )
+
+    def drop(self, namespace: str) -> None:
+        """Removes a whole namespace, e.g. of a model no longer used; its file goes at the next `compact`."""
+        with self._transaction(write=True):
+            self.connection.execute("DELETE FROM entries WHERE namespace=?", (namespace,))
+            self.connection.execute("DELETE FROM namespaces WHERE namespace=?", (namespace,))
+
+    def compact(self) -> int:
+        """Rewrites every namespace with deleted rows, and removes unused files.
+
+        Each namespace gets a new generation of its file, so readers that mapped the old
+        one keep reading it until they are done. Returns the number of bytes reclaimed.
+        """
+        before = self.size()
+        with self._transaction(write=True):
+            for namespace, dim, count, generation in self.connection.execute(
+                "SELECT namespace, dim, rows, generation FROM namespaces"
+            ).fetchall():
+                live = self.connection.execute(
+                    "SELECT text_hash, row FROM entries WHERE namespace=? ORDER BY row", (namespace,)
+                ).fetchall()
+                if len(live) == count:
+                    continue
+                vectors = np.memmap(self._vectors_file(namespace, generation), dtype=np.float32, mode="r", shape=(count, dim))
+                with open(self._vectors_file(namespace, generation + 1), "wb") as handle:
+                    for start in range(0, len(live), 65536):
+                        handle.write(vectors[[row for _, row in live[start:start + 65536]]].tobytes())
+                del vectors
+                self.connection.executemany(
+                    "UPDATE entries SET row=? WHERE namespace=? AND text_hash=?",
+                    [(row, namespace, text_hash) for row, (text_hash, _) in enumerate(live)]
+                )
+                self.connection.execute(
+                    "UPDATE namespaces SET rows=?, generation=? WHERE namespace=?", (len(live), generation + 1, namespace)
+                )
+            current = {
+                self._vectors_file(namespace, generation).name
+                for namespace, generation in self.connection.execute("SELECT namespace, generation FROM namespaces")
+            }
+        for vectors_file in self.store_dir.glob("*.f32"):
+            if vectors_file.name not in current:
+                try:
+                    os.remove(vectors_file)
+                except PermissionError:
+                    # Windows keeps a file while a reader still has it mapped; the next compact removes it
+                    logger.info(f"{vectors_file.name} is still in use, leaving it for the next compact.")
+        reclaimed = before - self.size()
+        logger.info(f"Compacted the embedding store, {reclaimed} bytes reclaimed.")
+        return reclaimed
+
+    def size(self) -> int:
+        """Total size of the vector files, in bytes."""
+        return sum(vectors_file.stat().st_size for vectors_file in self.store_dir.glob("*.f32"))
+
+    def stats(self) -> Dict[str, int]:
+        """Namespaces, live entries and the size of the vector files in bytes."""
+        namespaces, rows = self.connection.execute("SELECT COUNT(*), COALESCE(SUM(rows), 0) FROM namespaces").fetchone()
+        entries = self.connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return {"namespaces": namespaces, "entries": entries, "rows": rows, "size_bytes": self.size()}
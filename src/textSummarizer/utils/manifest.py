@@ -0,0 +1,166 @@
+import json
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from src.textSummarizer.logging import logger
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    doc_id TEXT PRIMARY KEY,
+    file_name TEXT NOT NULL UNIQUE,
+    page_count INTEGER,
+    category TEXT,
+    metadata TEXT,
+    text TEXT,
+    processed_text TEXT,
+    updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS stage_status (
+    doc_id TEXT NOT NULL REFERENCES documents(doc_id),
+    stage TEXT NOT NULL,
+    status TEXT NOT NULL,
+    error TEXT,
+    updated_at TEXT,
+    PRIMARY KEY (doc_id, stage)
+);
+CREATE INDEX IF NOT EXISTS idx_stage_status ON stage_status(stage, status);
+"""
+
+DOCUMENT_FIELDS = ("file_name", "page_count", "category", "metadata", "text", "processed_text")
+
+
+class Manifest:
+    """Indexed, transactional record of every ingested document and the status of each stage.
+
+    Documents are keyed by their content hash (`doc_id`). The database runs in WAL mode so
+    several runs can read it while one writes.
+    """
+
+    def __init__(self, manifest_file: Path) -> None:
+        self.manifest_file = Path(manifest_file)
+        self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.manifest_file, timeout=30)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> "Manifest":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def upsert_document(self, doc_id: str, file_name: str, **fields: Any) -> None:
+        """Creates a document or updates the given fields of an existing one.
+
+        A document keeps the file name it was first registered under: the same content seen
+        under another name is logged and left as it is. A file name held by another document
+        means that file's content changed, so the stale entry and its stage statuses are
+        dropped and the name passes to `doc_id`.
+        """
+        fields = {key: value for key, value in fields.items() if key in DOCUMENT_FIELDS}
+        if isinstance(fields.get("metadata"), dict):
+            fields["metadata"] = json.dumps(fields["metadata"], default=str)
+        fields.update(file_name=file_name, updated_at=datetime.now().isoformat())
+        columns = ", ".join(["doc_id", *fields])
+        placeholders = ", ".join("?" for _ in range(len(fields) + 1))
+        updates = ", ".join(f"{column}=excluded.{column}" for column in fields if column != "file_name")
+        with self.connection:
+            stale = self.connection.execute(
+                "SELECT doc_id FROM documents WHERE file_name=? AND doc_id<>?", (file_name, doc_id)
+            ).fetchone()
+            if stale is not None:
+                logger.info(f"'{file_name}' changed content ({stale['doc_id']} -> {doc_id}), replacing its manifest entry.")
+                self.connection.execute("DELETE FROM stage_status WHERE doc_id=?", (stale["doc_id"],))
+                self.connection.execute("DELETE FROM documents WHERE doc_id=?", (stale["doc_id"],))
+            existing = self.connection.execute("SELECT file_name FROM documents WHERE doc_id=?", (doc_id,)).fetchone()
+            if existing is not None and existing["file_name"] != file_name:
+                logger.info(f"'{file_name}' has the same content as '{existing['file_name']}', keeping the first name.")
+            self.connection.execute(
+                f"INSERT INTO documents ({columns}) VALUES ({placeholders}) "
+                f"ON CONFLICT(doc_id) DO UPDATE SET {updates}",
+                (doc_id, *fields.values())
+            )
+
+    def update_document(self, doc_id: str, **fields: Any) -> None:
+        """Updates the given fields of an existing document."""
+        fields = {key: value for key, value in fields.items() if key in DOCUMENT_FIELDS}
+        if isinstance(fields.get("metadata"), dict):
+            fields["metadata"] = json.dumps(fields["metadata"], default=str)
+        fields["updated_at"] = datetime.now().isoformat()
+        assignments = ", ".join(f"{column}=?" for column in fields)
+        with self.connection:
+            self.connection.execute(f"UPDATE documents SET {assignments} WHERE doc_id=?", (*fields.values(), doc_id))
+
+    def get_document(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        row = self.connection.execute("SELECT * FROM documents WHERE doc_id=?", (doc_id,)).fetchone()
+        return self._to_dict(row)
+
+    def get_by_file_name(self, file_name: str) -> Optional[Dict[str, Any]]:
+        row = self.connection.execute("SELECT * FROM documents WHERE file_name=?", (file_name,)).fetchone()
+        return self._to_dict(row)
+
+    def documents(self, stage: Optional[str] = None, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Lists documents, optionally only those with the given status for a stage."""
+        if stage is None:
+            rows = self.connection.execute("SELECT * FROM documents ORDER BY file_name").fetchall()
+        else:
+            rows = self.connection.execute(
+                "SELECT d.* FROM documents d JOIN stage_status s ON s.doc_id = d.doc_id "
+                "WHERE s.stage=? AND s.status=? ORDER BY d.file_name",
+                (stage, status)
+            ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def set_stage_status(self, doc_id: str, stage: str, status: str, error: Optional[str] = None) -> None:
+        """Records the status ('running', 'done' or 'failed') of a stage for a document."""
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO stage_status (doc_id, stage, status, error, updated_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(doc_id, stage) DO UPDATE SET status=excluded.status, error=excluded.error, "
+                "updated_at=excluded.updated_at",
+                (doc_id, stage, status, error, datetime.now().isoformat())
+            )
+
+    def claim_stage(self, doc_id: str, stage: str, stale_after: Optional[float] = None) -> bool:
+        """Marks a stage 'running' for a document, unless it is done or another run has it in flight.
+
+        The check and the write are one statement, so of several runs claiming the same
+        document only one succeeds. A 'running' status older than `stale_after` seconds was
+        left by a run that died and is claimed again. Returns whether the claim was made.
+        """
+        now = datetime.now()
+        cutoff = (now - timedelta(seconds=stale_after)).isoformat() if stale_after else ""
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO stage_status (doc_id, stage, status, error, updated_at) VALUES (?, ?, 'running', NULL, ?) "
+                "ON CONFLICT(doc_id, stage) DO UPDATE SET status=excluded.status, error=NULL, "
+                "updated_at=excluded.updated_at "
+                "WHERE stage_status.status NOT IN ('running', 'done') "
+                "OR (stage_status.status='running' AND stage_status.updated_at < ?)",
+                (doc_id, stage, now.isoformat(), cutoff)
+            )
+        return cursor.rowcount > 0
+
+    def stage_status(self, doc_id: str, stage: str) -> Optional[str]:
+        row = self.connection.execute(
+            "SELECT status FROM stage_status WHERE doc_id=? AND stage=?", (doc_id, stage)
+        ).fetchone()
+        return row["status"] if row else None
+
+    @staticmethod
+    def _to_dict(row: Optional[sqlite3.Row]) -> Optional[Dict[str, Any]]:
+        if row is None:
+            return None
+        document = dict(row)
+        if document.get("metadata"):
+            try:
+                document["metadata"] = json.loads(document["metadata"])
+            except ValueError:
+                logger.error(f"Unreadable metadata for document '{document['doc_id']}'.")
+        return document
@@ -0,0 +1,79 @@
+import json
+import time
+import zlib
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from src.textSummarizer.utils.sqlite_cache import SQLiteLRUCache
+
+# Bump to invalidate every cached page when the extraction output format changes
+CACHE_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    cache_key TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    text BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (cache_key, page)
+);
+CREATE TABLE IF NOT EXISTS entries (
+    cache_key TEXT PRIMARY KEY,
+    size INTEGER NOT NULL DEFAULT 0,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries(last_access);
+"""
+
+
+class PageCache(SQLiteLRUCache):
+    """On-disk, zlib-compressed cache of per-page text.
+
+    Entries are keyed by the PDF's content hash together with the extraction backend and its
+    settings, so a document is only re-extracted when its bytes or the extraction change.
+    When the cache grows past `max_size_mb`, the least recently used documents are evicted.
+    """
+
+    SCHEMA = SCHEMA
+    KEY_COLUMNS = ("cache_key",)
+    DEPENDENT_TABLES = ("pages",)
+    NAME = "page cache"
+
+    def __init__(self, cache_file: Path, max_size_mb: int = 2048) -> None:
+        super().__init__(cache_file, max_size_mb)
+
+    @staticmethod
+    def make_key(content_hash: str, backend: str, settings: Optional[Dict[str, Any]]) -> str:
+        """Combines the content hash with the extraction backend and its settings."""
+        extraction = json.dumps({"backend": backend, "settings": settings, "version": CACHE_VERSION}, sort_keys=True)
+        return hashlib.sha256(f"{content_hash}|{extraction}".encode()).hexdigest()
+
+    def get_pages(self, cache_key: str, start: int, end: int) -> Optional[List[str]]:
+        """Returns the texts of pages [start, end) if all of them are cached, None otherwise."""
+        rows = self.connection.execute(
+            "SELECT text FROM pages WHERE cache_key=? AND page>=? AND page<? ORDER BY page",
+            (cache_key, start, end)
+        ).fetchall()
+        hit = len(rows) == end - start
+        self.record_read((cache_key,), hit, end - start)
+        if not hit:
+            return None
+        return [zlib.decompress(row[0]).decode("utf-8") for row in rows]
+
+    def put_pages(self, cache_key: str, start: int, pages: List[str]) -> None:
+        """Stores the texts of consecutive pages starting at `start`, then evicts if over size."""
+        rows = []
+        for offset, text in enumerate(pages):
+            blob = zlib.compress(text.encode("utf-8"))
+            rows.append((cache_key, start + offset, blob, len(blob)))
+        with self.write():
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO pages (cache_key, page, text, size) VALUES (?, ?, ?, ?)", rows
+            )
+            self.connection.execute(
+                "INSERT INTO entries (cache_key, size, last_access) "
+                "VALUES (?, (SELECT SUM(size) FROM pages WHERE cache_key=?), ?) "
+                "ON CONFLICT(cache_key) DO UPDATE SET size=excluded.size, last_access=excluded.last_access",
+                (cache_key, cache_key, time.time())
+            )
+        self.evict()
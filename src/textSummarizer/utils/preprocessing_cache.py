@@ -0,0 +1,98 @@
+import json
+import time
+import zlib
+import hashlib
+import dataclasses
+from pathlib import Path
+from typing import List, Optional
+from src.textSummarizer.entity import TextPreProcessingConfig
+from src.textSummarizer.utils.sqlite_cache import SQLiteLRUCache
+
+# Bump to invalidate every cached entry when the cleaning code changes its output
+CACHE_VERSION = 1
+
+# TextPreProcessingConfig fields that do not change the cleaned sentences, so changing them
+# keeps the cache. Any other field, including one added later, is part of the key.
+IGNORED_FIELDS = {
+    "spelling_memo_size",
+    "sentence_block_size",
+    "min_block_size",
+    "blocks_per_worker",
+    "num_workers",
+    "symspell_snapshot_file",
+    "preprocessing_cache_file",
+    "preprocessing_cache_max_mb",
+    "manifest_file",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    text_hash TEXT NOT NULL,
+    config_hash TEXT NOT NULL,
+    sentences BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (text_hash, config_hash)
+);
+CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries(last_access);
+"""
+
+
+class PreprocessingCache(SQLiteLRUCache):
+    """On-disk, zlib-compressed cache of cleaned sentence lists.
+
+    Entries are keyed by the hash of the source text together with the hash of the
+    preprocessing settings that affect the output, so a text is only cleaned again when it
+    or one of those settings changes; entries made under other settings are left in place
+    and age out. When the cache grows past `max_size_mb`, the least recently used entries
+    are evicted.
+    """
+
+    SCHEMA = SCHEMA
+    KEY_COLUMNS = ("text_hash", "config_hash")
+    NAME = "preprocessing cache"
+
+    def __init__(self, cache_file: Path, max_size_mb: int = 1024) -> None:
+        super().__init__(cache_file, max_size_mb)
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        """Key of a whole document's text."""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def sentences_hash(sentences: List[str]) -> str:
+        """Key of an already split batch of sentences, kept apart from whole-text keys."""
+        return hashlib.sha256(b"\x00sentences\x00" + json.dumps(sentences).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def config_hash(config: TextPreProcessingConfig) -> str:
+        """Hashes the settings of `config` that change the cleaned output."""
+        settings = {
+            field.name: getattr(config, field.name)
+            for field in dataclasses.fields(config)
+            if field.name not in IGNORED_FIELDS
+        }
+        settings["version"] = CACHE_VERSION
+        return hashlib.sha256(json.dumps(settings, sort_keys=True, default=str).encode()).hexdigest()
+
+    def get(self, text_hash: str, config_hash: str) -> Optional[List[str]]:
+        """Returns the cleaned sentences stored for a text and config, None if there are none."""
+        row = self.connection.execute(
+            "SELECT sentences FROM entries WHERE text_hash=? AND config_hash=?", (text_hash, config_hash)
+        ).fetchone()
+        self.record_read((text_hash, config_hash), row is not None)
+        if row is None:
+            return None
+        return json.loads(zlib.decompress(row[0]).decode("utf-8"))
+
+    def put(self, text_hash: str, config_hash: str, sentences: List[str]) -> None:
+        """Stores the cleaned sentences of a text, then evicts if over size."""
+        blob = zlib.compress(json.dumps(sentences).encode("utf-8"))
+        with self.write():
+            self.connection.execute(
+                "INSERT OR REPLACE INTO entries (text_hash, config_hash, sentences, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (text_hash, config_hash, blob, len(blob), time.time())
+            )
+        self.evict()
@@ -0,0 +1,188 @@
+import time
+import multiprocessing
+from collections import deque
+from multiprocessing.connection import wait
+from typing import Any, Callable, Hashable, Iterable, Iterator, Optional, Tuple
+import psutil
+from src.textSummarizer.logging import logger
+
+
+# The task this worker process is running, as (connection, generation, key), for `keep_alive`
+_current_task = None
+
+
+def keep_alive() -> None:
+    """Restarts the timeout of the task running in this worker.
+
+    A task that can legitimately wait, e.g. on a full queue, calls it whenever it makes
+    progress; `timeout` then bounds the time between two calls instead of the whole task.
+    """
+    if _current_task is not None:
+        connection, generation, key = _current_task
+        connection.send(("started", generation, key))
+
+
+def _worker_loop(connection, initializer: Optional[Callable], initargs: tuple) -> None:
+    """Runs tasks sent by the supervisor until it sends None or closes the pipe."""
+    global _current_task
+    if initializer is not None:
+        initializer(*initargs)
+    while True:
+        try:
+            message = connection.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+        generation, key, fn, args = message
+        # The deadline starts here, after unpickling, so a fresh worker's imports are not counted
+        connection.send(("started", generation, key))
+        _current_task = (connection, generation, key)
+        try:
+            result = fn(*args)
+        except Exception as e:
+            connection.send(("done", generation, key, None, f"{type(e).__name__}: {e}"))
+        else:
+            connection.send(("done", generation, key, result, None))
+        finally:
+            _current_task = None
+
+
+class SupervisedPool:
+    """Process pool that enforces a wall-clock timeout and a memory cap on every task.
+
+    Each worker runs one task at a time. A worker whose task runs past `timeout` seconds or
+    whose resident memory grows past `memory_limit_mb` is killed and replaced by a fresh one,
+    and the task is reported as failed; the other tasks carry on.
+
+    `initializer(*initargs)` runs once in every worker, including replacements, so state that
+    is expensive to build or to pickle can be set up there instead of being sent with each task.
+
+    Usage:
+        with SupervisedPool(num_workers=4, timeout=300, memory_limit_mb=2048) as pool:
+            for key, result, error in pool.imap_unordered(tasks):
+                ...
+    """
+
+    def __init__(self, num_workers: int = None, timeout: float = None, memory_limit_mb: int = None,
+                 initializer: Callable = None, initargs: tuple = (), poll_interval: float = 0.5) -> None:
+        self.num_workers = num_workers or multiprocessing.cpu_count()
+        self.timeout = timeout or None
+        self.memory_limit = memory_limit_mb * 1024 * 1024 if memory_limit_mb else None
+        self.initializer = initializer
+        self.initargs = initargs
+        self.poll_interval = poll_interval
+        self._context = multiprocessing.get_context("spawn")
+        self._workers = []
+        self._generation = 0
+
+    def __enter__(self) -> "SupervisedPool":
+        return self.start()
+
+    def start(self) -> "SupervisedPool":
+        """Starts the workers. A started pool can run any number of `imap_unordered` batches."""
+        if not self._workers:
+            self._workers = [self._start_worker() for _ in range(self.num_workers)]
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _start_worker(self):
+        parent_connection, child_connection = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_loop, args=(child_connection, self.initializer, self.initargs), daemon=True
+        )
+        process.start()
+        child_connection.close()
+        return process, parent_connection
+
+    def _replace_worker(self, index: int) -> None:
+        process, connection = self._workers[index]
+        process.kill()
+        process.join()
+        connection.close()
+        self._workers[index] = self._start_worker()
+
+    def _memory_usage(self, process) -> int:
+        try:
+            return psutil.Process(process.pid).memory_info().rss
+        except psutil.NoSuchProcess:
+            return 0
+
+    def imap_unordered(self, tasks: Iterable[Tuple[Hashable, Callable, tuple]]) -> Iterator[Tuple[Hashable, Any, Optional[str]]]:
+        """Runs `fn(*args)` for every `(key, fn, args)` task, yielding `(key, result, error)` as tasks finish.
+
+        `error` is None on success, otherwise a description of the exception, timeout or
+        memory overrun, in which case `result` is None.
+        """
+        # Every batch tags its tasks, so a reply to an earlier batch is never taken for one of its own
+        self._generation += 1
+        generation = self._generation
+        pending = deque(tasks)
+        busy = {}  # worker index -> (task key, start time once the worker picked the task up)
+
+        try:
+            while pending or busy:
+                for index, (process, connection) in enumerate(self._workers):
+                    if pending and index not in busy:
+                        key, fn, args = pending.popleft()
+                        connection.send((generation, key, fn, args))
+                        busy[index] = (key, None)
+
+                connections = {self._workers[index][1]: index for index in busy}
+                for connection in wait(list(connections), timeout=self.poll_interval):
+                    index = connections[connection]
+                    key, _ = busy[index]
+                    try:
+                        message = connection.recv()
+                    except (EOFError, OSError):
+                        process = self._workers[index][0]
+                        process.join(timeout=5)
+                        exitcode = process.exitcode
+                        logger.error(f"Worker died with exit code {exitcode} while running '{key}', starting a new one.")
+                        self._replace_worker(index)
+                        message = ("done", generation, key, None, f"Worker process died with exit code {exitcode}")
+                    if message[1] != generation:
+                        continue  # Left over from a batch that was abandoned
+                    if message[0] == "started":
+                        busy[index] = (key, time.monotonic())
+                        continue
+                    del busy[index]
+                    _, _, key, result, error = message
+                    yield key, result, error
+
+                now = time.monotonic()
+                for index, (key, started) in list(busy.items()):
+                    process, _ = self._workers[index]
+                    if self.timeout and started is not None and now - started > self.timeout:
+                        error = f"Timed out after {self.timeout}s"
+                    elif self.memory_limit and self._memory_usage(process) > self.memory_limit:
+                        error = f"Exceeded the {self.memory_limit // (1024 * 1024)} MB memory limit"
+                    else:
+                        continue
+                    logger.error(f"{error} while running '{key}', replacing the worker.")
+                    del busy[index]
+                    self._replace_worker(index)
+                    yield key, None, error
+        finally:
+            # When the caller stops iterating early, tasks still running would hold their
+            # workers and leave replies in the pipes; replace those workers instead
+            if self._workers:
+                for index in busy:
+                    self._replace_worker(index)
+
+    def close(self) -> None:
+        """Asks idle workers to exit and kills the ones that do not."""
+        for process, connection in self._workers:
+            try:
+                connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for process, connection in self._workers:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.kill()
+                process.join()
+            connection.close()
+        self._workers = []
@@ -1,19 +1,196 @@
 import time
-import logging
+import errno
+import random
+import asyncio
+import functools
+import threading
+import aiohttp
+import requests
+from collections import defaultdict
+from typing import Any, Callable, Dict, Optional
+from src.textSummarizer.logging import logger
+
+# HTTP statuses worth another attempt: throttling and server-side hiccups
+RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+# OSError codes worth another attempt: interrupted or would-block calls, busy resources and
+# dropped connections. Any other code (missing file, full disk, bad descriptor...) is permanent.
+TRANSIENT_ERRNOS = {
+    getattr(errno, name) for name in (
+        "EAGAIN", "EWOULDBLOCK", "EINTR", "EBUSY", "ETIMEDOUT", "ECONNRESET", "ECONNABORTED",
+        "ECONNREFUSED", "EPIPE", "ENETDOWN", "ENETUNREACH", "ENETRESET", "EHOSTUNREACH", "ENOBUFS"
+    ) if hasattr(errno, name)
+}
+
+
+class TransientError(Exception):
+    """Raised by callers to mark a failure as worth retrying."""
+
+
+def is_transient(error: BaseException) -> bool:
+    """Classifies an error as transient (retry) or permanent (fail fast).
+
+    Network failures, timeouts, throttling/5xx responses and OSErrors with a code in
+    `TRANSIENT_ERRNOS` are transient. Everything else, such as a malformed PDF, a 404, a
+    missing file or a MemoryError, is deterministic and is not retried.
+    """
+    if isinstance(error, TransientError):
+        return True
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status in RETRYABLE_STATUS
+    if isinstance(error, requests.exceptions.HTTPError):
+        return error.response is not None and error.response.status_code in RETRYABLE_STATUS
+    if isinstance(error, (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError,
+                          TimeoutError, ConnectionError, requests.exceptions.ConnectionError,
+                          requests.exceptions.Timeout)):
+        return True
+    return isinstance(error, OSError) and error.errno in TRANSIENT_ERRNOS
+
+
+class RetryBudget:
+    """Caps the total number of retries spent in a run, across every call sharing it.
+
+    Once the budget is spent, failures are returned straight away instead of sleeping, so a
+    failing host cannot keep workers busy for the rest of the run.
+    """
+
+    def __init__(self, max_retries: int) -> None:
+        self.max_retries = max_retries
+        self.spent = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        """Takes one retry from the budget, returning False when none are left."""
+        with self._lock:
+            if self.spent >= self.max_retries:
+                return False
+            self.spent += 1
+            return True
+
+    def __getstate__(self):
+        # Locks cannot be pickled; each process gets its own
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+class RetryMetrics:
+    """Counts failures, retries and give-ups per error class."""
+
+    def __init__(self) -> None:
+        self.counts: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._lock = threading.Lock()
+
+    def record(self, error: BaseException, outcome: str) -> None:
+        with self._lock:
+            self.counts[type(error).__name__][outcome] += 1
+
+    def report(self) -> Dict[str, Dict[str, int]]:
+        """Returns a plain-dict snapshot of the counters."""
+        with self._lock:
+            return {name: dict(outcomes) for name, outcomes in self.counts.items()}
+
+    def __getstate__(self):
+        return {"counts": self.report()}
+
+    def __setstate__(self, state):
+        self.__init__()
+        for name, outcomes in state["counts"].items():
+            self.counts[name].update(outcomes)
+
+
+class RetryPolicy:
+    """Retries transient failures with capped exponential backoff and full jitter."""
+
+    def __init__(self,
+                 max_retries: int = 3,
+                 wait_time: float = 2,
+                 max_wait_time: float = 30,
+                 budget: Optional[RetryBudget] = None,
+                 metrics: Optional[RetryMetrics] = None,
+                 classify: Callable[[BaseException], bool] = is_transient) -> None:
+        self.max_retries = max_retries
+        self.wait_time = wait_time
+        self.max_wait_time = max_wait_time
+        self.budget = budget
+        self.metrics = metrics if metrics is not None else RetryMetrics()
+        self.classify = classify
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before the given retry (0-based): uniform in [0, min(max_wait, wait * 2**attempt)]."""
+        return random.uniform(0, min(self.max_wait_time, self.wait_time * (2 ** attempt)))
+
+    def _next_delay(self, error: BaseException, attempt: int, name: str) -> Optional[float]:
+        """Decides whether to retry after a failure, returning the delay or None to give up."""
+        if not self.classify(error):
+            self.metrics.record(error, "permanent")
+            logger.error(f"{name} failed with a permanent error, not retrying: {error}")
+            return None
+        if attempt >= self.max_retries - 1:
+            self.metrics.record(error, "exhausted")
+            logger.error(f"Max retries exceeded for {name}: {error}")
+            return None
+        if self.budget is not None and not self.budget.try_acquire():
+            self.metrics.record(error, "budget_exhausted")
+            logger.error(f"Retry budget exhausted, giving up on {name}: {error}")
+            return None
+        self.metrics.record(error, "retried")
+        delay = self.backoff(attempt)
+        logger.warning(f"Attempt {attempt + 1} of {name} failed with {type(error).__name__}: {error}. "
+                       f"Retrying in {delay:.2f}s.")
+        return delay
+
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        """Calls `func`, retrying transient failures. The last error is re-raised when giving up."""
+        for attempt in range(max(self.max_retries, 1)):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                delay = self._next_delay(e, attempt, getattr(func, "__name__", repr(func)))
+                if delay is None:
+                    raise
+                time.sleep(delay)
+
+    async def acall(self, func: Callable, *args, **kwargs) -> Any:
+        """Awaits `func`, retrying transient failures without blocking the event loop."""
+        for attempt in range(max(self.max_retries, 1)):
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                delay = self._next_delay(e, attempt, getattr(func, "__name__", repr(func)))
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+
+
+def retry(max_retries=3, wait_time=2, max_wait_time=30, budget=None, metrics=None, classify=is_transient):
+    """Retry decorator for sync and async functions.
+
+    Transient failures are retried with exponential backoff and jitter; permanent ones fail
+    fast. When retries are exhausted the error is logged and None is returned.
+    """
+    policy = RetryPolicy(max_retries=max_retries, wait_time=wait_time, max_wait_time=max_wait_time,
+                         budget=budget, metrics=metrics, classify=classify)
 
-def retry(max_retries=3, wait_time=2):
-    """Retry decorator to handle retries for functions."""
     def decorator(func):
-        def wrapper(*args, **kwargs):
-            for attempt in range(max_retries):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
                 try:
-                    return func(*args, **kwargs)
-                except Exception as e:
-                    logging.error(f"Attempt {attempt + 1} failed with error: {e}")
-                    if attempt < max_retries - 1:
-                        time.sleep(wait_time)  # Wait before retrying
-                    else:
-                        logging.error(f"Max retries exceeded for {func.__name__}")
-                        return None  # Optionally return None if all retries fail
+                    return await policy.acall(func, *args, **kwargs)
+                except Exception:
+                    return None
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return policy.call(func, *args, **kwargs)
+            except Exception:
+                return None  # Optionally return None if all retries fail
         return wrapper
     return decorator
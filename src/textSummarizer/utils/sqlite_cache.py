@@ -0,0 +1,132 @@
+import time
+import sqlite3
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Tuple
+from src.textSummarizer.logging import logger
+
+STATS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stats (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+# Reads buffered in memory before their counts and access times are written out
+FLUSH_EVERY = 256
+
+
+class SQLiteLRUCache:
+    """Base of the on-disk caches: an SQLite database, in WAL mode, with an LRU size cap.
+
+    A subclass gives its `SCHEMA`, which must have an `entries` table with one row per cache
+    entry, holding its `size` in bytes and its `last_access` time under the `KEY_COLUMNS`.
+    Rows of `DEPENDENT_TABLES`, keyed by the same columns, are evicted with their entry.
+    When the entries grow past `max_size_mb`, the least recently used ones are evicted.
+
+    Reads do not write: hit and miss counts, and the access times of hits, are kept in
+    memory and flushed with the next write, or once `FLUSH_EVERY` reads have piled up, so
+    readers in any number of processes never wait on each other. `stats` adds up what
+    every process has flushed.
+    """
+
+    SCHEMA = ""
+    KEY_COLUMNS: Tuple[str, ...] = ()
+    DEPENDENT_TABLES: Tuple[str, ...] = ()
+    NAME = "cache"
+
+    def __init__(self, cache_file: Path, max_size_mb: int) -> None:
+        self.cache_file = Path(cache_file)
+        self.max_size = max_size_mb * 1024 * 1024
+        self._connection = None
+        self._reset_reads()
+
+    def __getstate__(self):
+        # Connections cannot be pickled, and buffered reads belong to the process that made them
+        state = self.__dict__.copy()
+        state.update(_connection=None, _counts=Counter(), _accessed={}, _reads=0)
+        return state
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(self.cache_file, timeout=30)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.executescript(self.SCHEMA + STATS_SCHEMA)
+        return self._connection
+
+    def _reset_reads(self) -> None:
+        self._counts = Counter()
+        self._accessed = {}  # entry key -> time of its last hit
+        self._reads = 0
+
+    @contextmanager
+    def write(self):
+        """Write transaction, which also flushes the buffered reads."""
+        with self.connection:
+            yield self.connection
+            self._flush_reads()
+
+    def record_read(self, key: Tuple, hit: bool, amount: int = 1) -> None:
+        """Counts a read of `amount` items (as a hit or miss) and, on a hit, the entry's access."""
+        self._counts["hits" if hit else "misses"] += amount
+        if hit:
+            self._accessed[key] = time.time()
+        self._reads += 1
+        if self._reads >= FLUSH_EVERY:
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes out the buffered read counts and access times."""
+        if self._reads:
+            with self.write():
+                pass
+
+    def _flush_reads(self) -> None:
+        if self._accessed:
+            where = " AND ".join(f"{column}=?" for column in self.KEY_COLUMNS)
+            self.connection.executemany(
+                f"UPDATE entries SET last_access=? WHERE {where}",
+                [(accessed, *key) for key, accessed in self._accessed.items()]
+            )
+        self._count(self._counts)
+        self._reset_reads()
+
+    def _count(self, counts: Dict[str, int]) -> None:
+        self.connection.executemany(
+            "INSERT INTO stats (name, value) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET value=value+excluded.value",
+            [(name, amount) for name, amount in counts.items() if amount]
+        )
+
+    def size(self) -> int:
+        """Total size of the cached entries, in bytes."""
+        return self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def evict(self) -> None:
+        """Drops least recently used entries until the cache fits in `max_size`."""
+        total = self.size()
+        if total <= self.max_size:
+            return
+        evicted = 0
+        columns = ", ".join(self.KEY_COLUMNS)
+        where = " AND ".join(f"{column}=?" for column in self.KEY_COLUMNS)
+        with self.write():
+            for row in self.connection.execute(f"SELECT {columns}, size FROM entries ORDER BY last_access").fetchall():
+                if total <= self.max_size:
+                    break
+                for table in (*self.DEPENDENT_TABLES, "entries"):
+                    self.connection.execute(f"DELETE FROM {table} WHERE {where}", row[:-1])
+                total -= row[-1]
+                evicted += 1
+            self._count({"evictions": evicted})
+        logger.info(f"Evicted {evicted} entries from the {self.NAME}, {total} bytes remain.")
+
+    def stats(self) -> Dict[str, int]:
+        """Hit, miss and eviction counts, plus the current size in bytes."""
+        self.flush()
+        stats = dict(self.connection.execute("SELECT name, value FROM stats").fetchall())
+        stats["size_bytes"] = self.size()
+        return stats
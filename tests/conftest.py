@@ -0,0 +1,211 @@
+import asyncio
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, List
+import nltk
+import pytest
+from aiohttp import web
+from src.textSummarizer.entity import PdfProcessingConfig, TextPreProcessingConfig, TextProcessingConfig
+
+
+def pdf_processing_config(**overrides) -> PdfProcessingConfig:
+    """The data_processing settings of params.yaml, on one worker and without the page cache, with `overrides` applied."""
+    settings = dict(
+        pdf_folder_path=Path("pdfs"),
+        manifest_file=Path("manifest.db"),
+        extraction_backend="pdfminer",
+        batch_size=10,
+        max_retries=3,
+        wait_time=2,
+        max_wait_time=30,
+        retry_budget=20,
+        page_parallel_threshold=50,
+        pages_per_task=25,
+        extraction_tier="full",
+        category_tiers={},
+        page_cache_file=Path("page_cache.db"),
+        page_cache_max_mb=0,
+        failed_folder_path=Path("failed"),
+        num_workers=1,
+        document_timeout=300,
+        worker_memory_limit_mb=2048,
+        claim_timeout=21600,
+    )
+    settings.update(overrides)
+    return PdfProcessingConfig(**settings)
+
+
+def preprocessing_config(**overrides) -> TextPreProcessingConfig:
+    """The text_preprocessing settings of params.yaml without spelling correction, with `overrides` applied."""
+    settings = dict(
+        remove_html=True,
+        remove_urls=True,
+        remove_emails=True,
+        handle_accents=True,
+        remove_unicode_chars=True,
+        remove_punctuations=True,
+        remove_digits=False,
+        remove_extra_spaces=True,
+        correct_spelling=False,
+        expand_contractions=True,
+        spelling_memo_size=100000,
+        sentence_block_size=0,
+        min_block_size=8,
+        blocks_per_worker=4,
+        num_workers=0,
+        symspell_snapshot_file=Path("symspell.pkl"),
+        preprocessing_cache_file=Path("preprocessing_cache.db"),
+        preprocessing_cache_max_mb=1024,
+        manifest_file=Path("manifest.db"),
+    )
+    settings.update(overrides)
+    return TextPreProcessingConfig(**settings)
+
+
+def text_processing_config(**overrides) -> TextProcessingConfig:
+    """The text_processing settings of params.yaml, on the CPU and without the embedding store, with `overrides` applied."""
+    settings = dict(
+        batch_size=500,
+        dynamic_percentile=20,
+        max_tokens=4096,
+        embedding_model_name="longformer_model",
+        embedding_tokenizer="longformer_tokenizer",
+        sentence_model="sentence_model",
+        tokenizer_max_length=4096,
+        device="cpu",
+        truncation=True,
+        embedding_batch_size=8,
+        use_embedding_store=False,
+        embedding_store_dir=Path("embeddings"),
+        keywords_file=Path("keywords.csv"),
+    )
+    settings.update(overrides)
+    return TextProcessingConfig(**settings)
+
+
+def requires_nltk_data(*resources: str):
+    """Skips a test when the NLTK data it needs, e.g. 'tokenizers/punkt_tab', is not installed."""
+    missing = []
+    for resource in resources:
+        try:
+            nltk.data.find(resource)
+        except LookupError:
+            missing.append(resource)
+    return pytest.mark.skipif(bool(missing), reason=f"NLTK data not installed: {', '.join(missing)}")
+
+
+def make_pdf(pages: List[str]) -> bytes:
+    """Builds a minimal, valid PDF with one line of Helvetica text per page."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in pages:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(pages)} >>"
+
+    content = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(content))
+        content += f"{number} 0 obj\n{body}\nendobj\n".encode()
+    xref = len(content)
+    content += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    content += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    content += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return content
+
+
+class LocalServer:
+    """HTTP server on a background event loop, serving `files` with ETag, Range and If-Range support.
+
+    `failures[name]` answers that many requests for a file with a 503 before serving it, and
+    `drops[name]` cuts the connection after that many bytes of the next response. Every
+    request is recorded in `requests` as (name, headers, status).
+    """
+
+    LAST_MODIFIED = "Mon, 05 Oct 2026 10:00:00 GMT"
+
+    def __init__(self) -> None:
+        self.files: Dict[str, bytes] = {}
+        self.failures: Dict[str, int] = {}
+        self.drops: Dict[str, int] = {}
+        self.requests = []
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    def etag(self, name: str) -> str:
+        return '"' + hashlib.sha256(self.files[name]).hexdigest()[:16] + '"'
+
+    def url(self, name: str) -> str:
+        return f"http://127.0.0.1:{self.port}/{name}"
+
+    def statuses(self, name: str) -> List[int]:
+        return [status for requested, _, status in self.requests if requested == name]
+
+    def run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(timeout=10)
+
+    def start(self) -> "LocalServer":
+        self.thread.start()
+        app = web.Application()
+        app.router.add_get("/{name}", self.handle)
+        self.runner = web.AppRunner(app)
+        self.run(self.runner.setup())
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        self.run(site.start())
+        self.port = site._server.sockets[0].getsockname()[1]
+        return self
+
+    def stop(self) -> None:
+        self.run(self.runner.cleanup())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=10)
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        name = request.match_info["name"]
+        response = await self.respond(name, request)
+        self.requests.append((name, dict(request.headers), response.status))
+        return response
+
+    async def respond(self, name: str, request: web.Request) -> web.StreamResponse:
+        if name not in self.files:
+            return web.Response(status=404)
+        if self.failures.get(name):
+            self.failures[name] -= 1
+            return web.Response(status=503)
+
+        body, etag = self.files[name], self.etag(name)
+        headers = {"ETag": etag, "Last-Modified": self.LAST_MODIFIED}
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers=headers)
+
+        status = 200
+        range_header = request.headers.get("Range")
+        if range_header and request.headers.get("If-Range") in (None, etag):
+            start = int(range_header.split("=")[1].rstrip("-"))
+            if start >= len(body):
+                return web.Response(status=416, headers={"Content-Range": f"bytes */{len(body)}"})
+            headers["Content-Range"] = f"bytes {start}-{len(body) - 1}/{len(body)}"
+            status, body = 206, body[start:]
+
+        if name in self.drops:
+            response = web.StreamResponse(status=status, headers=headers)
+            response.content_length = len(body)
+            await response.prepare(request)
+            await response.write(body[:self.drops.pop(name)])
+            request.transport.close()
+            return response
+        return web.Response(status=status, body=body, headers=headers)
+
+
+@pytest.fixture
+def server():
+    local_server = LocalServer().start()
+    yield local_server
+    local_server.stop()
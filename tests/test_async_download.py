@@ -0,0 +1,225 @@
+import asyncio
+import hashlib
+from datetime import datetime
+from conftest import make_pdf
+from src.textSummarizer.utils.async_download import download_files_async, download_files_concurrently
+from src.textSummarizer.utils.common import deduplicate_downloads
+from src.textSummarizer.utils.download_cache import DownloadCache
+from src.textSummarizer.utils.retry import RetryPolicy, RetryBudget
+
+
+def download(server, names, tmp_path, retry_policy=None):
+    """Downloads `names` from the server into tmp_path/pdfs, with the download cache in tmp_path."""
+    (tmp_path / "pdfs").mkdir(exist_ok=True)
+    urls = {name: server.url(name) for name in names}
+    return asyncio.run(download_files_async(
+        urls, tmp_path / "pdfs", tmp_path / "failed", chunk_size=64,
+        cache_file=tmp_path / "download_cache.json", retry_policy=retry_policy
+    ))
+
+
+def test_downloads_every_file(server, tmp_path):
+    for name in ("a", "b", "c"):
+        server.files[name] = make_pdf([f"document {name}"])
+
+    results = download(server, ["a", "b", "c"], tmp_path)
+
+    # Results come back in the order of the URLs, whichever download finishes first
+    assert [result["source_name"] for result in results] == ["a", "b", "c"]
+    assert [result["url"] for result in results] == [server.url(name) for name in ("a", "b", "c")]
+    assert all((tmp_path / "pdfs" / result["file_name"]).exists() for result in results)
+
+
+def test_failed_downloads_are_left_out(server, tmp_path):
+    server.files["a"] = make_pdf(["a"])
+    (tmp_path / "pdfs").mkdir()
+
+    downloaded = download_files_concurrently(
+        {"a": server.url("a"), "missing": server.url("missing")}, tmp_path / "pdfs", tmp_path / "failed"
+    )
+
+    assert [metadata["source_name"] for metadata in downloaded] == ["a"]
+
+
+def partial_download(server, name, tmp_path, content: bytes, etag: str):
+    """Leaves an interrupted download of `name` behind, as a dropped connection would."""
+    (tmp_path / "pdfs").mkdir(exist_ok=True)
+    (tmp_path / "pdfs" / f"{name}.pdf.part").write_bytes(content)
+    cache = DownloadCache(tmp_path / "download_cache.json")
+    cache.update(server.url(name), etag=etag, last_modified=server.LAST_MODIFIED, complete=False)
+    cache.save()
+
+
+def fast_policy(**kwargs):
+    return RetryPolicy(wait_time=0, max_wait_time=0, **kwargs)
+
+
+def test_unchanged_file_is_revalidated(server, tmp_path):
+    server.files["doc"] = make_pdf(["page"])
+    [first] = download(server, ["doc"], tmp_path)
+
+    [second] = download(server, ["doc"], tmp_path)
+
+    assert server.statuses("doc") == [200, 304]
+    assert server.requests[-1][1]["If-None-Match"] == server.etag("doc")
+    # The metadata of the first download, as the download cache stored it
+    assert (second["file_name"], second["sha256"]) == (first["file_name"], first["sha256"])
+
+
+def test_changed_file_is_downloaded_again(server, tmp_path):
+    server.files["doc"] = make_pdf(["old"])
+    download(server, ["doc"], tmp_path)
+    server.files["doc"] = make_pdf(["new"])
+
+    [metadata] = download(server, ["doc"], tmp_path)
+
+    assert server.statuses("doc") == [200, 200]
+    assert metadata["sha256"] == hashlib.sha256(server.files["doc"]).hexdigest()
+
+
+def test_partial_download_is_resumed(server, tmp_path):
+    content = make_pdf(["resumed page"])
+    server.files["doc"] = content
+    partial_download(server, "doc", tmp_path, content[:100], server.etag("doc"))
+
+    [metadata] = download(server, ["doc"], tmp_path)
+
+    assert server.statuses("doc") == [206]
+    assert server.requests[0][1]["Range"] == "bytes=100-"
+    assert server.requests[0][1]["If-Range"] == server.etag("doc")
+    # The digest covers the bytes of the earlier attempt as well
+    assert metadata["sha256"] == hashlib.sha256(content).hexdigest()
+    assert (tmp_path / "pdfs" / metadata["file_name"]).read_bytes() == content
+
+
+def test_stale_partial_download_is_replaced(server, tmp_path):
+    content = make_pdf(["current"])
+    server.files["doc"] = content
+    partial_download(server, "doc", tmp_path, b"x" * 100, '"outdated"')
+
+    [metadata] = download(server, ["doc"], tmp_path)
+
+    # If-Range does not match, so the server sends the whole file instead of a range
+    assert server.statuses("doc") == [200]
+    assert (tmp_path / "pdfs" / metadata["file_name"]).read_bytes() == content
+
+
+def test_unsatisfiable_range_restarts_without_range(server, tmp_path):
+    content = make_pdf(["page"])
+    server.files["doc"] = content
+    partial_download(server, "doc", tmp_path, content + b"trailing bytes", server.etag("doc"))
+
+    [metadata] = download(server, ["doc"], tmp_path)
+
+    assert server.statuses("doc") == [416, 200]
+    assert "Range" not in server.requests[1][1]
+    assert metadata["sha256"] == hashlib.sha256(content).hexdigest()
+    assert (tmp_path / "pdfs" / metadata["file_name"]).read_bytes() == content
+
+
+def test_dropped_connection_is_retried_from_where_it_stopped(server, tmp_path):
+    content = make_pdf(["page"] * 5)
+    server.files["doc"] = content
+    server.drops["doc"] = 200
+    policy = fast_policy(max_retries=3)
+
+    [metadata] = download(server, ["doc"], tmp_path, policy)
+
+    assert server.statuses("doc") == [200, 206]
+    assert server.requests[1][1]["Range"] == "bytes=200-"
+    assert metadata["sha256"] == hashlib.sha256(content).hexdigest()
+    assert sum(outcomes.get("retried", 0) for outcomes in policy.metrics.report().values()) == 1
+
+
+def test_download_is_validated(server, tmp_path):
+    content = make_pdf(["one", "two", "three"])
+    server.files["doc"] = content
+
+    [metadata] = download(server, ["doc"], tmp_path)
+
+    assert metadata["sha256"] == hashlib.sha256(content).hexdigest()
+    assert metadata["page_count"] == 3
+    assert metadata["file_size"] == f"{round(len(content) / 1024, 2)} KB"
+    assert metadata["last_modified"] == datetime(2026, 10, 5, 10, 0)
+
+
+def test_corrupted_download_is_moved_to_failed(server, tmp_path):
+    server.files["broken"] = b"%PDF-1.4\nnot a PDF after all\n"
+
+    [result] = download(server, ["broken"], tmp_path)
+
+    assert "corrupted" in result["error"]
+    assert list((tmp_path / "pdfs").iterdir()) == []
+    assert [path.name for path in (tmp_path / "failed").iterdir()] == ["broken.pdf"]
+    assert DownloadCache(tmp_path / "download_cache.json").get(server.url("broken")) is None
+
+
+def test_downloads_to_content_hash(server, tmp_path):
+    content = make_pdf(["first page", "second page"])
+    server.files["doc"] = content
+
+    [metadata] = download(server, ["doc"], tmp_path)
+
+    sha256 = hashlib.sha256(content).hexdigest()
+    assert metadata["file_name"] == f"{sha256}.pdf"
+    assert metadata["sha256"] == sha256
+    assert metadata["page_count"] == 2
+    assert (tmp_path / "pdfs" / f"{sha256}.pdf").read_bytes() == content
+    assert not (tmp_path / "pdfs" / "doc.pdf.part").exists()
+    entry = DownloadCache(tmp_path / "download_cache.json").get(server.url("doc"))
+    assert entry["complete"] and entry["etag"] == server.etag("doc")
+
+
+def test_duplicate_content_is_stored_once(server, tmp_path):
+    content = make_pdf(["shared"])
+    server.files["first"] = content
+    server.files["second"] = content
+    server.files["other"] = make_pdf(["other"])
+
+    results = download(server, ["first", "second", "other"], tmp_path)
+    documents, report = deduplicate_downloads(results, tmp_path / "pdfs")
+
+    assert sorted(path.name for path in (tmp_path / "pdfs").iterdir()) == sorted(
+        f"{hashlib.sha256(body).hexdigest()}.pdf" for body in (content, server.files["other"])
+    )
+    assert report["downloaded_files"] == 3
+    assert report["unique_documents"] == 2
+    assert report["duplicate_files"] == 1
+    assert report["duplicate_bytes"] == len(content)
+    shared = next(document for document in documents if document["sha256"] == hashlib.sha256(content).hexdigest())
+    assert shared["aliases"] == "first, second"
+
+
+def test_transient_errors_are_retried(server, tmp_path):
+    server.files["doc"] = make_pdf(["page"])
+    server.failures["doc"] = 2
+    policy = fast_policy(max_retries=3)
+
+    [metadata] = download(server, ["doc"], tmp_path, policy)
+
+    assert "error" not in metadata
+    assert server.statuses("doc") == [503, 503, 200]
+    assert policy.metrics.report() == {"ClientResponseError": {"retried": 2}}
+
+
+def test_permanent_errors_are_not_retried(server, tmp_path):
+    policy = fast_policy(max_retries=3)
+
+    [result] = download(server, ["missing"], tmp_path, policy)
+
+    assert "error" in result
+    assert server.statuses("missing") == [404]
+    assert policy.metrics.report() == {"ClientResponseError": {"permanent": 1}}
+
+
+def test_retry_budget_is_shared_by_every_download(server, tmp_path):
+    for name in ("a", "b"):
+        server.files[name] = make_pdf([name])
+        server.failures[name] = 5
+    policy = fast_policy(max_retries=5, budget=RetryBudget(1))
+
+    results = download(server, ["a", "b"], tmp_path, policy)
+
+    assert all("error" in result for result in results)
+    assert policy.budget.spent == 1
+    assert policy.metrics.report() == {"ClientResponseError": {"retried": 1, "budget_exhausted": 2}}
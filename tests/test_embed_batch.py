@@ -0,0 +1,140 @@
+from types import SimpleNamespace
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")  # text_processing imports it at module level
+
+from conftest import text_processing_config
+from src.textSummarizer.components.text_processing import TextProcessor
+
+CLS = 101
+
+
+class Tensor:
+    """Just enough of a tensor for `encode_batch`: indexing, `to`, `float`, `cpu` and `numpy`."""
+
+    def __init__(self, array):
+        self.array = np.asarray(array)
+
+    def to(self, device):
+        return self
+
+    def float(self):
+        return Tensor(self.array.astype(np.float32))
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self.array
+
+    def __getitem__(self, index):
+        return Tensor(self.array[index])
+
+
+class Tokenizer:
+    """Turns each word into its length, after a CLS token, and records the shape of every padded batch."""
+
+    name_or_path = "test-tokenizer"
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, texts, truncation, max_length):
+        input_ids = [([CLS] + [len(word) for word in text.split()])[:max_length if truncation else None] for text in texts]
+        return {"input_ids": input_ids, "attention_mask": [[1] * len(ids) for ids in input_ids]}
+
+    def pad(self, features, padding, return_tensors):
+        assert padding == "longest"
+        longest = max(len(ids) for ids in features["input_ids"])
+        self.batches.append([len(ids) for ids in features["input_ids"]])
+        return {
+            key: Tensor([row + [0] * (longest - len(row)) for row in rows])
+            for key, rows in features.items()
+        }
+
+
+class Model:
+    """CLS embedding from the unpadded tokens only, so padding can never change it."""
+
+    name_or_path = "test-model"
+    config = SimpleNamespace(hidden_size=3)
+
+    def __init__(self):
+        self.calls = 0
+
+    def parameters(self):
+        yield SimpleNamespace(device="cpu")
+
+    def __call__(self, input_ids, attention_mask):
+        self.calls += 1
+        ids, mask = input_ids.array, attention_mask.array
+        cls = np.stack([(ids * mask).sum(axis=1), mask.sum(axis=1), (ids * mask).max(axis=1)], axis=1)
+        hidden = np.repeat(cls[:, None, :], ids.shape[1], axis=1).astype(np.float64)
+        return SimpleNamespace(last_hidden_state=Tensor(hidden))
+
+
+def expected_embedding(text, max_length=4096):
+    ids = ([CLS] + [len(word) for word in text.split()])[:max_length]
+    return [sum(ids), len(ids), max(ids)]
+
+
+TEXTS = ["a short one", "the longest text of them all by quite a margin", "mid sized text here", "x",
+         "another text of middling size", "two words", "and one more with several words in it"]
+
+
+def test_rows_follow_the_order_of_the_texts():
+    processor = TextProcessor(text_processing_config(embedding_batch_size=3))
+
+    embeddings = processor.embed_batch(TEXTS, Model(), Tokenizer())
+
+    assert embeddings.dtype == np.float32 and embeddings.flags["C_CONTIGUOUS"]
+    np.testing.assert_array_equal(embeddings, [expected_embedding(text) for text in TEXTS])
+
+
+def test_batches_are_grouped_by_length_and_padded_to_their_longest():
+    processor = TextProcessor(text_processing_config(embedding_batch_size=3))
+    tokenizer, model = Tokenizer(), Model()
+
+    processor.embed_batch(TEXTS, model, tokenizer)
+
+    lengths = [length for batch in tokenizer.batches for length in batch]
+    assert lengths == sorted((expected_embedding(text)[1] for text in TEXTS), reverse=True)
+    assert [len(batch) for batch in tokenizer.batches] == [3, 3, 1]
+    assert model.calls == 3
+
+
+def test_texts_are_truncated_to_the_tokenizer_max_length():
+    processor = TextProcessor(text_processing_config(tokenizer_max_length=4))
+
+    embeddings = processor.embed_batch(TEXTS, Model(), Tokenizer())
+
+    np.testing.assert_array_equal(embeddings, [expected_embedding(text, max_length=4) for text in TEXTS])
+
+
+def test_no_texts():
+    embeddings = TextProcessor(text_processing_config()).embed_batch([], Model(), Tokenizer())
+    assert embeddings.shape == (0, 3)
+
+
+def test_stored_embeddings_are_not_encoded_again(tmp_path):
+    processor = TextProcessor(text_processing_config(use_embedding_store=True, embedding_store_dir=tmp_path / "embeddings"))
+    model = Model()
+    first = processor.embed_batch(TEXTS[:4], model, Tokenizer())
+    calls = model.calls
+
+    embeddings = processor.embed_batch(TEXTS, model, Tokenizer())
+
+    np.testing.assert_array_equal(embeddings[:4], first)
+    np.testing.assert_array_equal(embeddings, [expected_embedding(text) for text in TEXTS])
+    # Only the three new texts went through the model, in a single batch
+    assert model.calls == calls + 1
+    assert processor.embedding_store.stats()["entries"] == len(TEXTS)
+
+
+def test_queries_bypass_the_store(tmp_path):
+    processor = TextProcessor(text_processing_config(use_embedding_store=True, embedding_store_dir=tmp_path / "embeddings"))
+
+    processor.embed_batch(["a query"], Model(), Tokenizer(), store=False)
+
+    assert processor.embedding_store.stats()["entries"] == 0
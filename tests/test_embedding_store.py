@@ -0,0 +1,126 @@
+import pickle
+import numpy as np
+import pytest
+from src.textSummarizer.utils import embedding_store
+from src.textSummarizer.utils.embedding_store import EmbeddingStore
+
+NAMESPACE = EmbeddingStore.make_namespace("model", {"max_length": 512})
+
+
+@pytest.fixture
+def store(tmp_path):
+    return EmbeddingStore(tmp_path / "embeddings")
+
+
+def vectors(count: int, dim: int = 4, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal((count, dim)).astype(np.float32)
+
+
+def hashes(*texts: str):
+    return [EmbeddingStore.text_hash(text) for text in texts]
+
+
+def test_insert_and_lookup(store):
+    embeddings = vectors(3)
+    assert store.insert(NAMESPACE, hashes("a", "b", "c"), embeddings) == 3
+
+    found_embeddings, found = store.lookup(NAMESPACE, hashes("c", "missing", "a"))
+
+    assert found.tolist() == [True, False, True]
+    np.testing.assert_array_equal(found_embeddings[0], embeddings[2])
+    np.testing.assert_array_equal(found_embeddings[1], np.zeros(4, dtype=np.float32))
+    np.testing.assert_array_equal(found_embeddings[2], embeddings[0])
+
+
+def test_lookup_in_unknown_namespace(store):
+    found_embeddings, found = store.lookup("unknown", hashes("a", "b"))
+    assert found_embeddings.shape == (2, 0)
+    assert not found.any()
+
+
+def test_texts_already_stored_are_not_appended(store):
+    embeddings = vectors(2)
+    store.insert(NAMESPACE, hashes("a", "b"), embeddings)
+
+    # "a" twice in one batch and "b" already stored: only "c" is new
+    assert store.insert(NAMESPACE, hashes("a", "b", "c", "a"), vectors(4, seed=1)) == 1
+
+    found_embeddings, found = store.lookup(NAMESPACE, hashes("a", "b"))
+    np.testing.assert_array_equal(found_embeddings, embeddings)
+    assert store.stats()["rows"] == 3
+
+
+def test_namespaces_are_kept_apart(store):
+    other = EmbeddingStore.make_namespace("model", {"max_length": 256})
+    store.insert(NAMESPACE, hashes("a"), vectors(1, dim=4))
+    store.insert(other, hashes("a"), vectors(1, dim=8))
+
+    assert store.lookup(NAMESPACE, hashes("a"))[0].shape == (1, 4)
+    assert store.lookup(other, hashes("a"))[0].shape == (1, 8)
+    with pytest.raises(ValueError):
+        store.insert(NAMESPACE, hashes("b"), vectors(1, dim=8))
+
+
+def test_lookup_many_hashes(store, monkeypatch):
+    monkeypatch.setattr(embedding_store, "QUERY_SIZE", 7)
+    embeddings = vectors(50)
+    texts = [str(number) for number in range(50)]
+    store.insert(NAMESPACE, hashes(*texts), embeddings)
+
+    found_embeddings, found = store.lookup(NAMESPACE, hashes(*reversed(texts)))
+
+    assert found.all()
+    np.testing.assert_array_equal(found_embeddings, embeddings[::-1])
+
+
+def test_compact_reclaims_deleted_rows(store):
+    embeddings = vectors(4)
+    store.insert(NAMESPACE, hashes("a", "b", "c", "d"), embeddings)
+    store.delete(NAMESPACE, hashes("b", "d"))
+    store.drop(EmbeddingStore.make_namespace("unused", {}))
+
+    assert store.compact() == 2 * 4 * 4
+
+    found_embeddings, found = store.lookup(NAMESPACE, hashes("a", "b", "c", "d"))
+    assert found.tolist() == [True, False, True, False]
+    np.testing.assert_array_equal(found_embeddings[[0, 2]], embeddings[[0, 2]])
+    assert [path.name for path in store.store_dir.glob("*.f32")] == [f"{NAMESPACE}.1.f32"]
+    # Rows appended after compacting land in the new generation
+    store.insert(NAMESPACE, hashes("e"), embeddings[[3]])
+    np.testing.assert_array_equal(store.lookup(NAMESPACE, hashes("e"))[0], embeddings[[3]])
+
+
+def test_compact_removes_dropped_namespaces(store):
+    store.insert(NAMESPACE, hashes("a"), vectors(1))
+    store.drop(NAMESPACE)
+
+    store.compact()
+
+    assert list(store.store_dir.glob("*.f32")) == []
+    assert store.stats() == {"namespaces": 0, "entries": 0, "rows": 0, "size_bytes": 0}
+
+
+def test_compact_leaves_files_still_in_use(store, monkeypatch):
+    store.insert(NAMESPACE, hashes("a", "b"), vectors(2))
+    store.delete(NAMESPACE, hashes("a"))
+
+    def in_use(path):
+        raise PermissionError(f"'{path}' is mapped by another process")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(embedding_store.os, "remove", in_use)
+        store.compact()
+    assert (store.store_dir / f"{NAMESPACE}.0.f32").exists()
+    assert store.lookup(NAMESPACE, hashes("b"))[1].all()
+
+    store.compact()
+    assert [path.name for path in store.store_dir.glob("*.f32")] == [f"{NAMESPACE}.1.f32"]
+
+
+def test_pickled_store_reopens_its_index(store):
+    embeddings = vectors(1)
+    store.insert(NAMESPACE, hashes("a"), embeddings)
+
+    copy = pickle.loads(pickle.dumps(store))
+
+    np.testing.assert_array_equal(copy.lookup(NAMESPACE, hashes("a"))[0], embeddings)
@@ -0,0 +1,81 @@
+import pandas as pd
+import pytest
+from rapidfuzz import fuzz
+from benchmarks.keyword_deduplication import reference_deduplicate
+from src.textSummarizer.components.keyword_extraction import (
+    KeywordExtraction,
+    deduplicate,
+    extract_candidates,
+    select_keywords
+)
+from src.textSummarizer.entity import KeywordExtractionConfig, RapidfuzzConfig
+from src.textSummarizer.utils.manifest import Manifest
+
+TEXT = (
+    "The appellant challenged the order of the High Court. The High Court had dismissed the writ petition "
+    "filed by the appellant against the land acquisition. The land acquisition officer issued the notification "
+    "without hearing the landowners. The Supreme Court held that the notification under the Land Acquisition Act "
+    "was invalid, and set aside the order of the High Court."
+)
+
+PHRASES = [
+    "land acquisition", "Land Acquisition", "land acquisitions", "High Court", "high court order", "writ petition",
+    "writ petitions", "notification", "the notification", "Supreme Court", "supreme courts", "landowners",
+    "land owner", "appellant", "appellants", "order", "orders", "Acquisition Act", "land acquisition act",
+]
+
+
+def keyword_config(tmp_path, **overrides) -> KeywordExtractionConfig:
+    settings = dict(
+        remove_newline=True, stop_words=True, language="en", max_ngram_size=3, deduplication_threshold=0.75,
+        deduplication_algo="seqm3", window_size=2, candidate_count=200, window_sentences=1000, top_k=5,
+        num_workers=1, keywords_file=tmp_path / "keywords.csv", manifest_file=tmp_path / "manifest.db",
+    )
+    settings.update(overrides)
+    return KeywordExtractionConfig(**settings)
+
+
+@pytest.mark.parametrize("scorer", [fuzz.ratio, fuzz.token_set_ratio, fuzz.partial_ratio])
+@pytest.mark.parametrize("threshold", [55, 80, 95])
+@pytest.mark.parametrize("block_size", [1, 4, 256])
+def test_deduplicate_matches_pairwise_comparison(scorer, threshold, block_size):
+    assert deduplicate(PHRASES, scorer, threshold, block_size) == reference_deduplicate(PHRASES, scorer, threshold)
+
+
+def test_deduplicate_keeps_the_best_ranked_phrase():
+    assert deduplicate(["High Court", "high court", "writ petition"], fuzz.ratio, 90) == ["High Court", "writ petition"]
+    assert deduplicate([], fuzz.ratio, 90) == []
+
+
+def test_select_keywords_keeps_top_k_after_deduplication():
+    keywords = select_keywords(PHRASES, RapidfuzzConfig(threshold=90, scorer="ratio"), top_k=4)
+    assert keywords == ["land acquisition", "High Court", "high court order", "writ petition"]
+
+
+def test_candidates_are_ranked_best_first(tmp_path):
+    candidates = extract_candidates(keyword_config(tmp_path), TEXT)
+
+    assert candidates
+    scores = [score for _, score in candidates]
+    assert scores == sorted(scores)
+    assert any("High Court" in phrase for phrase, _ in candidates)
+    assert extract_candidates(keyword_config(tmp_path), "   ") == []
+
+
+def test_keywords_are_written_for_preprocessed_documents(tmp_path):
+    config = keyword_config(tmp_path)
+    with Manifest(config.manifest_file) as manifest:
+        manifest.upsert_document("done", "done.pdf", processed_text=TEXT.replace(". ", ".\n"))
+        manifest.set_stage_status("done", "text_preprocessing", "done")
+        manifest.upsert_document("pending", "pending.pdf", processed_text="Not cleaned yet.")
+        manifest.set_stage_status("pending", "text_preprocessing", "pending")
+
+    [keywords] = KeywordExtraction(config, RapidfuzzConfig(threshold=55, scorer="ratio")).extract_keywords_from_file()
+
+    assert 0 < len(keywords) <= config.top_k
+    written = pd.read_csv(config.keywords_file)
+    assert written["doc_id"].tolist() == ["done"]
+    assert written["keywords"][0] == ", ".join(keywords)
+    with Manifest(config.manifest_file) as manifest:
+        assert manifest.stage_status("done", "keyword_extraction") == "done"
+        assert manifest.stage_status("pending", "keyword_extraction") is None
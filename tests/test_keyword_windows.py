@@ -0,0 +1,52 @@
+import pytest
+from test_keyword_extraction import TEXT, keyword_config
+from src.textSummarizer.components.keyword_extraction import (
+    extract_candidates,
+    merge_candidates,
+    split_windows,
+    window_tasks
+)
+
+LINES = [f"Sentence {number}." for number in range(10)]
+
+
+@pytest.mark.parametrize("window_sentences, sizes", [(3, [3, 3, 3, 1]), (5, [5, 5]), (10, [10]), (50, [10]), (0, [10])])
+def test_windows_cover_every_sentence_in_order(window_sentences, sizes):
+    windows = split_windows("\n".join(LINES), window_sentences)
+
+    assert [len(window.split("\n")) for window in windows] == sizes
+    assert "\n".join(windows) == "\n".join(LINES)
+
+
+def test_short_documents_keep_yake_deduplication(tmp_path):
+    config = keyword_config(tmp_path, window_sentences=100)
+
+    assert window_tasks(config, "\n".join(LINES)) == [(config, "\n".join(LINES))]
+
+
+def test_windows_skip_yake_deduplication(tmp_path):
+    tasks = window_tasks(keyword_config(tmp_path, window_sentences=4), "\n".join(LINES))
+
+    assert len(tasks) == 3
+    assert all(config.deduplication_threshold == 1.0 for config, _ in tasks)
+
+
+def test_single_window_keeps_yake_ranking(tmp_path):
+    candidates = extract_candidates(keyword_config(tmp_path), TEXT)
+    assert merge_candidates([candidates]) == [phrase for phrase, _ in candidates]
+
+
+def test_phrases_found_in_several_windows_rank_higher():
+    windows = [
+        [("land acquisition", 0.2), ("writ petition", 0.1)],
+        [("Land Acquisition", 0.2), ("notification", 0.05)],
+    ]
+
+    # 1 / (1/0.2 + 1/0.2) = 0.1 ties "writ petition", and the better single score breaks the tie
+    assert merge_candidates(windows) == ["notification", "writ petition", "land acquisition"]
+    assert merge_candidates([]) == []
+
+
+def test_merged_phrase_keeps_the_casing_of_its_best_score():
+    windows = [[("high court", 0.3)], [("High Court", 0.1)], [("HIGH COURT", 0.2)]]
+    assert merge_candidates(windows) == ["High Court"]
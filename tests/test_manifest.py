@@ -0,0 +1,103 @@
+import pytest
+from src.textSummarizer.utils.manifest import Manifest
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    with Manifest(tmp_path / "manifest.db") as manifest:
+        yield manifest
+
+
+def test_upsert_and_update(manifest):
+    manifest.upsert_document("doc", "doc.pdf", page_count=3, metadata={"title": "Report"}, unknown="ignored")
+    manifest.update_document("doc", category="Medium", text="text")
+
+    document = manifest.get_document("doc")
+    assert document["file_name"] == "doc.pdf"
+    assert document["page_count"] == 3
+    assert document["metadata"] == {"title": "Report"}
+    assert (document["category"], document["text"]) == ("Medium", "text")
+    assert "unknown" not in document
+    assert manifest.get_by_file_name("doc.pdf")["doc_id"] == "doc"
+    assert manifest.get_document("missing") is None
+
+
+def test_upsert_keeps_fields_it_is_not_given(manifest):
+    manifest.upsert_document("doc", "doc.pdf", page_count=3)
+    manifest.upsert_document("doc", "doc.pdf", category="Medium")
+
+    document = manifest.get_document("doc")
+    assert (document["page_count"], document["category"]) == (3, "Medium")
+
+
+def test_same_content_keeps_its_first_name(manifest):
+    manifest.upsert_document("doc", "first.pdf")
+    manifest.upsert_document("doc", "second.pdf", page_count=2)
+    manifest.upsert_document("doc", "first.pdf")
+    manifest.upsert_document("doc", "second.pdf")
+
+    document = manifest.get_document("doc")
+    assert document["file_name"] == "first.pdf"
+    assert document["page_count"] == 2
+    assert manifest.get_by_file_name("second.pdf") is None
+
+
+def test_changed_content_replaces_the_stale_entry(manifest):
+    manifest.upsert_document("old", "report.pdf", page_count=3)
+    manifest.set_stage_status("old", "pdf_processing", "done")
+
+    manifest.upsert_document("new", "report.pdf")
+
+    assert manifest.get_document("old") is None
+    assert manifest.stage_status("old", "pdf_processing") is None
+    assert manifest.get_by_file_name("report.pdf")["doc_id"] == "new"
+    assert manifest.get_document("new")["page_count"] is None
+
+
+def test_stage_status(manifest):
+    for doc_id in ("a", "b", "c"):
+        manifest.upsert_document(doc_id, f"{doc_id}.pdf")
+        manifest.set_stage_status(doc_id, "pdf_processing", "pending")
+    manifest.set_stage_status("a", "pdf_processing", "done")
+    manifest.set_stage_status("b", "pdf_processing", "failed", "broken")
+
+    assert manifest.stage_status("a", "pdf_processing") == "done"
+    assert manifest.stage_status("a", "text_preprocessing") is None
+    assert [document["doc_id"] for document in manifest.documents("pdf_processing", "pending")] == ["c"]
+    assert [document["doc_id"] for document in manifest.documents()] == ["a", "b", "c"]
+    error = manifest.connection.execute(
+        "SELECT error FROM stage_status WHERE doc_id='b' AND stage='pdf_processing'"
+    ).fetchone()[0]
+    assert error == "broken"
+
+
+def test_survives_reopening(tmp_path):
+    with Manifest(tmp_path / "manifest.db") as manifest:
+        manifest.upsert_document("doc", "doc.pdf", text="kept")
+    with Manifest(tmp_path / "manifest.db") as manifest:
+        assert manifest.get_document("doc")["text"] == "kept"
+
+
+def test_claim_skips_done_and_in_flight_documents(manifest):
+    for doc_id in ("new", "done", "failed", "running"):
+        manifest.upsert_document(doc_id, f"{doc_id}.pdf")
+    manifest.set_stage_status("done", "pdf_processing", "done")
+    manifest.set_stage_status("failed", "pdf_processing", "failed", "broken")
+    manifest.set_stage_status("running", "pdf_processing", "running")
+
+    claims = {doc_id: manifest.claim_stage(doc_id, "pdf_processing") for doc_id in ("new", "done", "failed", "running")}
+
+    assert claims == {"new": True, "done": False, "failed": True, "running": False}
+    assert manifest.stage_status("done", "pdf_processing") == "done"
+    assert manifest.stage_status("failed", "pdf_processing") == "running"
+    # A second run finds every claimed document in flight
+    assert not manifest.claim_stage("new", "pdf_processing")
+
+
+def test_stale_claims_are_taken_over(manifest):
+    manifest.upsert_document("doc", "doc.pdf")
+    manifest.set_stage_status("doc", "pdf_processing", "running")
+    manifest.connection.execute("UPDATE stage_status SET updated_at='2000-01-01T00:00:00'")
+
+    assert manifest.claim_stage("doc", "pdf_processing", stale_after=3600)
+    assert not manifest.claim_stage("doc", "pdf_processing", stale_after=3600)
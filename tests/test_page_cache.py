@@ -0,0 +1,90 @@
+import pickle
+import random
+import string
+import pytest
+from src.textSummarizer.utils.page_cache import PageCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return PageCache(tmp_path / "pages.db", max_size_mb=16)
+
+
+def test_pages_round_trip(cache):
+    key = cache.make_key("hash", "pdfminer", {"tier": "full"})
+    cache.put_pages(key, 0, ["page one", "page two", "página três"])
+
+    assert cache.get_pages(key, 0, 3) == ["page one", "page two", "página três"]
+    assert cache.get_pages(key, 1, 3) == ["page two", "página três"]
+
+
+def test_incomplete_range_is_a_miss(cache):
+    key = cache.make_key("hash", "pdfminer", None)
+    cache.put_pages(key, 0, ["one", "two"])
+
+    assert cache.get_pages(key, 0, 3) is None
+    assert cache.get_pages(cache.make_key("other", "pdfminer", None), 0, 1) is None
+
+
+def test_ranges_written_in_pieces_add_up(cache):
+    key = cache.make_key("hash", "pdfminer", None)
+    cache.put_pages(key, 0, ["one", "two"])
+    cache.put_pages(key, 2, ["three"])
+
+    assert cache.get_pages(key, 0, 3) == ["one", "two", "three"]
+
+
+def test_keys_depend_on_content_backend_and_settings():
+    keys = {
+        PageCache.make_key("hash", "pdfminer", {"tier": "full"}),
+        PageCache.make_key("hash", "pdfminer", {"tier": "fast"}),
+        PageCache.make_key("hash", "pypdfium2", None),
+        PageCache.make_key("other", "pdfminer", {"tier": "full"}),
+    }
+    assert len(keys) == 4
+    assert PageCache.make_key("hash", "pdfminer", {"a": 1, "b": 2}) == PageCache.make_key("hash", "pdfminer", {"b": 2, "a": 1})
+
+
+def test_least_recently_used_entries_are_evicted(cache):
+    rng = random.Random(0)
+    # Random letters, so each entry stays close to 1000 bytes once compressed
+    pages = ["".join(rng.choices(string.ascii_letters, k=1000)) for _ in range(3)]
+    keys = [cache.make_key(f"doc{number}", "pdfminer", None) for number in range(3)]
+    cache.put_pages(keys[0], 0, [pages[0]])
+    cache.put_pages(keys[1], 0, [pages[1]])
+    cache.get_pages(keys[0], 0, 1)
+    # Room for two entries: the third evicts the one read least recently
+    cache.max_size = cache.size() + 100
+    cache.put_pages(keys[2], 0, [pages[2]])
+
+    assert cache.get_pages(keys[1], 0, 1) is None
+    assert cache.get_pages(keys[0], 0, 1) == [pages[0]]
+    assert cache.get_pages(keys[2], 0, 1) == [pages[2]]
+    assert cache.stats()["evictions"] == 1
+
+
+def test_reads_are_counted_once_flushed(tmp_path, cache):
+    key = cache.make_key("hash", "pdfminer", None)
+    cache.put_pages(key, 0, ["one", "two"])
+    cache.get_pages(key, 0, 2)
+    cache.get_pages(key, 0, 3)
+
+    # Another process sees nothing until the reads are flushed
+    other = PageCache(tmp_path / "pages.db")
+    assert "hits" not in other.stats()
+    cache.flush()
+    stats = other.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 3)
+    assert stats["size_bytes"] > 0
+
+
+def test_pickled_cache_reopens_its_database(cache):
+    key = cache.make_key("hash", "pdfminer", None)
+    cache.put_pages(key, 0, ["page"])
+    cache.get_pages(key, 0, 1)
+
+    copy = pickle.loads(pickle.dumps(cache))
+    assert copy.get_pages(key, 0, 1) == ["page"]
+    copy.flush()
+    cache.flush()
+    assert cache.stats()["hits"] == 2
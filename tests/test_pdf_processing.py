@@ -0,0 +1,99 @@
+import pytest
+from conftest import make_pdf, pdf_processing_config
+from src.textSummarizer.components import pdf_processing
+from src.textSummarizer.components.pdf_processing import PdfProcessing
+from src.textSummarizer.utils.common import compute_sha256
+from src.textSummarizer.utils.manifest import Manifest
+
+
+@pytest.fixture
+def folder(tmp_path):
+    folder = tmp_path / "pdfs"
+    folder.mkdir()
+    for name, pages in (("a", ["one"]), ("b", ["one", "two", "three"])):
+        (folder / f"{name}.pdf").write_bytes(make_pdf([f"{name} {page}" for page in pages]))
+    return folder
+
+
+@pytest.fixture
+def processing(tmp_path, folder):
+    return PdfProcessing(pdf_processing_config(pdf_folder_path=folder, manifest_file=tmp_path / "manifest.db"))
+
+
+def load(processing, folder):
+    with Manifest(processing.config.manifest_file) as manifest:
+        return processing.load_documents(manifest, sorted(folder.glob("*.pdf")))
+
+
+def test_new_pdfs_are_registered_and_claimed(processing, folder):
+    documents = load(processing, folder)
+
+    assert [document["file_name"] for document in documents] == ["a.pdf", "b.pdf"]
+    assert [document["doc_id"] for document in documents] == [compute_sha256(folder / "a.pdf"), compute_sha256(folder / "b.pdf")]
+    assert [document["page_count"] for document in documents] == [1, 3]
+    assert all(document["claimed"] for document in documents)
+    with Manifest(processing.config.manifest_file) as manifest:
+        assert [document["file_name"] for document in manifest.documents("pdf_processing", "running")] == ["a.pdf", "b.pdf"]
+
+
+def test_done_documents_keep_their_status(processing, folder):
+    a, b = load(processing, folder)
+    with Manifest(processing.config.manifest_file) as manifest:
+        manifest.set_stage_status(a["doc_id"], "pdf_processing", "done")
+        manifest.set_stage_status(b["doc_id"], "pdf_processing", "failed", "broken")
+
+    a, b = load(processing, folder)
+
+    assert (a["claimed"], b["claimed"]) == (False, True)
+    with Manifest(processing.config.manifest_file) as manifest:
+        assert manifest.stage_status(a["doc_id"], "pdf_processing") == "done"
+
+
+def test_documents_in_flight_are_left_to_their_run(processing, folder):
+    first = load(processing, folder)
+
+    second = load(processing, folder)
+
+    assert all(document["claimed"] for document in first)
+    assert not any(document["claimed"] for document in second)
+    with Manifest(processing.config.manifest_file) as manifest:
+        assert len(manifest.documents("pdf_processing", "running")) == 2
+
+
+def test_changed_content_is_processed_again(processing, folder):
+    a, _ = load(processing, folder)
+    with Manifest(processing.config.manifest_file) as manifest:
+        manifest.set_stage_status(a["doc_id"], "pdf_processing", "done")
+    (folder / "a.pdf").write_bytes(make_pdf(["a one", "a two"]))
+
+    a, _ = load(processing, folder)
+
+    assert a["doc_id"] == compute_sha256(folder / "a.pdf")
+    assert (a["page_count"], a["claimed"]) == (2, True)
+
+
+class RecordingPool:
+    """Stands in for the extraction pool, recording the tasks of every batch and extracting nothing."""
+
+    def __init__(self):
+        self.batches = []
+
+    def imap_unordered(self, tasks):
+        self.batches.append([args[0].name for _, _, args in tasks])
+        for key, _, args in tasks:
+            yield key, ("Short", args[1], f"text of {args[0].name}"), None
+
+
+def test_later_batches_do_not_queue_extracted_documents(processing, folder, monkeypatch):
+    pool = RecordingPool()
+    monkeypatch.setattr(pdf_processing, "get_extraction_pool", lambda config: pool)
+
+    first = processing.process_multiple_pdfs()
+    (folder / "c.pdf").write_bytes(make_pdf(["c one"]))
+    second = processing.process_multiple_pdfs()
+
+    assert pool.batches == [["b.pdf", "a.pdf"], ["c.pdf"]]
+    assert [text for _, text in first] == ["text of a.pdf", "text of b.pdf"]
+    assert second == [(compute_sha256(folder / "c.pdf"), "text of c.pdf")]
+    with Manifest(processing.config.manifest_file) as manifest:
+        assert len(manifest.documents("pdf_processing", "done")) == 3
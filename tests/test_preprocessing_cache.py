@@ -0,0 +1,63 @@
+import dataclasses
+from pathlib import Path
+import pytest
+from conftest import preprocessing_config
+from src.textSummarizer.utils.preprocessing_cache import PreprocessingCache
+
+CONFIG = preprocessing_config()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return PreprocessingCache(tmp_path / "preprocessing.db", max_size_mb=16)
+
+
+def test_sentences_round_trip(cache):
+    text_hash, config_hash = PreprocessingCache.text_hash("Some text."), PreprocessingCache.config_hash(CONFIG)
+    assert cache.get(text_hash, config_hash) is None
+
+    cache.put(text_hash, config_hash, ["some text", "café"])
+
+    assert cache.get(text_hash, config_hash) == ["some text", "café"]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_entries_are_kept_per_config(cache):
+    text_hash = PreprocessingCache.text_hash("Some text.")
+    other_config = dataclasses.replace(CONFIG, remove_digits=True)
+    cache.put(text_hash, PreprocessingCache.config_hash(CONFIG), ["with digits"])
+    cache.put(text_hash, PreprocessingCache.config_hash(other_config), ["without"])
+
+    assert cache.get(text_hash, PreprocessingCache.config_hash(CONFIG)) == ["with digits"]
+    assert cache.get(text_hash, PreprocessingCache.config_hash(other_config)) == ["without"]
+
+
+def test_config_hash_ignores_settings_that_keep_the_output():
+    config_hash = PreprocessingCache.config_hash(CONFIG)
+    assert PreprocessingCache.config_hash(dataclasses.replace(
+        CONFIG, spelling_memo_size=1, sentence_block_size=1, num_workers=3, preprocessing_cache_max_mb=1,
+        manifest_file=Path("other.db")
+    )) == config_hash
+    assert PreprocessingCache.config_hash(dataclasses.replace(CONFIG, correct_spelling=True)) != config_hash
+
+
+def test_sentence_batches_do_not_collide_with_texts():
+    assert PreprocessingCache.sentences_hash(["Some text."]) != PreprocessingCache.text_hash("Some text.")
+    assert PreprocessingCache.sentences_hash(["a", "b"]) != PreprocessingCache.sentences_hash(["a b"])
+
+
+def test_least_recently_used_entries_are_evicted(cache):
+    config_hash = PreprocessingCache.config_hash(CONFIG)
+    hashes = [PreprocessingCache.text_hash(str(number)) for number in range(3)]
+    # Distinct, barely compressible sentences, so every entry has about the same size
+    sentences = [[f"{number}-{index}-{hash(index * 7919 + number)}" for index in range(50)] for number in range(3)]
+    cache.put(hashes[0], config_hash, sentences[0])
+    cache.put(hashes[1], config_hash, sentences[1])
+    cache.get(hashes[0], config_hash)
+    cache.max_size = cache.size() + 100
+    cache.put(hashes[2], config_hash, sentences[2])
+
+    assert cache.get(hashes[1], config_hash) is None
+    assert cache.get(hashes[0], config_hash) == sentences[0]
+    assert cache.stats()["evictions"] == 1
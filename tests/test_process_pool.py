@@ -0,0 +1,114 @@
+import os
+import time
+import pytest
+from src.textSummarizer.utils.process_pool import SupervisedPool, keep_alive
+
+# Tasks run in spawned workers, so they live at module level where the workers can import them
+_state = None
+
+
+def init_state(value):
+    global _state
+    _state = value
+
+
+def square(number):
+    return number * number
+
+
+def with_state(number):
+    return _state, number
+
+
+def fail(message):
+    raise ValueError(message)
+
+
+def sleep(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+def allocate(megabytes, seconds):
+    block = bytearray(megabytes * 1024 * 1024)
+    time.sleep(seconds)
+    return len(block)
+
+
+def crash(exitcode):
+    os._exit(exitcode)
+
+
+def run(pool, tasks):
+    return {key: (result, error) for key, result, error in pool.imap_unordered(tasks)}
+
+
+@pytest.fixture
+def pool():
+    with SupervisedPool(num_workers=2, timeout=2, memory_limit_mb=1024, poll_interval=0.05,
+                        initializer=init_state, initargs=("ready",)) as pool:
+        yield pool
+
+
+def test_runs_every_task(pool):
+    assert run(pool, [(number, square, (number,)) for number in range(10)]) == {
+        number: (number * number, None) for number in range(10)
+    }
+
+
+def test_initializer_runs_in_every_worker(pool):
+    results = run(pool, [(number, with_state, (number,)) for number in range(4)])
+    assert all(result == ("ready", number) for number, (result, _) in results.items())
+
+
+def test_exceptions_are_reported(pool):
+    results = run(pool, [("bad", fail, ("malformed",)), ("good", square, (3,))])
+    assert results == {"bad": (None, "ValueError: malformed"), "good": (9, None)}
+
+
+def test_timed_out_task_is_killed(pool):
+    results = run(pool, [("slow", sleep, (30,)), ("fast", sleep, (0,))])
+
+    assert results["slow"] == (None, "Timed out after 2s")
+    assert results["fast"] == (0, None)
+    # The replacement worker picks up new tasks, with the initializer run again
+    assert run(pool, [(number, with_state, (number,)) for number in range(2)]) == {
+        0: (("ready", 0), None), 1: (("ready", 1), None)
+    }
+
+
+def test_memory_cap_kills_the_worker():
+    with SupervisedPool(num_workers=1, memory_limit_mb=200, poll_interval=0.05) as pool:
+        results = run(pool, [("big", allocate, (400, 30)), ("small", allocate, (1, 0))])
+
+    assert results["big"] == (None, "Exceeded the 200 MB memory limit")
+    assert results["small"] == (1024 * 1024, None)
+
+
+def test_crashed_worker_is_replaced(pool):
+    results = run(pool, [("crash", crash, (3,)), ("after", square, (4,))])
+
+    assert results["crash"] == (None, "Worker process died with exit code 3")
+    assert results["after"] == (16, None)
+    assert run(pool, [("again", square, (5,))]) == {"again": (25, None)}
+
+
+def test_abandoned_batch_does_not_leak_into_the_next(pool):
+    for key, _, _ in pool.imap_unordered([("quick", square, (2,)), ("busy", sleep, (1,)), ("queued", sleep, (1,))]):
+        assert key == "quick"
+        break
+
+    assert run(pool, [(number, square, (number,)) for number in range(4)]) == {
+        number: (number * number, None) for number in range(4)
+    }
+
+
+def slow_steps(steps, seconds):
+    for _ in range(steps):
+        time.sleep(seconds)
+        keep_alive()
+    return steps
+
+
+def test_keep_alive_restarts_the_timeout(pool):
+    assert run(pool, [("steps", slow_steps, (4, 1))]) == {"steps": (4, None)}
@@ -0,0 +1,131 @@
+import asyncio
+import errno
+import pickle
+import aiohttp
+import pytest
+from src.textSummarizer.utils.retry import RetryBudget, RetryPolicy, TransientError, is_transient, retry
+
+
+def response_error(status: int) -> aiohttp.ClientResponseError:
+    return aiohttp.ClientResponseError(request_info=None, history=(), status=status)
+
+
+@pytest.mark.parametrize("error", [
+    TransientError("flaky"),
+    response_error(429),
+    response_error(503),
+    aiohttp.ClientConnectionError(),
+    asyncio.TimeoutError(),
+    ConnectionResetError(),
+    OSError(errno.EAGAIN, "Resource temporarily unavailable"),
+    OSError(errno.EINTR, "Interrupted system call"),
+    BlockingIOError(errno.EWOULDBLOCK, "Operation would block"),
+])
+def test_transient_errors(error):
+    assert is_transient(error)
+
+
+@pytest.mark.parametrize("error", [
+    response_error(404),
+    response_error(400),
+    FileNotFoundError(),
+    PermissionError(),
+    OSError("disk hiccup"),
+    OSError(errno.ENOSPC, "No space left on device"),
+    OSError(errno.EBADF, "Bad file descriptor"),
+    MemoryError(),
+    ValueError("malformed PDF"),
+    KeyError("page"),
+])
+def test_permanent_errors(error):
+    assert not is_transient(error)
+
+
+class Flaky:
+    """Raises `error` on the first `failures` calls, then returns 'ok'."""
+
+    def __init__(self, failures: int, error: Exception = None) -> None:
+        self.failures = failures
+        self.error = error or TransientError("flaky")
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error
+        return "ok"
+
+
+def policy(**kwargs) -> RetryPolicy:
+    return RetryPolicy(wait_time=0, max_wait_time=0, **kwargs)
+
+
+def test_retries_until_success():
+    flaky = Flaky(2)
+    retry_policy = policy(max_retries=3)
+
+    assert retry_policy.call(flaky) == "ok"
+    assert flaky.calls == 3
+    assert retry_policy.metrics.report() == {"TransientError": {"retried": 2}}
+
+
+def test_gives_up_after_max_retries():
+    flaky = Flaky(5)
+    retry_policy = policy(max_retries=3)
+
+    with pytest.raises(TransientError):
+        retry_policy.call(flaky)
+    assert flaky.calls == 3
+    assert retry_policy.metrics.report() == {"TransientError": {"retried": 2, "exhausted": 1}}
+
+
+def test_permanent_error_fails_fast():
+    flaky = Flaky(1, ValueError("malformed"))
+    retry_policy = policy(max_retries=3)
+
+    with pytest.raises(ValueError):
+        retry_policy.call(flaky)
+    assert flaky.calls == 1
+    assert retry_policy.metrics.report() == {"ValueError": {"permanent": 1}}
+
+
+def test_budget_is_shared_across_calls():
+    retry_policy = policy(max_retries=5, budget=RetryBudget(2))
+
+    assert retry_policy.call(Flaky(2)) == "ok"
+    with pytest.raises(TransientError):
+        retry_policy.call(Flaky(1))
+    assert retry_policy.budget.spent == 2
+    assert retry_policy.metrics.report() == {"TransientError": {"retried": 2, "budget_exhausted": 1}}
+
+
+def test_async_retries():
+    calls = 0
+
+    async def flaky():
+        nonlocal calls
+        calls += 1
+        if calls < 3:
+            raise TransientError("flaky")
+        return "ok"
+
+    assert asyncio.run(policy(max_retries=3).acall(flaky)) == "ok"
+    assert calls == 3
+
+
+def test_backoff_is_capped():
+    retry_policy = RetryPolicy(wait_time=1, max_wait_time=4)
+    assert all(0 <= retry_policy.backoff(attempt) <= 4 for attempt in range(10) for _ in range(20))
+
+
+def test_decorator_returns_none_when_giving_up():
+    flaky = Flaky(5)
+    assert retry(max_retries=2, wait_time=0, max_wait_time=0)(flaky)() is None
+    assert flaky.calls == 2
+
+
+def test_budget_survives_pickling():
+    budget = RetryBudget(3)
+    budget.try_acquire()
+    copy = pickle.loads(pickle.dumps(budget))
+    assert copy.spent == 1 and copy.try_acquire()
@@ -0,0 +1,75 @@
+import random
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")  # text_processing imports it at module level
+
+from benchmarks.semantic_chunking import PrecomputedModel, reference_semantic_chunking, synthetic_document
+from conftest import text_processing_config
+from src.textSummarizer.components.text_processing import TextProcessor
+
+
+def scripted(processor: TextProcessor, token_counts, scores):
+    """Phrases of the given token counts, with `scores` as the similarities of adjacent phrases.
+
+    Both implementations are made to see the same similarities, so their chunk boundaries
+    can be compared without float rounding in the way.
+    """
+    phrases = [" ".join([f"p{index}"] + ["w"] * (count - 1)) for index, count in enumerate(token_counts)]
+    model = PrecomputedModel({phrase: np.ones(2, dtype=np.float32) for phrase in phrases})
+    pairs = iter(scores)
+    processor.calculate_similarity_score = lambda pair: next(pairs)
+    processor.adjacent_similarities = lambda embeddings: np.array(scores, dtype=np.float64)
+    return phrases, model
+
+
+@pytest.mark.parametrize("max_tokens", [50, 200, 4096])
+@pytest.mark.parametrize("percentile", [5, 20, 50])
+def test_matches_the_pairwise_loop(max_tokens, percentile):
+    processor = TextProcessor(text_processing_config(max_tokens=max_tokens, dynamic_percentile=percentile, batch_size=64))
+    phrases, model = synthetic_document(1000, 16, seed=max_tokens + percentile)
+
+    chunks, scores, threshold = processor.semantic_chunking(phrases, model)
+    expected, expected_scores, expected_threshold = reference_semantic_chunking(processor, phrases, model)
+
+    assert chunks == expected
+    np.testing.assert_allclose(scores, expected_scores, atol=1e-5)
+    assert threshold == pytest.approx(expected_threshold, abs=1e-5)
+
+
+@pytest.mark.parametrize("token_counts, scores, max_tokens", [
+    ([10, 2, 2], [0.9, 0.9], 5),                  # First phrase over the limit
+    ([2, 10, 2, 2], [0.9, 0.9, 0.9], 5),          # A phrase over the limit in the middle
+    ([3, 3, 3, 3], [0.9, 0.1, 0.9], 6),           # Overflow and drop at the same phrase
+    ([1, 1, 1, 1, 1], [0.1, 0.9, 0.1, 0.9], 100), # Drops only
+    ([4, 4, 4, 4, 4], [0.9, 0.9, 0.9, 0.9], 8),   # Overflows only
+    ([3, 3], [0.5], 4),
+])
+def test_chunk_boundaries(token_counts, scores, max_tokens):
+    processor = TextProcessor(text_processing_config(max_tokens=max_tokens))
+    phrases, model = scripted(processor, token_counts, scores)
+    expected = reference_semantic_chunking(processor, phrases, model)[0]
+
+    phrases, model = scripted(processor, token_counts, scores)
+    assert processor.semantic_chunking(phrases, model)[0] == expected
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_random_chunk_boundaries(seed):
+    rng = random.Random(seed)
+    token_counts = [rng.randint(1, 8) for _ in range(rng.randint(2, 60))]
+    scores = [rng.choice([0.1, 0.5, 0.9]) for _ in range(len(token_counts) - 1)]
+    processor = TextProcessor(text_processing_config(max_tokens=rng.randint(4, 20), dynamic_percentile=rng.randint(5, 60)))
+    phrases, model = scripted(processor, token_counts, scores)
+    expected = reference_semantic_chunking(processor, phrases, model)[0]
+
+    phrases, model = scripted(processor, token_counts, scores)
+    assert processor.semantic_chunking(phrases, model)[0] == expected
+
+
+def test_too_few_phrases():
+    processor = TextProcessor(text_processing_config())
+    model = PrecomputedModel({"only one": np.ones(2, dtype=np.float32)})
+
+    assert processor.semantic_chunking(["only one"], model) == ([], [], 0.0)
+    assert processor.semantic_chunking([], model) == ([], [], 0.0)
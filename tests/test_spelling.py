@@ -0,0 +1,82 @@
+import pytest
+from nltk import pos_tag
+from nltk.tokenize import word_tokenize
+from symspellpy import SymSpell, Verbosity
+from conftest import requires_nltk_data
+from src.textSummarizer.components.text_cleaning import SpellingCorrector
+
+WORDS = {"the": 1000, "court": 500, "held": 400, "that": 900, "appeal": 300, "was": 800, "dismissed": 200}
+
+
+@pytest.fixture
+def sym_spell():
+    sym_spell = SymSpell(max_dictionary_edit_distance=2, prefix_length=7)
+    for word, count in WORDS.items():
+        sym_spell.create_dictionary_entry(word, count)
+    return sym_spell
+
+
+def test_words_in_the_dictionary_are_not_looked_up(sym_spell):
+    corrector = SpellingCorrector(sym_spell)
+
+    assert corrector.correct_word("court", "NN") == "court"
+    assert corrector.stats["in_dictionary"] == 1
+    assert corrector.stats["lookups"] == 0
+    assert not corrector.memo
+
+
+def test_corrections_are_memoized(sym_spell):
+    corrector = SpellingCorrector(sym_spell)
+
+    assert [corrector.correct_word("cuort", "NN") for _ in range(3)] == ["court"] * 3
+    assert corrector.correct_word("xyzzy", "NN") == "xyzzy"  # Unknown words come back unchanged
+    assert (corrector.stats["lookups"], corrector.stats["memo_hits"], corrector.stats["corrected"]) == (2, 2, 3)
+    assert dict(corrector.memo) == {"cuort": "court", "xyzzy": "xyzzy"}
+
+
+def test_proper_nouns_are_kept(sym_spell):
+    corrector = SpellingCorrector(sym_spell)
+
+    assert corrector.correct_word("Cuort", "NNP") == "Cuort"
+    assert corrector.correct_word("Cuorts", "NNPS") == "Cuorts"
+    assert corrector.stats["proper_nouns"] == 2
+    assert corrector.stats["lookups"] == 0
+
+
+def test_memo_evicts_the_least_recently_used_word(sym_spell):
+    corrector = SpellingCorrector(sym_spell, memo_size=2)
+
+    corrector.correct_word("cuort", "NN")
+    corrector.correct_word("apeal", "NN")
+    corrector.correct_word("cuort", "NN")  # Now more recent than "apeal"
+    corrector.correct_word("hled", "NN")
+
+    assert list(corrector.memo) == ["cuort", "hled"]
+
+
+def test_report_rates(sym_spell):
+    corrector = SpellingCorrector(sym_spell)
+    for word, tag in [("court", "NN"), ("cuort", "NN"), ("cuort", "NN"), ("India", "NNP")]:
+        corrector.correct_word(word, tag)
+
+    report = corrector.report()
+    assert report["correction_rate"] == pytest.approx(2 / 3)
+    assert report["memo_hit_rate"] == pytest.approx(1 / 2)
+
+
+@requires_nltk_data("tokenizers/punkt_tab", "taggers/averaged_perceptron_tagger_eng")
+def test_batch_matches_tagging_each_sentence(sym_spell):
+    sentences = ["The cuort held that the apeal was dismised.", "Mr. Sharma apealed to the Cuort.", ""]
+
+    expected = []
+    for sentence in sentences:
+        words = []
+        for word, tag in pos_tag(word_tokenize(sentence)):
+            if tag in ("NNP", "NNPS"):
+                words.append(word)
+            else:
+                suggestions = sym_spell.lookup(word, Verbosity.CLOSEST, max_edit_distance=2, include_unknown=True)
+                words.append(suggestions[0].term if suggestions else word)
+        expected.append(" ".join(words))
+
+    assert SpellingCorrector(sym_spell).correct(sentences) == expected
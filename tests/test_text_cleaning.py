@@ -0,0 +1,58 @@
+import pytest
+from benchmarks.text_cleaning import reference_clean_sentence
+from conftest import preprocessing_config
+from src.textSummarizer.components.text_cleaning import SEPARATOR, TextCleaner
+
+SENTENCES = [
+    "The Court held that the appeal wasn't maintainable.",
+    "See <b>Annexure&nbsp;A</b> &amp; the <i>order</i> dated 12.03.2019.",
+    "Visit https://www.example.com/judgments or http://courts.gov/x for details.",
+    "Write to registrar@supremecourt.gov.in before 5 p.m.",
+    "Café, naïve and Ångström are accented; “quotes” and — dashes are not ASCII.",
+    "  Extra   spaces,\tand\ttabs   everywhere  ",
+    "Section 302 IPC r/w 34 applies to A-1 and A2.",
+    "",
+    "   ",
+    "\n",
+    "I'd say they've gone; it's theirs.",
+    "a < b and c > d, but 5 & 6 are not tags",
+    "नमस्ते and 日本語 mixed into English.",
+]
+
+STEPS = [
+    "remove_html", "remove_urls", "remove_emails", "handle_accents", "remove_unicode_chars",
+    "expand_contractions", "remove_punctuations", "remove_digits", "remove_extra_spaces",
+]
+
+
+def reference(config, sentences):
+    return [reference_clean_sentence(config, None, sentence) for sentence in sentences]
+
+
+@pytest.mark.parametrize("overrides", [
+    {},
+    {"remove_digits": True},
+    {"handle_accents": False},
+    {"handle_accents": False, "remove_unicode_chars": False},
+    {"remove_extra_spaces": False},
+    {step: False for step in STEPS},
+    *({step: False} for step in STEPS),
+])
+def test_matches_the_original_steps(overrides):
+    config = preprocessing_config(**overrides)
+    assert TextCleaner(config).clean(SENTENCES) == reference(config, SENTENCES)
+
+
+def test_batch_gives_the_same_output_as_single_sentences():
+    cleaner = TextCleaner(preprocessing_config())
+    assert cleaner.clean(SENTENCES) == [cleaner.clean([sentence])[0] for sentence in SENTENCES]
+
+
+def test_sentences_containing_the_separator():
+    config = preprocessing_config()
+    sentences = [f"one{SEPARATOR}two", "three"]
+    assert TextCleaner(config).clean(sentences) == reference(config, sentences)
+
+
+def test_empty_batch():
+    assert TextCleaner(preprocessing_config()).clean([]) == []
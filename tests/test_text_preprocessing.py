@@ -0,0 +1,96 @@
+import dask
+import pytest
+from conftest import preprocessing_config
+from src.textSummarizer.components import text_preprocessing
+from src.textSummarizer.components.text_preprocessing import TextPreProcessing, load_sym_spell, symspell_snapshot_path
+from src.textSummarizer.utils.manifest import Manifest
+
+
+def preprocessing(tmp_path, **overrides):
+    return TextPreProcessing(preprocessing_config(
+        preprocessing_cache_max_mb=0, manifest_file=tmp_path / "manifest.db", **overrides
+    ))
+
+
+@pytest.mark.parametrize("workers, total, expected", [
+    (1, 1000, 250),   # 4 blocks for the single worker
+    (4, 1000, 63),    # ceil(1000 / 16)
+    (4, 100, 8),      # never below min_block_size
+    (16, 0, 8),
+])
+def test_block_size_follows_the_workers(tmp_path, workers, total, expected):
+    assert preprocessing(tmp_path).block_size(total, workers) == expected
+
+
+def test_fixed_block_size(tmp_path):
+    assert preprocessing(tmp_path, sentence_block_size=100).block_size(1000, 4) == 100
+
+
+def test_worker_count(tmp_path, monkeypatch):
+    monkeypatch.setattr(text_preprocessing.os, "cpu_count", lambda: 12)
+    assert preprocessing(tmp_path).worker_count() == 12
+    assert preprocessing(tmp_path, num_workers=3).worker_count() == 3
+
+
+def test_blocks_are_sized_for_the_workers_that_run_them(tmp_path, monkeypatch):
+    runs = []
+
+    def compute(*tasks, **kwargs):
+        runs.append((kwargs["num_workers"], [len(blocks) for blocks in tasks]))
+        return dask.compute(*tasks, scheduler="sync")
+
+    monkeypatch.setattr(text_preprocessing, "compute", compute)
+    monkeypatch.setattr(text_preprocessing, "sent_tokenize", lambda text: text.split(". "))
+    text = ". ".join(f"Sentence number {number}" for number in range(64))
+    processing = preprocessing(tmp_path, num_workers=2)
+    with Manifest(processing.config.manifest_file) as manifest:
+        manifest.upsert_document("doc", "doc.pdf")
+
+    processed = processing.process_text_file([("doc", text)])
+
+    # 64 sentences over 2 workers with 4 blocks each: 8 blocks of 8 sentences
+    assert runs == [(2, [8])]
+    assert processed[0].split("\n") == [f"Sentence number {number}" for number in range(64)]
+
+
+@pytest.fixture
+def fresh_sym_spell():
+    load_sym_spell.cache_clear()
+    yield load_sym_spell
+    load_sym_spell.cache_clear()
+
+
+def test_snapshot_name_follows_what_it_was_built_from(tmp_path, monkeypatch):
+    dictionary = tmp_path / "dictionary.txt"
+    dictionary.write_text("the 100\nof 50\n")
+    snapshot = symspell_snapshot_path(tmp_path / "symspell.pickle", dictionary)
+
+    assert snapshot.parent == tmp_path and snapshot.suffix == ".pickle"
+    assert symspell_snapshot_path(tmp_path / "symspell.pickle", dictionary) == snapshot
+    dictionary.write_text("the 100\nof 51\n")
+    assert symspell_snapshot_path(tmp_path / "symspell.pickle", dictionary) != snapshot
+    dictionary.write_text("the 100\nof 50\n")
+    monkeypatch.setitem(text_preprocessing.SYMSPELL_SETTINGS, "prefix_length", 6)
+    assert symspell_snapshot_path(tmp_path / "symspell.pickle", dictionary) != snapshot
+    monkeypatch.setitem(text_preprocessing.SYMSPELL_SETTINGS, "prefix_length", 7)
+    monkeypatch.setattr(text_preprocessing, "version", lambda package: "0.0.1")
+    assert symspell_snapshot_path(tmp_path / "symspell.pickle", dictionary) != snapshot
+
+
+def test_snapshot_is_reused_until_symspellpy_changes(tmp_path, monkeypatch, fresh_sym_spell):
+    built = fresh_sym_spell(tmp_path / "symspell.pickle")
+    [snapshot] = tmp_path.glob("symspell-*.pickle")
+    fresh_sym_spell.cache_clear()
+
+    def load_dictionary(*args, **kwargs):
+        raise AssertionError("the snapshot should have been loaded")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(text_preprocessing.SymSpell, "load_dictionary", load_dictionary)
+        loaded = fresh_sym_spell(tmp_path / "symspell.pickle")
+    assert loaded.words == built.words
+    fresh_sym_spell.cache_clear()
+
+    monkeypatch.setattr(text_preprocessing, "version", lambda package: "0.0.1")
+    fresh_sym_spell(tmp_path / "symspell.pickle")
+    assert len(list(tmp_path.glob("symspell-*.pickle"))) == 2 and snapshot.exists()